@@ -1,7 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from constants import DATE_FORMAT
-from utils import parse_date
+from utils import parse_date, format_date
 
 
 class AssignmentWindow(tk.Toplevel):
@@ -11,8 +11,9 @@ class AssignmentWindow(tk.Toplevel):
         # Args:
         #     master (tk.Widget): The parent window.
         #     save_callback (function): A callback function to save the new assignment.
-        #                               Expected to accept four parameters:
-        #                               title (str), due_date (str), status (str), notes (str).
+        #                               Expected to accept five parameters:
+        #                               title (str), due_date (str), status (str), notes (str)
+        #                               and on_saved, called with True or False once saved.
         super().__init__(master)
         self.title("Add Assignment")
         self.save_callback = save_callback  # Callback function to save the assignment
@@ -48,8 +49,8 @@ class AssignmentWindow(tk.Toplevel):
         self.notes_text.grid(row=3, column=1, pady=5)
 
         # Save Button
-        save_button = tk.Button(self, text="Save", command=self.on_save, width=15)
-        save_button.pack(pady=10)
+        self.save_button = tk.Button(self, text="Save", command=self.on_save, width=15)
+        self.save_button.pack(pady=10)
 
     def on_save(self):
         title = self.title_entry.get().strip()
@@ -73,14 +74,22 @@ class AssignmentWindow(tk.Toplevel):
             messagebox.showerror("Input Error", f"Due date must be in {DATE_FORMAT} format.")
             return
 
-        # Invoke the save callback with the collected data
+        # Invoke the save callback with the collected data; the due date is stored in
+        # DATE_FORMAT even when typed without leading zeros (e.g. 2024-1-5)
         if self.save_callback:
-            success = self.save_callback(title, due_date_str, status, notes)
-            if success:
-                messagebox.showinfo("Success", "Assignment added successfully.")
-                self.destroy()
-            else:
-                messagebox.showerror("Error", "Failed to add assignment.")
+            # The assignment is saved in the background; Save stays disabled until then
+            self.save_button.config(state=tk.DISABLED)
+            self.save_callback(title, format_date(due_date), status, notes, self.on_saved)
+
+    def on_saved(self, success):
+        if not self.winfo_exists():
+            return
+        if success:
+            messagebox.showinfo("Success", "Assignment added successfully.")
+            self.destroy()
+        else:
+            self.save_button.config(state=tk.NORMAL)
+            messagebox.showerror("Error", "Failed to add assignment. This tab may already have an assignment, live or archived, with the same title and due date.")
 
     def on_close(self):
         if messagebox.askokcancel("Quit", "Do you want to close the add assignment window?"):
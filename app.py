@@ -1,33 +1,78 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog, filedialog
+from tkinter import ttk, messagebox
 import datetime
-import csv
-from database import Database
+import os
+import time
+from collections import OrderedDict
+from async_database import AsyncDatabase
 from event_handlers import EventHandlers
-from details_window import DetailsWindow
-from add_assignment_window import AssignmentWindow
-from dashboard import Dashboard
-from constants import COLORS, DATE_FORMAT
-from utils import parse_date
+from tree_sync import TreeviewSync
+from constants import COLORS, DATE_FORMAT, TREEVIEW_COLUMNS, TREEVIEW_SORT_KEYS, VIRTUAL_TREE_THRESHOLD, MAX_LOADED_TABS
+from diagnostics import metrics
+from events import bus
+from recolor import RecolorScheduler
+
+# Python equivalents of the ORDER_BY_COLUMNS orderings over a row's Treeview values
+# (title, due date, status), used to place changed rows without re-querying the tab.
+# Titles compare lower-cased, which matches SQLite's NOCASE for ASCII text.
+ROW_SORT_KEYS = {
+    'id': lambda iid, values: int(iid),
+    'assignment_title': lambda iid, values: (values[0].lower(), int(iid)),
+    'due_date': lambda iid, values: (values[1], int(iid)),
+    'status': lambda iid, values: (values[2], int(iid)),
+}
 
 
 class AssignmentTracker:
+    # Secondary windows, dialogs and the import/export modules are imported by the
+    # methods that first use them, so startup only pays for the main window.
     def __init__(self, root):
-        self.db = Database()
         self.root = root
         self.root.title("College Assignment Tracker")
-        # Initialize other components and load tabs
+        self.async_db = None
+        self.recolor = None
+        self.current_tab = None
+        self.started = time.perf_counter()
+        # Build the empty window first; the database is opened and the tabs loaded
+        # once it has been drawn, so the window appears without waiting for them
         self.create_widgets()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.after_idle(self.show_window)
+
+
+    def show_window(self):
+        # Wait until the window is mapped and drawn (Tk redraws from idle tasks), then
+        # open the database and load the tabs from the next turn of the event loop.
+        # wait_visibility() only returns on a visibility change, so it is skipped
+        # when the window is already showing.
+        try:
+            if not self.root.winfo_viewable():
+                self.root.wait_visibility()
+            self.root.update_idletasks()
+        except tk.TclError:
+            # Closed before it was shown
+            return
+        metrics.record('ui.first_paint', time.perf_counter() - self.started)
+        self.root.after(0, self.start)
+
+
+    def start(self):
+        # Runs from the event loop once the empty window has painted
+        # Every database call runs on a background worker, which owns the only
+        # connection, so the Tk thread never waits on SQLite (e.g. on another
+        # process's lock); results and change events come back through the event loop
+        self.async_db = AsyncDatabase(self.root, on_busy_changed=self.set_busy)
         # Initialize event handlers
         self.event_handlers = EventHandlers(self)
+        # Every database write is announced on the bus; the tabs update from it
+        bus.attach(self.root)
+        bus.subscribe(self.on_database_changes)
+        # Due-date colours of the shown rows are updated at midnight
+        self.recolor = RecolorScheduler(self.root)
         self.load_tabs()
         # Bind the tab changed event
         self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
-        # Initialize current_tab
-        if hasattr(self, 'current_tab'):
-            pass  # Already set in load_tabs
-        else:
-            self.current_tab = None
+        metrics.record('ui.startup', time.perf_counter() - self.started)
 
 
     def create_widgets(self):
@@ -46,11 +91,27 @@ class AssignmentTracker:
         import_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Import", menu=import_menu)
         import_menu.add_command(label="Import CSV", command=self.import_csv)
+        import_menu.add_command(label="Import NDJSON", command=self.import_ndjson)
+
+        # Export menu
+        export_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Export", menu=export_menu)
+        export_menu.add_command(label="Export Tab to CSV", command=lambda: self.export_to_file('csv', all_tabs=False))
+        export_menu.add_command(label="Export Tab to NDJSON", command=lambda: self.export_to_file('ndjson', all_tabs=False))
+        export_menu.add_command(label="Export All Tabs to CSV", command=lambda: self.export_to_file('csv', all_tabs=True))
+        export_menu.add_command(label="Export All Tabs to NDJSON", command=lambda: self.export_to_file('ndjson', all_tabs=True))
 
         # View menu
         view_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="View", menu=view_menu)
         view_menu.add_command(label="Dashboard", command=self.open_dashboard)
+        view_menu.add_command(label="Diagnostics", command=self.open_diagnostics)
+
+        # Archive menu
+        archive_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Archive", menu=archive_menu)
+        archive_menu.add_command(label="Archive Completed...", command=self.archive_completed)
+        archive_menu.add_command(label="Show Archived", command=self.open_archive)
 
         # Add a frame for action buttons
         button_frame = tk.Frame(self.root)
@@ -68,13 +129,38 @@ class AssignmentTracker:
         add_button = tk.Button(button_frame, text="Add", command=self.add_new_assignment)
         add_button.pack(side=tk.RIGHT, padx=5, pady=5)
 
+        # Search box: Enter searches titles and notes across all tabs
+        self.search_var = tk.StringVar()
+        search_entry = tk.Entry(button_frame, textvariable=self.search_var, width=30)
+        search_entry.pack(side=tk.LEFT, padx=(20, 5), pady=5)
+        search_entry.bind('<Return>', lambda event: self.open_search())
+        search_button = tk.Button(button_frame, text="Search", command=self.open_search)
+        search_button.pack(side=tk.LEFT, padx=5, pady=5)
+
+        # Busy indicator shown while background database requests are in flight
+        self.busy_label = tk.Label(button_frame, text="")
+        self.busy_label.pack(side=tk.LEFT, padx=20, pady=5)
+
         # Notebook for tabs
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(expand=1, fill='both')
 
-        # Dictionaries to hold frames and Treeviews for each tab
+        # Dictionaries to hold frames, Treeviews and their sync helpers for each tab.
+        # Large tabs use a paged VirtualTreeview (tab_virtual) instead of a sync helper.
+        # Every tab has a frame; the Treeview is only built once the tab is viewed.
         self.tab_frames = {}
         self.tab_trees = {}
+        self.tab_syncs = {}
+        self.tab_virtual = {}
+        # (order_by, direction) of each loaded tab, saved in the tabs table
+        self.tab_sorts = {}
+        # Loaded tabs, least recently viewed first
+        self.loaded_tabs = OrderedDict()
+        # Frames of tabs whose sort order and size are being read before they are
+        # built, mapped to the assignment to select once shown (or None)
+        self.loading_tabs = {}
+        # Imports running or queued on the database worker, cancelled when the app closes
+        self.import_jobs = set()
 
         # Context Menu
         self.menu = tk.Menu(self.root, tearoff=0)
@@ -86,14 +172,26 @@ class AssignmentTracker:
 
 
     def load_tabs(self):
+        # Read the tab names on the worker, then show them
+        self.async_db.get_all_tabs(callback=self.show_tabs, errback=self.report_error("loading the tabs"))
+
+
+    def show_tabs(self, tabs):
         # Clear existing tabs
         for tab in self.notebook.tabs():
             self.notebook.forget(tab)
         self.tab_frames.clear()
         self.tab_trees.clear()
+        for sync in self.tab_syncs.values():
+            self.recolor.unwatch(sync)
+        for view in self.tab_virtual.values():
+            self.recolor.unwatch(view.sync)
+        self.tab_syncs.clear()
+        self.tab_virtual.clear()
+        self.tab_sorts.clear()
+        self.loaded_tabs.clear()
+        self.loading_tabs.clear()
 
-        # Get all tabs from the database
-        tabs = self.db.get_all_tabs()
         if not tabs:
             # If no tabs, create a default tab
             self.add_tab("Default")
@@ -103,68 +201,153 @@ class AssignmentTracker:
             for tab_name in tabs:
                 self.create_tab(tab_name)
 
-        # Set the current_tab to the first tab
+        # Set the current_tab to the first tab and load only that one
         if tabs:
             self.current_tab = tabs[0]
+            self.load_tab(self.current_tab)
         else:
             self.current_tab = None
 
 
     def create_tab(self, tab_name):
-        # Create a new frame for the tab
+        # Create a placeholder frame for the tab; its Treeview is built by load_tab
+        # the first time the tab is selected
         tab_frame = tk.Frame(self.notebook)
         self.notebook.add(tab_frame, text=tab_name)
+        self.tab_frames[tab_name] = tab_frame
 
-        # Create a Treeview in the tab with multiple selection enabled
-        columns = ('Assignment Title', 'Due Date', 'Status')
-        tree = ttk.Treeview(tab_frame, columns=columns, show='headings', selectmode='extended')
 
-        for col in columns:
-            tree.heading(col, text=col, command=lambda _col=col: self.treeview_sort_column(tree, _col, False))
-            tree.column(col, minwidth=50, width=200)
-        tree.pack(expand=True, fill='both')
+    def load_tab(self, tab_name, select_id=None):
+        # Build the tab's Treeview and load its assignments, if not done already.
+        # select_id is an assignment to select once the rows are shown.
+        if tab_name not in self.tab_frames:
+            return
+        if tab_name in self.loaded_tabs:
+            self.loaded_tabs.move_to_end(tab_name)
+            return
+        tab_frame = self.tab_frames[tab_name]
+        if tab_frame in self.loading_tabs:
+            if select_id is not None:
+                self.loading_tabs[tab_frame] = select_id
+            return
+        self.loading_tabs[tab_frame] = select_id
+        # The tab's saved sort order, applied by the query on every load, and its size,
+        # which decides between a plain and a paged Treeview
+        self.async_db.submit(lambda db: (db.get_tab_sort(tab_name), db.count_assignments(tab_name)),
+                             callback=lambda result: self.build_tab(tab_frame, *result),
+                             errback=self.report_error(f"loading the tab '{tab_name}'"))
+
+
+    def build_tab(self, tab_frame, sort, count):
+        # The tab may have been renamed or deleted while its size was being read
+        if tab_frame not in self.loading_tabs:
+            return
+        select_id = self.loading_tabs.pop(tab_frame)
+        tab_name = next((name for name, frame in self.tab_frames.items() if frame is tab_frame), None)
+        if tab_name is None:
+            return
+        order_by, direction = self.tab_sorts[tab_name] = sort
+
+        if count >= VIRTUAL_TREE_THRESHOLD:
+            from virtual_tree import VirtualTreeview
+            # Large tab: keep only the visible window in the widget and page from the database
+            view = VirtualTreeview(
+                tab_frame,
+                TREEVIEW_COLUMNS,
+                count_rows=lambda callback: self.async_db.count_assignments(view.tab_name, callback=callback),
+                fetch_rows=lambda offset, limit, order_by, descending, callback, errback: self.async_db.get_assignments_page(
+                    view.tab_name, offset, limit, order_by, descending, callback=callback, errback=errback),
+                make_row=self.make_tree_row,
+                sort_keys=TREEVIEW_SORT_KEYS,
+                order_by=order_by,
+                descending=direction == 'DESC',
+                on_sort=lambda order_by, descending: self.save_tab_sort(view.tab_name, order_by, 'DESC' if descending else 'ASC'),
+            )
+            view.tab_name = tab_name
+            view.pack(expand=True, fill='both')
+            tree = view.tree
+            self.tab_virtual[tab_name] = view
+            # Rows cached before midnight are fetched again with their new colours
+            self.recolor.watch(view.sync, on_new_day=view.drop_cache)
+        else:
+            # Create a Treeview in the tab with multiple selection enabled
+            columns = TREEVIEW_COLUMNS
+            tree = ttk.Treeview(tab_frame, columns=columns, show='headings', selectmode='extended')
+
+            for col in columns:
+                tree.heading(col, text=col, command=lambda _col=col: self.treeview_sort_column(tree, _col))
+                tree.column(col, minwidth=50, width=200)
+            tree.pack(expand=True, fill='both')
+            self.tab_syncs[tab_name] = TreeviewSync(tree)
+            self.recolor.watch(self.tab_syncs[tab_name])
 
-        # Bind context menu to the Treeview
-        tree.bind('<Button-3>', self.show_context_menu)
+        # Configure tags for background and foreground colors
+        for tag, color in COLORS.items():
+            tree.tag_configure(tag, background=color['background'], foreground=color['foreground'])
+
+        # Bind context menu to the Treeview, after VirtualTreeview's own right-click binding
+        tree.bind('<Button-3>', self.show_context_menu, add='+')
         # Bind double-click event to the Treeview
         tree.bind('<Double-1>', self.event_handlers.on_assignment_double_click)
 
-        # Store the frame and tree
-        self.tab_frames[tab_name] = tab_frame
+        # Store the tree
         self.tab_trees[tab_name] = tree
+        self.loaded_tabs[tab_name] = True
 
         # Load assignments into the tree
+        self.load_assignments(tab_name, select_id)
+        if select_id is not None and tab_name in self.tab_virtual:
+            self.select_in_view(self.tab_virtual[tab_name], select_id)
+
+        # Bound memory by unloading the tabs that were viewed least recently
+        while len(self.loaded_tabs) > MAX_LOADED_TABS:
+            oldest = next(iter(self.loaded_tabs))
+            if oldest == tab_name:
+                break
+            self.unload_tab(oldest)
+
+
+    def unload_tab(self, tab_name):
+        # Destroy a tab's Treeview but keep its placeholder frame in the notebook
+        self.loaded_tabs.pop(tab_name, None)
+        tree = self.tab_trees.pop(tab_name, None)
+        sync = self.tab_syncs.pop(tab_name, None)
+        if sync is not None:
+            self.recolor.unwatch(sync)
+        view = self.tab_virtual.pop(tab_name, None)
+        if view is not None:
+            self.recolor.unwatch(view.sync)
+        self.tab_sorts.pop(tab_name, None)
+        if tree is not None and tree is self.selected_tree:
+            self.selected_tree = None
+        for child in self.tab_frames[tab_name].winfo_children():
+            child.destroy()
+
+
+    def treeview_sort_column(self, tree, col):
+        # Sorts the tab when a column header is clicked; clicking the same header
+        # again reverses the order. The query does the sorting, and the choice is
+        # saved so every later reload of the tab comes back in the same order.
+        tab_name = next(name for name, t in self.tab_trees.items() if t is tree)
+        order_by = TREEVIEW_SORT_KEYS[col]
+        current_order_by, current_direction = self.tab_sorts[tab_name]
+        if order_by == current_order_by:
+            direction = 'DESC' if current_direction == 'ASC' else 'ASC'
+        else:
+            direction = 'ASC'
+        self.save_tab_sort(tab_name, order_by, direction)
         self.load_assignments(tab_name)
 
 
-    def treeview_sort_column(self, tree, col, reverse):
-        # Sorts the Treeview column when header is clicked.
-        # Get all items in the Treeview
-        data_list = [(tree.set(k, col), k) for k in tree.get_children('')]
-
-        # Try to convert data to appropriate type for sorting
-        try:
-            # For date columns, parse the date string to datetime objects
-            if col == 'Due Date':
-                data_list.sort(key=lambda t: parse_date(t[0]), reverse=reverse)
-            else:
-                # For other columns, sort as strings (case-insensitive)
-                data_list.sort(key=lambda t: t[0].lower(), reverse=reverse)
-        except Exception as e:
-            # If there is an error in conversion, sort as strings
-            data_list.sort(key=lambda t: t[0].lower(), reverse=reverse)
-
-        # Rearrange items in sorted positions
-        for index, (val, k) in enumerate(data_list):
-            tree.move(k, '', index)
-
-        # Toggle the sort order for next click
-        tree.heading(col, command=lambda: self.treeview_sort_column(tree, col, not reverse))
+    def save_tab_sort(self, tab_name, order_by, direction):
+        self.tab_sorts[tab_name] = (order_by, direction)
+        self.async_db.set_tab_sort(tab_name, order_by, direction)
 
 
     def add_tab(self, tab_name=None):
         if not tab_name:
             # Ask for tab name
+            from tkinter import simpledialog
             tab_name = simpledialog.askstring("Add Tab", "Enter tab name:")
             if not tab_name:
                 return
@@ -172,7 +355,7 @@ class AssignmentTracker:
             messagebox.showerror("Error", f"Tab '{tab_name}' already exists.")
             return
         self.create_tab(tab_name)
-        self.db.add_tab(tab_name)
+        self.async_db.add_tab(tab_name, errback=self.report_error(f"adding the tab '{tab_name}'"))
 
 
     def rename_tab(self):
@@ -181,6 +364,7 @@ class AssignmentTracker:
             return
         current_tab_index = self.notebook.index(current_tab)
         old_name = self.notebook.tab(current_tab, "text")
+        from tkinter import simpledialog
         new_name = simpledialog.askstring("Rename Tab", "Enter new tab name:", initialvalue=old_name)
         if not new_name or new_name == old_name:
             return
@@ -191,9 +375,18 @@ class AssignmentTracker:
         self.notebook.tab(current_tab, text=new_name)
         # Update the tab_frames and tab_trees dictionaries
         self.tab_frames[new_name] = self.tab_frames.pop(old_name)
-        self.tab_trees[new_name] = self.tab_trees.pop(old_name)
+        if old_name in self.loaded_tabs:
+            self.tab_trees[new_name] = self.tab_trees.pop(old_name)
+            if old_name in self.tab_virtual:
+                self.tab_virtual[new_name] = self.tab_virtual.pop(old_name)
+                self.tab_virtual[new_name].tab_name = new_name
+            else:
+                self.tab_syncs[new_name] = self.tab_syncs.pop(old_name)
+            self.tab_sorts[new_name] = self.tab_sorts.pop(old_name)
+            # Keep the tab's position in the recently viewed order
+            self.loaded_tabs = OrderedDict((new_name if name == old_name else name, True) for name in self.loaded_tabs)
         # Update the database
-        self.db.rename_tab(old_name, new_name)
+        self.async_db.rename_tab(old_name, new_name, errback=self.report_error(f"renaming the tab '{old_name}'"))
 
         # Update current_tab if necessary
         if self.current_tab == old_name:
@@ -210,14 +403,14 @@ class AssignmentTracker:
             # Remove tab from notebook
             self.notebook.forget(current_tab)
             # Remove from tab_frames and tab_trees
+            self.unload_tab(tab_name)
             del self.tab_frames[tab_name]
-            del self.tab_trees[tab_name]
             # Delete assignments from database
-            self.db.delete_tab(tab_name)
+            self.async_db.delete_tab(tab_name, errback=self.report_error(f"deleting the tab '{tab_name}'"))
 
             # Update current_tab if necessary
             if self.current_tab == tab_name:
-                remaining_tabs = self.db.get_all_tabs()
+                remaining_tabs = list(self.tab_frames)
                 self.current_tab = remaining_tabs[0] if remaining_tabs else None
 
 
@@ -225,18 +418,20 @@ class AssignmentTracker:
         if not self.current_tab:
             messagebox.showerror("Error", "No tab selected. Please select a tab before adding assignments.")
             return
+        from add_assignment_window import AssignmentWindow
         AssignmentWindow(self.root, self.save_assignment)
 
 
-    def save_assignment(self, title, due_date, status, notes):
-        success = self.db.add_assignment(self.current_tab, title, due_date, notes)
-        if success:
-            self.load_assignments(self.current_tab)  # Refresh the assignment list
-        return success  
+    def save_assignment(self, title, due_date, status, notes, on_saved):
+        # on_saved(success) is called once the worker has added the assignment; the new
+        # row is added to the tab by on_database_changes
+        self.async_db.add_assignment(self.current_tab, title, due_date, notes,
+                                     callback=on_saved, errback=lambda e: on_saved(False))
 
 
     def import_csv(self):
         # Open a file dialog to select the CSV file
+        from tkinter import filedialog
         file_path = filedialog.askopenfilename(
             title="Select CSV File",
             filetypes=(("CSV Files", "*.csv"), ("All Files", "*.*"))
@@ -251,87 +446,174 @@ class AssignmentTracker:
             return
         tab_name = self.notebook.tab(current_tab, "text")
 
-        try:
-            with open(file_path, newline='', encoding='utf-8') as csvfile:
-                reader = csv.DictReader(csvfile)
-                required_fields = {'assignment_title', 'due_date'}
-
-                # Check if the CSV has the required headers
-                if not required_fields.issubset(reader.fieldnames):
-                    messagebox.showerror("CSV Error", f"CSV file must contain headers: {', '.join(required_fields)}")
-                    return
-
-                imported_count = 0
-                for row in reader:
-                    assignment_title = row['assignment_title'].strip()
-                    due_date = row['due_date'].strip()
-                    notes = row.get('notes', '').strip()
-
-                    if not assignment_title or not due_date:
-                        continue  # Skip incomplete rows
-
-                    # Validate date format
-                    try:
-                        parse_date(due_date)
-                    except ValueError:
-                        continue  # Skip rows with invalid date format
-
-                    # Add assignment to the database
-                    self.db.add_assignment(tab_name, assignment_title, due_date, notes)
-                    imported_count += 1
+        from importer import CsvImportJob
+        self.run_import(CsvImportJob(file_path, tab_name))
 
-                self.load_assignments(tab_name)
-                messagebox.showinfo("Import Complete", f"Successfully imported {imported_count} assignments into '{tab_name}' tab.")
-        except Exception as e:
-            messagebox.showerror("Import Error", f"An error occurred while importing: {e}")
+
+    def import_ndjson(self):
+        # Import an NDJSON export, keeping each assignment's tab, status and notes
+        from tkinter import filedialog
+        file_path = filedialog.askopenfilename(
+            title="Select NDJSON File",
+            filetypes=(("NDJSON Files", "*.ndjson *.jsonl"), ("All Files", "*.*"))
+        )
+        if not file_path:
+            return
+        from importer import NdjsonImportJob
+        self.run_import(NdjsonImportJob(file_path))
+
+
+    def run_import(self, job):
+        # Read, validate and insert the file in chunks on the database worker, each
+        # chunk in its own transaction, while a dialog shows progress and can cancel.
+        # The tabs fill in as each chunk's change events arrive.
+        from import_progress_window import ImportProgressWindow
+        progress = ImportProgressWindow(self.root, job, os.path.basename(job.file_path))
+
+        def on_imported(counts):
+            self.import_jobs.discard(job)
+            metrics.record(f'ui.import_{job.file_format}', time.perf_counter() - start, job.imported())
+            progress.close()
+            summary = f"{counts['new']} new, {counts['updated']} updated and {counts['unchanged']} unchanged assignments"
+            if counts['cancelled']:
+                message = f"Import cancelled. {summary} were imported into {job.destination} before it stopped."
+            else:
+                message = f"Successfully imported {summary} into {job.destination}."
+            if counts['skipped'] or counts['invalid']:
+                message += f"\nSkipped {counts['skipped']} incomplete rows and {counts['invalid']} invalid rows."
+            messagebox.showinfo("Import Cancelled" if counts['cancelled'] else "Import Complete", message)
+
+        def on_error(e):
+            self.import_jobs.discard(job)
+            metrics.record(f'ui.import_{job.file_format}', time.perf_counter() - start, error=True, detail=job.file_path)
+            progress.close()
+            # Chunks committed before the error stay imported
+            message = f"An error occurred while importing: {e}"
+            if job.imported():
+                message += f"\n{job.imported()} assignments were imported before the error."
+            messagebox.showerror("Import Error", message)
+
+        start = time.perf_counter()
+        self.import_jobs.add(job)
+        self.async_db.submit(job.run, callback=on_imported, errback=on_error)
+
+
+    def export_to_file(self, export_format, all_tabs):
+        # Export the current tab, or every tab, to CSV or NDJSON on the database worker
+        tab_name = None
+        if not all_tabs:
+            current_tab = self.notebook.select()
+            if not current_tab:
+                messagebox.showerror("No Tab Selected", "Please select a tab to export.")
+                return
+            tab_name = self.notebook.tab(current_tab, "text")
+        from tkinter import filedialog
+        file_path = filedialog.asksaveasfilename(
+            title="Export Assignments",
+            defaultextension=f".{export_format}",
+            initialfile=f"{tab_name or 'assignments'}.{export_format}",
+            filetypes=((f"{export_format.upper()} Files", f"*.{export_format}"), ("All Files", "*.*"))
+        )
+        if not file_path:
+            return
+
+        def on_exported(count):
+            metrics.record('ui.export', time.perf_counter() - start, count)
+            source = f"'{tab_name}' tab" if tab_name else "all tabs"
+            messagebox.showinfo("Export Complete", f"Exported {count} assignments from {source} to {file_path}.")
+
+        def on_error(e):
+            metrics.record('ui.export', time.perf_counter() - start, error=True, detail=file_path)
+            messagebox.showerror("Export Error", f"An error occurred while exporting: {e}")
+
+        from exporter import export_assignments
+        start = time.perf_counter()
+        self.async_db.submit(export_assignments, file_path, export_format, tab_name, callback=on_exported, errback=on_error)
 
 
-    def load_assignments(self, tab_name):
+    def load_assignments(self, tab_name, select_id=None):
+        # Rows of plain tabs arrive from the database worker, so an assignment to
+        # select (select_id) is selected when they are shown
         if tab_name not in self.tab_trees:
             return
-        tree = self.tab_trees[tab_name]
-        # Clear the tree
-        for item in tree.get_children():
-            tree.delete(item)
-        # Get assignments from the database
-        assignments = self.db.get_assignments(tab_name)
-        for row in assignments:
-            assignment_id = row[0]
-            assignment_title = row[2]
-            due_date = row[3]
-            status = row[4]
-            # Determine the color tag based on status and due date
-            if status == 'Completed':
-                color_tag = 'completed'
+        # Timed from the request to the rows being on screen
+        start = time.perf_counter()
+        if tab_name in self.tab_virtual:
+            # Paged tabs only re-fetch the visible window, when the count arrives
+            self.tab_virtual[tab_name].refresh()
+            return
+        sync = self.tab_syncs[tab_name]
+
+        def show_assignments(assignments):
+            # The tab may have been unloaded while the query was running
+            if sync not in self.tab_syncs.values():
+                return
+            rows = [self.make_tree_row(row) for row in assignments]
+            # Insert, update, move or delete only the rows that changed
+            sync.sync(rows)
+            metrics.record('ui.load_assignments', time.perf_counter() - start, len(rows))
+            if select_id is not None:
+                self.select_assignment(sync.tree, select_id)
+
+        # Get assignments from the database, already in the tab's sort order, without blocking the UI
+        order_by, direction = self.tab_sorts[tab_name]
+        self.async_db.get_assignments(tab_name, order_by, direction, callback=show_assignments)
+
+
+    def on_database_changes(self, changes):
+        # Apply the writes announced on the bus (by this window, the dashboard or an
+        # import on the worker) to the loaded tabs, touching only the changed rows.
+        # Tab renames and deletions are made by this window, which updates the
+        # notebook itself; tabs created elsewhere (e.g. by an NDJSON import) are added.
+        for tab_name in changes.added_tabs:
+            if tab_name not in self.tab_frames and tab_name not in changes.deleted_tabs:
+                self.create_tab(tab_name)
+        for tab_name in list(self.loaded_tabs):
+            if tab_name in changes.reloaded:
+                self.load_assignments(tab_name)
+            elif tab_name in self.tab_virtual:
+                view = self.tab_virtual[tab_name]
+                shown = {row[0] for row in view.cache}
+                # Deleted rows are not known by tab, and may shift the visible window
+                # even when none of them is visible, so any deletion re-reads it
+                if changes.inserted.get(tab_name) or changes.deleted or changes.updated & shown:
+                    view.refresh()
             else:
-                color_tag = self.get_due_date_color_tag(due_date)
-            # Insert the assignment into the Treeview with the color tag
-            tree.insert('', tk.END, iid=assignment_id, values=(assignment_title, due_date, status), tags=(color_tag,))
-        # Configure tags for background and foreground colors
-        for tag, color in COLORS.items():
-            tree.tag_configure(tag, background=color['background'], foreground=color['foreground'])
+                self.apply_row_changes(tab_name, changes)
 
 
-    def get_due_date_color_tag(self, due_date_str):
-        # Returns the color tag based on how close the due date is.
-        try:
-            due_date = parse_date(due_date_str)
-            today = datetime.date.today()
-            delta_days = (due_date - today).days
-            if delta_days < 0:
-                return 'red'  # Past due dates
-            elif delta_days <= 3:
-                return 'red'
-            elif 3 < delta_days <= 7:
-                return 'orange'
-            elif 7 < delta_days <= 14:
-                return 'green'
-            elif delta_days > 14:
-                return 'blue'
-            else:
-                return 'blue'
-        except ValueError:
-            return ''
+    def apply_row_changes(self, tab_name, changes):
+        # Remove deleted rows from a tab, then fetch just its new and updated rows and
+        # put them in place
+        sync = self.tab_syncs[tab_name]
+        sync.remove(changes.deleted)
+        changed = {assignment_id for assignment_id in changes.updated if str(assignment_id) in sync.items}
+        changed |= changes.inserted.get(tab_name, set())
+        if not changed:
+            return
+        start = time.perf_counter()
+
+        def show_rows(rows):
+            # The tab may have been unloaded or renamed while the query was running
+            names = [name for name, tab_sync in self.tab_syncs.items() if tab_sync is sync]
+            if not names:
+                return
+            order_by, direction = self.tab_sorts[names[0]]
+            sync.update_rows([self.make_tree_row(row) for row in rows], ROW_SORT_KEYS[order_by], reverse=direction == 'DESC')
+            metrics.record('ui.apply_row_changes', time.perf_counter() - start, len(rows))
+
+        self.async_db.get_assignment_rows(changed, callback=show_rows)
+
+
+    def make_tree_row(self, row):
+        # Convert a database row to an (iid, values, tags) Treeview row. The color tag
+        # (last column) is computed by the query from the status and due date.
+        assignment_id = row[0]
+        assignment_title = row[2]
+        due_date = row[3]
+        status = row[4]
+        color_tag = row[5]
+        return (assignment_id, (assignment_title, due_date, status), (color_tag,))
 
 
     def show_context_menu(self, event):
@@ -344,116 +626,216 @@ class AssignmentTracker:
             self.menu.post(event.x_root, event.y_root)
 
 
+    def get_selected_ids(self, tree):
+        # Paged tabs track their selection by id across pages; plain tabs use the
+        # Treeview selection, whose iids are the assignment ids; a tab still being
+        # built has no selection
+        if tree is None:
+            return []
+        for view in self.tab_virtual.values():
+            if view.tree is tree:
+                return view.get_selected_ids()
+        return [int(item) for item in tree.selection()]
+
+
     def mark_completed(self):
-        selected_items = self.selected_tree.selection()
-        if not selected_items:
+        selected_ids = self.get_selected_ids(self.selected_tree)
+        if not selected_ids:
             messagebox.showwarning("No Selection", "Please select one or more assignments to mark as completed.")
             return
-        for item in selected_items:
-            assignment_id = int(item)  # The iid is the assignment_id
-            self.db.mark_completed(assignment_id)
-        # Reload assignments in the current tab
-        current_tab = self.notebook.select()
-        tab_name = self.notebook.tab(current_tab, "text")
-        self.load_assignments(tab_name)
+        # The tabs update from the change event once the worker has written it
+        self.async_db.mark_completed_many(selected_ids, errback=self.report_error("marking assignments as completed"))
 
 
     def delete_assignment(self):
-        selected_items = self.selected_tree.selection()
-        if not selected_items:
+        selected_ids = self.get_selected_ids(self.selected_tree)
+        if not selected_ids:
             messagebox.showwarning("No Selection", "Please select one or more assignments to delete.")
             return
         confirm = messagebox.askyesno("Confirm Delete", "Are you sure you want to delete the selected assignments?")
         if not confirm:
             return
-        for item in selected_items:
-            assignment_id = int(item)  # The iid is the assignment_id
-            self.db.delete_assignment(assignment_id)
-        # Reload assignments in the current tab
-        current_tab = self.notebook.select()
-        tab_name = self.notebook.tab(current_tab, "text")
-        self.load_assignments(tab_name)
+        self.async_db.delete_many(selected_ids, errback=self.report_error("deleting assignments"))
 
 
     def mark_selected_completed(self):
         current_tab = self.notebook.select()
         tab_name = self.notebook.tab(current_tab, "text")
-        tree = self.tab_trees[tab_name]
-        selected_items = tree.selection()
-        if not selected_items:
+        selected_ids = self.get_selected_ids(self.tab_trees.get(tab_name))
+        if not selected_ids:
             messagebox.showwarning("No Selection", "Please select one or more assignments to mark as completed.")
             return
-        for item in selected_items:
-            assignment_id = int(item)  # The iid is the assignment_id
-            self.db.mark_completed(assignment_id)
-        self.load_assignments(tab_name)
+        # The tabs update from the change event once the worker has written it
+        self.async_db.mark_completed_many(selected_ids, errback=self.report_error("marking assignments as completed"))
 
 
     def delete_selected_assignments(self):
         current_tab = self.notebook.select()
         tab_name = self.notebook.tab(current_tab, "text")
-        tree = self.tab_trees[tab_name]
-        selected_items = tree.selection()
-        if not selected_items:
+        selected_ids = self.get_selected_ids(self.tab_trees.get(tab_name))
+        if not selected_ids:
             messagebox.showwarning("No Selection", "Please select one or more assignments to delete.")
             return
         confirm = messagebox.askyesno("Confirm Delete", "Are you sure you want to delete the selected assignments?")
         if not confirm:
             return
-        for item in selected_items:
-            assignment_id = int(item)  # The iid is the assignment_id
-            self.db.delete_assignment(assignment_id)
-        self.load_assignments(tab_name)
+        self.async_db.delete_many(selected_ids, errback=self.report_error("deleting assignments"))
 
 
     def open_dashboard(self):
         if hasattr(self, 'dashboard_window') and self.dashboard_window.winfo_exists():
             self.dashboard_window.focus()
         else:
-            self.dashboard_window = Dashboard(self.root, self.db, self.open_assignment_from_dashboard)
+            from dashboard import Dashboard
+            self.dashboard_window = Dashboard(self.root, self.async_db, self.open_assignment_from_dashboard)
+
+
+    def archive_completed(self):
+        # Move completed assignments due before a chosen date out of the tabs. The
+        # tabs drop the rows when the change event arrives.
+        from tkinter import simpledialog
+        from utils import parse_date
+        answer = simpledialog.askstring("Archive Completed", "Archive completed assignments due before (YYYY-MM-DD):",
+                                        initialvalue=datetime.date.today().strftime(DATE_FORMAT))
+        if not answer:
+            return
+        try:
+            older_than = parse_date(answer.strip())
+        except ValueError as e:
+            messagebox.showerror("Invalid Date", str(e))
+            return
+
+        def on_archived(count):
+            metrics.record('ui.archive_completed', time.perf_counter() - start, count)
+            if hasattr(self, 'archive_window') and self.archive_window.winfo_exists():
+                self.archive_window.load_data()
+            messagebox.showinfo("Archive Complete", f"Archived {count} completed assignments due before {answer.strip()}.")
+
+        def on_error(e):
+            messagebox.showerror("Archive Error", f"An error occurred while archiving: {e}")
+
+        start = time.perf_counter()
+        self.async_db.archive_completed(older_than, callback=on_archived, errback=on_error)
+
+
+    def open_archive(self):
+        if hasattr(self, 'archive_window') and self.archive_window.winfo_exists():
+            self.archive_window.focus()
+        else:
+            from archive_window import ArchiveWindow
+            self.archive_window = ArchiveWindow(self.root, self.async_db)
+
+
+    def open_diagnostics(self):
+        from diagnostics_window import DiagnosticsWindow
+        DiagnosticsWindow(self.root)
+
+
+    def open_search(self):
+        query = self.search_var.get().strip()
+        if not query:
+            return
+        if hasattr(self, 'search_window') and self.search_window.winfo_exists():
+            self.search_window.search(query)
+            self.search_window.focus()
+        else:
+            from search_window import SearchWindow
+            self.search_window = SearchWindow(self.root, self.async_db, self.open_assignment_from_dashboard, query)
 
 
-    def open_assignment_from_dashboard(self, tab_name, assignment_title):
+    def open_assignment_from_dashboard(self, tab_name, assignment_id):
         # Switch to the corresponding tab
         for idx in range(len(self.notebook.tabs())):
             tab = self.notebook.tabs()[idx]
             if self.notebook.tab(tab, "text") == tab_name:
                 self.notebook.select(idx)
                 break
+        if tab_name not in self.loaded_tabs:
+            # The tab is built in the background and selects the assignment once shown
+            self.load_tab(tab_name, select_id=assignment_id)
+            return
+        self.load_tab(tab_name)
 
         # Highlight the assignment in the Treeview
-        tree = self.tab_trees.get(tab_name)
-        if tree:
-            # Find the item with the matching assignment title
-            for child in tree.get_children():
-                if tree.item(child)['values'][0] == assignment_title:
-                    tree.selection_set(child)
-                    tree.see(child)
-                    break
+        view = self.tab_virtual.get(tab_name)
+        if view:
+            self.select_in_view(view, assignment_id)
+            return
+        if not self.select_assignment(self.tab_trees[tab_name], assignment_id):
+            # Not shown yet (e.g. added moments ago): reload the tab and select it then
+            self.load_assignments(tab_name, assignment_id)
+
+
+    def select_in_view(self, view, assignment_id):
+        # Scroll a paged view to the page holding the assignment and select it
+
+        def show_position(index):
+            # The tab may have been unloaded while the position was being read
+            if index is not None and view in self.tab_virtual.values():
+                view.select(assignment_id, index)
+
+        self.async_db.get_assignment_position(view.tab_name, assignment_id, view.order_by, view.descending,
+                                              callback=show_position)
+
+
+    def select_assignment(self, tree, assignment_id):
+        # Select and scroll to an assignment's row; returns False if it is not shown
+        if not tree.exists(str(assignment_id)):
+            return False
+        tree.selection_set(str(assignment_id))
+        tree.see(str(assignment_id))
+        return True
 
 
     def open_details_window(self, assignment_id):
-        # Retrieve assignment data from the database
-        assignment = self.db.get_assignment_by_id(assignment_id)
-        if assignment:
-            DetailsWindow(self.root, assignment, self.save_notes)
+        # Retrieve assignment data from the database, then show it
 
+        def show_details(assignment):
+            if assignment:
+                from details_window import DetailsWindow
+                DetailsWindow(self.root, assignment, self.save_notes)
 
-    def save_notes(self, assignment_id, notes):
-        # Update notes in the database
-        success = self.db.update_notes(assignment_id, notes)
-        if success:
-            # Reload assignments in the current tab
-            current_tab = self.notebook.select()
-            tab_name = self.notebook.tab(current_tab, "text")
-            self.load_assignments(tab_name)
-        return success
+        self.async_db.get_assignment_by_id(assignment_id, callback=show_details,
+                                           errback=self.report_error("reading the assignment"))
+
+
+    def save_notes(self, assignment_id, notes, on_saved):
+        # Update notes in the database; on_saved(success) is called once written
+        self.async_db.update_notes(assignment_id, notes, callback=on_saved, errback=lambda e: on_saved(False))
+
+
+    def report_error(self, action):
+        # errback for background database requests whose failure the user should see
+        return lambda e: messagebox.showerror("Database Error", f"An error occurred while {action}: {e}")
+
+
+    def set_busy(self, busy):
+        # Show a busy indicator while background database requests are running
+        self.busy_label.config(text="Working..." if busy else "")
+        self.root.config(cursor="watch" if busy else "")
+
+
+    def on_close(self):
+        # Finish queued background requests before closing the connection
+        # (the worker may not exist yet if the window is closed during startup).
+        # Running imports stop after their current chunk, so closing does not wait
+        # for the rest of the file.
+        bus.detach()
+        if self.recolor is not None:
+            self.recolor.stop()
+        for job in self.import_jobs:
+            job.cancel()
+        if self.async_db is not None:
+            self.async_db.close()
+        self.root.destroy()
 
 
     def on_tab_changed(self, event):
         selected_tab = event.widget.select()
         tab_name = event.widget.tab(selected_tab, "text")
         self.current_tab = tab_name
+        # Build the tab the first time it is viewed
+        self.load_tab(tab_name)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,74 @@
+import tkinter as tk
+from tkinter import ttk
+
+from constants import ARCHIVE_PAGE_SIZE
+
+
+class ArchiveWindow(tk.Toplevel):
+    def __init__(self, master, async_db, page_size=ARCHIVE_PAGE_SIZE):
+        # Lists archived assignments, latest due date first, one page at a time.
+
+        # Args:
+        #     master (tk.Widget): The parent window.
+        #     async_db (AsyncDatabase): Runs the archive queries in the background.
+        #     page_size (int): Rows fetched per "Load More".
+        super().__init__(master)
+        self.title("Archived Assignments")
+        self.async_db = async_db
+        self.page_size = page_size
+        # (due_date, id) of the last row shown, used as the keyset cursor for "Load More"
+        self.last_key = None
+        # Bumped on every refresh so pages requested before it are discarded
+        self.generation = 0
+        self.create_widgets()
+        self.load_data()
+
+    def create_widgets(self):
+        columns = ('Course Name', 'Assignment Title', 'Due Date', 'Archived On')
+        self.tree = ttk.Treeview(self, columns=columns, show='headings')
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, minwidth=50, width=180)
+        self.tree.pack(expand=True, fill='both')
+
+        button_frame = tk.Frame(self)
+        button_frame.pack(side=tk.TOP, fill=tk.X, pady=5)
+
+        self.count_label = tk.Label(button_frame, text="")
+        self.count_label.pack(side=tk.LEFT, padx=10)
+
+        refresh_button = tk.Button(button_frame, text="Refresh", command=self.load_data)
+        refresh_button.pack(side=tk.RIGHT, padx=5)
+
+        self.load_more_button = tk.Button(button_frame, text="Load More", command=self.load_more)
+        self.load_more_button.pack(side=tk.RIGHT, padx=5)
+
+    def load_data(self):
+        # Clear the list and show the first page
+        self.tree.delete(*self.tree.get_children())
+        self.last_key = None
+        self.generation += 1
+        generation = self.generation
+        self.async_db.count_archived(callback=lambda count: self.show_count(count, generation))
+        self.load_more()
+
+    def load_more(self):
+        self.load_more_button.config(state=tk.DISABLED)
+        generation = self.generation
+        self.async_db.get_archived_page(self.page_size, after=self.last_key,
+                                        callback=lambda page: self.show_page(page, generation))
+
+    def show_count(self, count, generation):
+        if self.winfo_exists() and generation == self.generation:
+            self.count_label.config(text=f"{count:,} archived assignments")
+
+    def show_page(self, page, generation):
+        # The window may have been closed or refreshed while the query was running
+        if not self.winfo_exists() or generation != self.generation:
+            return
+        for assignment_id, tab_name, assignment_title, due_date, archived_at in page:
+            self.tree.insert('', tk.END, iid=assignment_id, values=(tab_name, assignment_title, due_date, archived_at))
+        if page:
+            self.last_key = (page[-1][3], page[-1][0])
+        # A short page means there is nothing left to load
+        self.load_more_button.config(state=tk.NORMAL if len(page) == self.page_size else tk.DISABLED)
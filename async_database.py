@@ -0,0 +1,107 @@
+# async_database.py
+
+import queue
+import threading
+from concurrent.futures import Future
+
+from constants import ASYNC_POLL_INTERVAL_MS, ASYNC_CLOSE_TIMEOUT_S
+from database import Database
+from events import bus
+
+
+class AsyncDatabase:
+    # Runs Database calls on a dedicated worker thread that owns its own connection,
+    # so the Tk main loop never waits on SQLite. Requests are queued and executed in
+    # order; completed requests are handed back to the Tk thread by polling with
+    # root.after, so callbacks may safely update widgets.
+    #
+    # Every public Database method has a non-blocking twin with the same arguments
+    # plus optional `callback` and `errback` keywords, e.g.
+    #     async_db.get_assignments(tab_name, callback=show_rows)
+    # Each call returns a concurrent.futures.Future.
+    def __init__(self, root, on_busy_changed=None, poll_interval=ASYNC_POLL_INTERVAL_MS, database_factory=Database):
+        # Args:
+        #     root (tk.Tk): The window whose event loop delivers results.
+        #     on_busy_changed (function): Called with True/False when requests start/stop being in flight.
+        #     database_factory (function): Creates the worker's Database, called on the worker thread.
+        self.root = root
+        self.on_busy_changed = on_busy_changed
+        self.poll_interval = poll_interval
+        self.database_factory = database_factory
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.pending = 0
+        self.thread = threading.Thread(target=self.run, name='database-worker', daemon=True)
+        self.thread.start()
+        self.poll_id = self.root.after(self.poll_interval, self.poll)
+
+    def run(self):
+        # Worker thread: the connection is created and used only here
+        db = self.database_factory()
+        while True:
+            request = self.requests.get()
+            if request is None:
+                break
+            future, target, args, kwargs = request
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                if callable(target):
+                    result = target(db, *args, **kwargs)
+                else:
+                    result = getattr(db, target)(*args, **kwargs)
+                future.set_result(result)
+            except Exception as e:
+                future.set_exception(e)
+        db.close()
+
+    def submit(self, target, *args, callback=None, errback=None, **kwargs):
+        # Queue a request. `target` is either the name of a Database method or a
+        # function called as target(db, *args, **kwargs) on the worker thread.
+        future = Future()
+        self.pending += 1
+        if self.pending == 1 and self.on_busy_changed:
+            self.on_busy_changed(True)
+        future.add_done_callback(lambda done: self.results.put((done, callback, errback)))
+        self.requests.put((future, target, args, kwargs))
+        return future
+
+    def __getattr__(self, name):
+        # Non-blocking variants of the public Database methods
+        if name.startswith('_') or not callable(getattr(Database, name, None)):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: self.submit(name, *args, **kwargs)
+
+    def poll(self):
+        # Tk thread: run the callbacks of completed requests. The next poll is
+        # scheduled first so a failing callback cannot stop delivery.
+        self.poll_id = self.root.after(self.poll_interval, self.poll)
+        # Deliver change events published by the worker's writes
+        bus.schedule()
+        while True:
+            try:
+                future, callback, errback = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.pending -= 1
+            if self.pending == 0 and self.on_busy_changed:
+                self.on_busy_changed(False)
+            if future.cancelled():
+                continue
+            error = future.exception()
+            if error is not None:
+                if errback:
+                    errback(error)
+                else:
+                    print(f"Database error in background request: {error}")
+            elif callback:
+                callback(future.result())
+
+    def close(self, timeout=ASYNC_CLOSE_TIMEOUT_S):
+        # Stop polling and let the worker finish queued requests and close its
+        # connection. Returns False if it is still busy after `timeout` seconds; the
+        # thread is a daemon, so it then ends with the process.
+        self.root.after_cancel(self.poll_id)
+        self.requests.put(None)
+        self.thread.join(timeout)
+        return not self.thread.is_alive()
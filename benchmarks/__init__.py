@@ -0,0 +1,4 @@
+# benchmarks
+#
+# Performance benchmarks. Run them from the repository root, e.g.
+#     python -m benchmarks.storage_profiles
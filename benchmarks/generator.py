@@ -0,0 +1,64 @@
+# benchmarks/generator.py
+#
+# Seeded synthetic data: the same seed always produces the same tabs, assignments and CSV files.
+
+import csv
+import datetime
+import random
+
+from constants import DATE_FORMAT, STATUS_COMPLETED, STATUS_PENDING
+
+SUBJECTS = ['Calculus', 'Physics', 'Chemistry', 'Biology', 'History', 'Literature', 'Economics', 'Statistics']
+KINDS = ['Homework', 'Lab Report', 'Essay', 'Quiz', 'Project', 'Reading', 'Problem Set', 'Presentation']
+NOTE_WORDS = ['chapter', 'section', 'problems', 'submit', 'online', 'group', 'draft', 'review',
+              'slides', 'lecture', 'figures', 'sources', 'https://example.edu/course', 'C:/school/files']
+
+
+def tab_names(tabs):
+    return [f"{SUBJECTS[i % len(SUBJECTS)]} {101 + i}" for i in range(tabs)]
+
+
+def generate_assignments(tabs, per_tab, seed=0, start=None, completed_ratio=0.3, notes_words=20):
+    # Yield assignment dicts with tab_name, assignment_title, due_date, status and notes.
+    # Due dates spread from 60 days before to 120 days after `start` (default: today).
+    rng = random.Random(seed)
+    start = start or datetime.date.today()
+    for tab_name in tab_names(tabs):
+        for i in range(per_tab):
+            due_date = start + datetime.timedelta(days=rng.randint(-60, 120))
+            yield {
+                'tab_name': tab_name,
+                'assignment_title': f"{rng.choice(KINDS)} {i + 1}",
+                'due_date': due_date.strftime(DATE_FORMAT),
+                'status': STATUS_COMPLETED if rng.random() < completed_ratio else STATUS_PENDING,
+                'notes': ' '.join(rng.choice(NOTE_WORDS) for _ in range(rng.randint(0, notes_words))),
+            }
+
+
+def populate(db, tabs, per_tab, seed=0, start=None):
+    # Fill a Database with generated tabs and assignments; returns the tab names
+    rows = list(generate_assignments(tabs, per_tab, seed, start))
+    names = tab_names(tabs)
+    for tab_name in names:
+        db.add_tab(tab_name)
+        db.add_assignments_bulk(tab_name, (row for row in rows if row['tab_name'] == tab_name))
+    completed = [assignment_id for assignment_id, row in enumerate(rows, start=1) if row['status'] == STATUS_COMPLETED]
+    db.mark_completed_many(completed)
+    return names
+
+
+def write_csv_fixture(path, rows, seed=0, invalid_ratio=0.01):
+    # Write an import CSV (assignment_title, due_date, notes) with `rows` data rows.
+    # A small share of rows is deliberately incomplete or has a malformed date.
+    rng = random.Random(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=['assignment_title', 'due_date', 'notes'])
+        writer.writeheader()
+        for row in generate_assignments(1, rows, seed):
+            roll = rng.random()
+            if roll < invalid_ratio / 2:
+                row['assignment_title'] = ''
+            elif roll < invalid_ratio:
+                row['due_date'] = row['due_date'].replace('-', '/')
+            writer.writerow({key: row[key] for key in ('assignment_title', 'due_date', 'notes')})
+    return path
@@ -0,0 +1,77 @@
+# benchmarks/headless.py
+#
+# Treeviews for benchmarking UI refresh paths without a window. A real ttk.Treeview
+# is used when a display is available (e.g. under xvfb-run); otherwise FakeTreeview
+# stands in, counting calls and mimicking the Tk semantics that TreeviewSync relies on.
+
+import os
+
+
+class FakeTreeview:
+    def __init__(self):
+        self.children = []
+        self.data = {}
+        self.tags = {}
+        self.calls = 0
+
+    def insert(self, parent, index, iid=None, values=(), tags=()):
+        self.calls += 1
+        if index == 'end':
+            index = len(self.children)
+        self.children.insert(index, iid)
+        self.data[iid] = {'values': tuple(values), 'tags': tuple(tags)}
+        return iid
+
+    def delete(self, *items):
+        self.calls += 1
+        for item in items:
+            self.children.remove(item)
+            del self.data[item]
+
+    def item(self, iid, **options):
+        self.calls += 1
+        if options:
+            self.data[iid].update({key: tuple(value) for key, value in options.items()})
+        return self.data[iid]
+
+    def move(self, iid, parent, index):
+        # Like Tk, the item is detached before the index is applied
+        self.calls += 1
+        self.children.remove(iid)
+        self.children.insert(max(0, index), iid)
+
+    def get_children(self, item=''):
+        self.calls += 1
+        return tuple(self.children)
+
+    def exists(self, iid):
+        self.calls += 1
+        return iid in self.data
+
+    def tag_configure(self, tag, **options):
+        self.calls += 1
+        self.tags[tag] = options
+
+    def heading(self, *args, **kwargs):
+        self.calls += 1
+
+    def selection(self):
+        self.calls += 1
+        return ()
+
+    def see(self, iid):
+        self.calls += 1
+
+
+def make_treeview(columns):
+    # Return (tree, kind) where kind is 'tk' or 'fake'
+    if os.environ.get('DISPLAY'):
+        try:
+            import tkinter as tk
+            from tkinter import ttk
+            root = tk.Tk()
+            root.withdraw()
+            return ttk.Treeview(root, columns=columns, show='headings'), 'tk'
+        except Exception:
+            pass
+    return FakeTreeview(), 'fake'
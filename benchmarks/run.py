@@ -0,0 +1,182 @@
+# benchmarks/run.py
+#
+# Reproducible benchmark suite. Builds a seeded database of N tabs x M assignments,
+# times the Database methods and the UI refresh paths, and emits JSON:
+#     python -m benchmarks.run --tabs 10 --per-tab 2000 --output results.json
+#     python -m benchmarks.run --baseline results.json   # fail on regressions
+# The run fails (exit status 1) when a hot query is not index-backed
+# (Database.check_query_plans) or, with --baseline, when a benchmark regressed.
+
+import argparse
+import csv
+import datetime
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks.generator import populate, write_csv_fixture
+from benchmarks.headless import make_treeview
+from constants import DASHBOARD_PAGE_SIZE, STORAGE_PROFILE, TREEVIEW_COLUMNS
+from database import Database
+from storage import StorageConfig
+from tree_sync import TreeviewSync
+
+
+def measure(function, repeat):
+    # Run function `repeat` times and return timing statistics in seconds
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return {'median_s': statistics.median(timings), 'min_s': min(timings), 'runs': repeat}
+
+
+def make_tree_row(row):
+    # Same conversion as AssignmentTracker.make_tree_row
+    return (row[0], (row[2], row[3], row[4]), (row[5],))
+
+
+def run_suite(args, directory):
+    storage = StorageConfig(os.path.join(directory, 'bench.db'), args.profile)
+    db = Database(storage, cache_size=0)
+    today = datetime.date.today()
+    tabs = populate(db, args.tabs, args.per_tab, seed=args.seed, start=today)
+    tab = tabs[0]
+    results = {}
+
+    # Database methods
+    results['db.get_all_tabs'] = measure(db.get_all_tabs, args.repeat)
+    results['db.get_assignments'] = measure(lambda: db.get_assignments(tab), args.repeat)
+    results['db.count_assignments'] = measure(lambda: db.count_assignments(tab), args.repeat)
+    results['db.get_assignments_page'] = measure(lambda: db.get_assignments_page(tab, args.per_tab // 2, 50, 'due_date'), args.repeat)
+    results['db.get_assignment_by_id'] = measure(lambda: db.get_assignment_by_id(args.per_tab // 2), args.repeat)
+    results['db.get_upcoming_page'] = measure(lambda: db.get_upcoming_page(today, DASHBOARD_PAGE_SIZE), args.repeat)
+    results['db.search'] = measure(lambda: db.search('lab chapter'), args.repeat)
+
+    # Bulk writes on a scratch tab, recreated for every run
+    csv_path = write_csv_fixture(os.path.join(directory, 'fixture.csv'), args.csv_rows, seed=args.seed)
+
+    def import_csv():
+        db.delete_tab('Import')
+        db.add_tab('Import')
+        with open(csv_path, newline='', encoding='utf-8') as csvfile:
+            db.add_assignments_bulk('Import', csv.DictReader(csvfile))
+
+    results['db.add_assignments_bulk (csv)'] = measure(import_csv, args.repeat)
+    import_ids = [row[0] for row in db.get_assignments('Import')]
+    results['db.mark_completed_many'] = measure(lambda: db.mark_completed_many(import_ids), args.repeat)
+    results['db.delete_many'] = measure(lambda: (import_csv(), db.delete_many([row[0] for row in db.get_assignments('Import')])), args.repeat)
+
+    # UI refresh paths, on a real or stand-in Treeview
+    tree, tree_kind = make_treeview(TREEVIEW_COLUMNS)
+
+    def load_tab_from_scratch():
+        sync = TreeviewSync(tree)
+        sync.sync([make_tree_row(row) for row in db.get_assignments(tab)])
+        sync.clear()
+
+    results['ui.load_assignments (initial)'] = measure(load_tab_from_scratch, args.repeat)
+
+    sync = TreeviewSync(tree)
+    sync.sync([make_tree_row(row) for row in db.get_assignments(tab)])
+    edit_id = int(sync.order[len(sync.order) // 2])
+    results['ui.load_assignments (after one edit)'] = measure(
+        lambda: (db.update_notes(edit_id, str(time.perf_counter())), db.mark_completed(edit_id),
+                 sync.sync([make_tree_row(row) for row in db.get_assignments(tab)])),
+        args.repeat)
+
+    def sort_by_due_date():
+        # Same work as AssignmentTracker.treeview_sort_column for the Due Date column,
+        # clicked twice: the sorted query, then moving the rows into place
+        sync.sync([make_tree_row(row) for row in db.get_assignments(tab, 'due_date', 'ASC')])
+        sync.sync([make_tree_row(row) for row in db.get_assignments(tab, 'due_date', 'DESC')])
+        sync.sync([make_tree_row(row) for row in db.get_assignments(tab)])
+
+    results['ui.treeview_sort_column'] = measure(sort_by_due_date, args.repeat)
+
+    dashboard_tree, _ = make_treeview(('Course Name', 'Assignment Title', 'Due Date'))
+
+    def load_dashboard():
+        for item in dashboard_tree.get_children():
+            dashboard_tree.delete(item)
+        for row in db.get_upcoming_page(today, DASHBOARD_PAGE_SIZE):
+            dashboard_tree.insert('', 'end', iid=row[0], values=(row[1], row[2], row[3]))
+
+    results['ui.dashboard_load_data'] = measure(load_dashboard, args.repeat)
+
+    meta = {
+        'tabs': args.tabs,
+        'per_tab': args.per_tab,
+        'csv_rows': args.csv_rows,
+        'seed': args.seed,
+        'profile': args.profile,
+        'treeview': tree_kind,
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'unindexed_queries': sorted(db.check_query_plans()),
+    }
+    db.close()
+    return {'meta': meta, 'results': results}
+
+
+def compare(results, baseline, tolerance):
+    # Print each benchmark against the baseline; return the names that regressed
+    regressions = []
+    for name, values in results['results'].items():
+        previous = baseline['results'].get(name)
+        if not previous:
+            print(f"{name:<40} {values['median_s']:>10.5f}s  (new)")
+            continue
+        ratio = values['median_s'] / previous['median_s'] if previous['median_s'] else 1.0
+        flag = 'REGRESSION' if ratio > tolerance else ''
+        print(f"{name:<40} {values['median_s']:>10.5f}s  x{ratio:5.2f} {flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the assignment tracker benchmark suite.")
+    parser.add_argument('--tabs', type=int, default=10)
+    parser.add_argument('--per-tab', type=int, default=2000)
+    parser.add_argument('--csv-rows', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--profile', default=STORAGE_PROFILE)
+    parser.add_argument('--output', help="write the JSON results to this file instead of stdout")
+    parser.add_argument('--baseline', help="JSON results of an earlier run to compare against")
+    parser.add_argument('--tolerance', type=float, default=1.25, help="slowdown ratio reported as a regression")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = run_suite(args, directory)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump(results, output, indent=2)
+    elif not args.baseline:
+        print(json.dumps(results, indent=2))
+
+    failed = False
+    for name in results['meta']['unindexed_queries']:
+        print(f"Hot query '{name}' is not index-backed; see Database.check_query_plans.", file=sys.stderr)
+        failed = True
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+        if compare(results, baseline, args.tolerance):
+            failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+# benchmarks/storage_profiles.py
+#
+# Compares the storage profiles in storage.STORAGE_PROFILES on a scratch database:
+#     python -m benchmarks.storage_profiles [--rows N] [--writes N] [--json]
+
+import argparse
+import datetime
+import json
+import os
+import tempfile
+import threading
+import time
+
+from database import Database
+from storage import STORAGE_PROFILES, StorageConfig
+
+
+def make_rows(count):
+    start = datetime.date(2030, 1, 1)
+    return [
+        {'assignment_title': f"Assignment {i}", 'due_date': (start + datetime.timedelta(days=i % 365)).isoformat(), 'notes': ''}
+        for i in range(count)
+    ]
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def run_profile(profile, rows, writes):
+    with tempfile.TemporaryDirectory() as directory:
+        storage = StorageConfig(os.path.join(directory, 'bench.db'), profile)
+        db = Database(storage, cache_size=0)
+        tab_names = [f"Course {i}" for i in range(10)]
+        results = {}
+
+        # One transaction per tab
+        results['bulk_import_s'] = timed(lambda: [db.add_assignments_bulk(tab, rows[i::len(tab_names)]) for i, tab in enumerate(tab_names)])
+        # One commit per row, where the synchronous level matters most
+        results['single_commits_s'] = timed(lambda: [db.add_assignment('Singles', f"Single {i}", '2030-01-01') for i in range(writes)])
+        results['tab_loads_s'] = timed(lambda: [db.get_assignments(tab) for tab in tab_names])
+        results['dashboard_pages_s'] = timed(lambda: [db.get_upcoming_page(datetime.date(2030, 1, 1), 10) for _ in range(100)])
+
+        # Tab loads while another connection holds a long write transaction
+        started = threading.Event()
+
+        def long_write():
+            writer = Database(storage, cache_size=0)
+            writer.cursor.execute("BEGIN IMMEDIATE")
+            writer.cursor.execute("UPDATE assignments SET notes = 'x' WHERE tab_id = (SELECT id FROM tabs WHERE name = ?)", (tab_names[0],))
+            started.set()
+            time.sleep(0.5)
+            writer.conn.commit()
+            writer.close()
+
+        thread = threading.Thread(target=long_write)
+        thread.start()
+        started.wait(10)
+        results['read_during_write_s'] = timed(lambda: db.get_assignments(tab_names[1]))
+        thread.join()
+        db.close()
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare SQLite storage profiles.")
+    parser.add_argument('--rows', type=int, default=50000, help="assignments to bulk import")
+    parser.add_argument('--writes', type=int, default=200, help="single-row commits")
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    results = {profile: run_profile(profile, rows, args.writes) for profile in STORAGE_PROFILES}
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    metrics = list(next(iter(results.values())))
+    print(f"{'profile':<10}" + ''.join(f"{metric:>22}" for metric in metrics))
+    for profile, values in results.items():
+        print(f"{profile:<10}" + ''.join(f"{values[metric]:>22.4f}" for metric in metrics))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+# cli.py
+#
+# Command-line access to the assignment database, without Tk, for scripts and
+# scheduled jobs. Data is read from stdin and written to stdout unless a file is
+# given; summaries and errors go to stderr so they never mix with the data.
+#
+#   python cli.py import --tab "Math 101" < assignments.csv
+#   python cli.py import --format ndjson backup.ndjson
+#   python cli.py export --format ndjson > backup.ndjson
+#   python cli.py list --tab "Math 101" --status Pending
+#   python cli.py list --status Pending | grep Essay | python cli.py complete
+#   python cli.py archive --before 2024-01-01
+#   python cli.py purge --before 2024-01-01
+#   python cli.py stats
+
+import argparse
+import datetime
+import os
+import sys
+
+from constants import DATABASE_PATH, STATUS_COMPLETED, STATUS_PENDING, STORAGE_PROFILE
+from database import Database
+from storage import StorageConfig
+from utils import parse_date
+
+FORMATS = ('csv', 'ndjson')
+
+
+def open_database(args):
+    # The CLI runs a single command, so the read cache would only add overhead
+    return Database(StorageConfig(args.database, args.profile), cache_size=0)
+
+
+def use_stream_newlines(stream):
+    # CSV handles line endings itself, so stdin/stdout must not translate them
+    stream.reconfigure(newline='', encoding='utf-8')
+    return stream
+
+
+def import_command(db, args):
+    from importer import CsvImportJob, NdjsonImportJob
+    path = args.file or '-'
+    if args.format == 'csv':
+        if not args.tab:
+            raise ValueError("CSV imports need --tab, the tab to import into.")
+        job = CsvImportJob(path, args.tab)
+    else:
+        job = NdjsonImportJob(path)
+    if args.file:
+        counts = job.run(db)
+    else:
+        counts = job.run_lines(db, use_stream_newlines(sys.stdin))
+    print(f"Imported {counts['new']} new, {counts['updated']} updated and {counts['unchanged']} unchanged assignments "
+          f"into {job.destination}; skipped {counts['skipped']} incomplete and {counts['invalid']} invalid rows.",
+          file=sys.stderr)
+
+
+def export_command(db, args):
+    from exporter import EXPORT_FORMATS, export_assignments
+    if args.file:
+        count = export_assignments(db, args.file, args.format, args.tab)
+    else:
+        count = EXPORT_FORMATS[args.format](db.iter_assignments(args.tab), use_stream_newlines(sys.stdout))
+    print(f"Exported {count} assignments.", file=sys.stderr)
+
+
+def list_command(db, args):
+    # One tab-separated line per assignment: id, tab, title, due date, status
+    out = sys.stdout
+    for row in db.iter_assignment_rows(args.tab, args.status):
+        out.write('\t'.join(str(value) for value in row))
+        out.write('\n')
+
+
+def read_ids(lines):
+    # The first field of every non-blank line, so the output of `list` can be piped in
+    for line in lines:
+        fields = line.split()
+        if fields:
+            try:
+                yield int(fields[0])
+            except ValueError:
+                raise ValueError(f"'{fields[0]}' is not an assignment id.") from None
+
+
+def complete_command(db, args):
+    ids = args.ids if args.ids else list(read_ids(sys.stdin))
+    changed = db.mark_completed_many(ids)
+    print(f"Marked {changed} assignments as completed.", file=sys.stderr)
+
+
+def purge_command(db, args):
+    deleted = db.purge_completed(parse_date(args.before), args.tab)
+    print(f"Deleted {deleted} completed assignments due before {args.before}.", file=sys.stderr)
+
+
+def archive_command(db, args):
+    moved = db.archive_completed(parse_date(args.before))
+    print(f"Archived {moved} completed assignments due before {args.before}.", file=sys.stderr)
+
+
+def stats_command(db, args):
+    today = parse_date(args.today) if args.today else datetime.date.today()
+    print('\t'.join(('tab', 'total', 'pending', 'completed', 'overdue')))
+    for row in db.get_stats(today):
+        print('\t'.join(str(value) for value in row))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Manage the assignment tracker database without the GUI.")
+    parser.add_argument('--database', default=DATABASE_PATH, help="database file (default: %(default)s)")
+    parser.add_argument('--profile', default=STORAGE_PROFILE, help="storage profile (default: %(default)s)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    command = commands.add_parser('import', help="import a CSV file into a tab, or an NDJSON export")
+    command.add_argument('file', nargs='?', help="file to read (default: stdin)")
+    command.add_argument('--format', choices=FORMATS, default='csv')
+    command.add_argument('--tab', help="tab to import a CSV file into (created if missing)")
+    command.set_defaults(run=import_command)
+
+    command = commands.add_parser('export', help="export one tab, or every tab, as CSV or NDJSON")
+    command.add_argument('file', nargs='?', help="file to write (default: stdout)")
+    command.add_argument('--format', choices=FORMATS, default='ndjson')
+    command.add_argument('--tab', help="only export this tab")
+    command.set_defaults(run=export_command)
+
+    command = commands.add_parser('list', help="list assignments as tab-separated id, tab, title, due date and status")
+    command.add_argument('--tab', help="only list this tab")
+    command.add_argument('--status', choices=(STATUS_PENDING, STATUS_COMPLETED))
+    command.set_defaults(run=list_command)
+
+    command = commands.add_parser('complete', help="mark assignments as completed")
+    command.add_argument('ids', nargs='*', type=int, help="assignment ids (default: the first field of each stdin line)")
+    command.set_defaults(run=complete_command)
+
+    command = commands.add_parser('archive', help="move completed assignments due before a date to the archive")
+    command.add_argument('--before', required=True, help="due date, YYYY-MM-DD")
+    command.set_defaults(run=archive_command)
+
+    command = commands.add_parser('purge', help="delete completed assignments due before a date")
+    command.add_argument('--before', required=True, help="due date, YYYY-MM-DD")
+    command.add_argument('--tab', help="only purge this tab")
+    command.set_defaults(run=purge_command)
+
+    command = commands.add_parser('stats', help="assignment counts per tab")
+    command.add_argument('--today', help="date that overdue is counted from (default: today)")
+    command.set_defaults(run=stats_command)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        db = open_database(args)
+    except Exception as e:
+        print(f"Error opening database: {e}", file=sys.stderr)
+        return 1
+    try:
+        args.run(db, args)
+    except BrokenPipeError:
+        # The reader stopped early (e.g. `list | head`); not an error. Point stdout at
+        # devnull so the flush at exit does not fail again.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
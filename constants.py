@@ -1,5 +1,9 @@
 # constants.py
 
+# SQLite database file and the storage profile (see storage.STORAGE_PROFILES) used to open it
+DATABASE_PATH = 'assignments.db'
+STORAGE_PROFILE = 'durable'
+
 # Date format used throughout the application
 DATE_FORMAT = '%Y-%m-%d'
 
@@ -27,6 +31,16 @@ COLORS = {
     }
 }
 
+# Pending assignments get the first color whose day limit the days until due fit
+# under (overdue assignments count as due today); None marks the open-ended bucket.
+# Every key must also appear in COLORS.
+DUE_DATE_COLOR_DAYS = {
+    'red': 3,
+    'orange': 7,
+    'green': 14,
+    'blue': None
+}
+
 # Required fields for CSV import
 REQUIRED_CSV_FIELDS = {'assignment_title', 'due_date'}
 
@@ -36,6 +50,66 @@ DEFAULT_TAB_NAME = 'Default'
 # Column names for Treeview widgets
 TREEVIEW_COLUMNS = ('Assignment Title', 'Due Date', 'Status')
 
+# Database column used when sorting by each Treeview column
+TREEVIEW_SORT_KEYS = {
+    'Assignment Title': 'assignment_title',
+    'Due Date': 'due_date',
+    'Status': 'status',
+}
+
+# Tabs with at least this many assignments use the paged (virtual) Treeview
+VIRTUAL_TREE_THRESHOLD = 5000
+
+# Extra rows fetched above and below the visible window of a virtual Treeview
+VIRTUAL_TREE_OVERSCAN = 50
+
+# Maximum number of tabs whose Treeviews are kept in memory; the least recently
+# viewed tab is unloaded (and rebuilt when selected again) beyond this
+MAX_LOADED_TABS = 10
+
+# Maximum number of query results kept in each Database's read cache (0 disables it)
+QUERY_CACHE_SIZE = 256
+
+# How often (in milliseconds) the Tk thread checks for finished background database requests
+ASYNC_POLL_INTERVAL_MS = 50
+
+# How long (in seconds) closing the app waits for the database worker to finish its
+# current request before leaving it behind
+ASYNC_CLOSE_TIMEOUT_S = 5
+
 # Status values
 STATUS_PENDING = 'Pending'
 STATUS_COMPLETED = 'Completed'
+
+# Number of upcoming assignments shown per dashboard page
+DASHBOARD_PAGE_SIZE = 10
+
+# Number of archived assignments shown per page of the archive window
+ARCHIVE_PAGE_SIZE = 50
+
+# Longest wait (in milliseconds) between checks of the date by recolor.RecolorScheduler,
+# which otherwise wakes at midnight
+RECOLOR_MAX_WAIT_MS = 60 * 60 * 1000
+
+# Maximum number of hits returned by a search
+SEARCH_RESULT_LIMIT = 100
+
+# Number of rows written per executemany() batch during bulk imports
+IMPORT_CHUNK_SIZE = 500
+
+# Number of rows fetched per fetchmany() call while exporting
+EXPORT_BATCH_SIZE = 1000
+
+# Notes of at least this many bytes (UTF-8) are stored zlib-compressed; see notes.py
+NOTES_COMPRESSION_THRESHOLD = 512
+
+# Upper bounds (in seconds) of the latency histogram buckets kept for every
+# instrumented database call and UI refresh
+LATENCY_BUCKETS_S = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Calls slower than this are written to the slow-query log, when it is enabled
+SLOW_QUERY_THRESHOLD_MS = 100
+
+# File the slow-query log is appended to at startup; None leaves it off until it is
+# switched on from View -> Diagnostics
+SLOW_QUERY_LOG_PATH = None
@@ -1,17 +1,35 @@
 import tkinter as tk
 from tkinter import ttk
 import datetime
+import time
 
-from constants import DATE_FORMAT, TREEVIEW_COLUMNS
-from utils import parse_date
+from constants import DASHBOARD_PAGE_SIZE, DATE_FORMAT, STATUS_PENDING
+from diagnostics import metrics
+from events import bus
+from tree_sync import TreeviewSync
+
+# Dashboard rows are ordered by (due date, id); values are (tab, title, due date)
+def dashboard_sort_key(iid, values):
+    return (values[2], int(iid))
 
 class Dashboard(tk.Toplevel):
-    def __init__(self, master, db, open_assignment_callback):
+    def __init__(self, master, async_db, open_assignment_callback, page_size=DASHBOARD_PAGE_SIZE):
         super().__init__(master)
         self.title("Upcoming Assignments Dashboard")
-        self.db = db
+        self.async_db = async_db
         self.open_assignment_callback = open_assignment_callback
+        self.page_size = page_size
+        # (due_date, id) of the last row shown, used as the keyset cursor for "Load More"
+        self.last_key = None
+        # False once the last page has been shown
+        self.more = True
+        # Bumped on every refresh so pages requested before it are discarded
+        self.generation = 0
         self.create_widgets()
+        self.sync = TreeviewSync(self.tree)
+        # Keep the list current as assignments change, until the window is closed
+        bus.subscribe(self.on_database_changes)
+        self.bind('<Destroy>', self.on_destroy)
         self.load_data()
 
     def create_widgets(self):
@@ -23,53 +41,120 @@ class Dashboard(tk.Toplevel):
             self.tree.column(col, minwidth=50, width=200)
         self.tree.pack(expand=True, fill='both')
 
+        button_frame = tk.Frame(self)
+        button_frame.pack(side=tk.TOP, pady=5)
+
         # Add a Refresh button
-        refresh_button = tk.Button(self, text="Refresh", command=self.load_data)
-        refresh_button.pack(side=tk.TOP, padx=5, pady=5)
+        refresh_button = tk.Button(button_frame, text="Refresh", command=self.load_data)
+        refresh_button.pack(side=tk.LEFT, padx=5)
+
+        # Add a Load More button to fetch the next page
+        self.load_more_button = tk.Button(button_frame, text="Load More", command=self.load_more)
+        self.load_more_button.pack(side=tk.LEFT, padx=5)
 
         # Bind double-click event
         self.tree.bind('<Double-1>', self.on_item_double_click)
 
     def load_data(self):
-        # Clear the tree
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        # Clear the tree and show the first page
+        self.sync.clear()
+        self.last_key = None
+        self.more = True
+        self.generation += 1
+        # Timed until the first page is shown
+        self.load_started = time.perf_counter()
+        self.load_more()
 
-        # Get today's date
+    def load_more(self):
+        # Query the database in the background for the next page of pending
+        # assignments due from today, already sorted by due date
         today = datetime.date.today()
+        self.load_more_button.config(state=tk.DISABLED)
+        generation = self.generation
+        self.async_db.get_upcoming_page(today, self.page_size, after=self.last_key,
+                                        callback=lambda page: self.show_page(page, generation))
+
+    def show_page(self, page, generation):
+        # The window may have been closed or refreshed while the query was running
+        if not self.winfo_exists() or generation != self.generation:
+            return
+
+        # Add the page after the rows already shown
+        self.sync.update_rows([self.make_row(assignment) for assignment in page], dashboard_sort_key)
+
+        if self.last_key is None:
+            metrics.record('ui.dashboard_load_data', time.perf_counter() - self.load_started, len(page))
+        if page:
+            self.last_key = (page[-1][3], page[-1][0])
+        # A short page means there is nothing left to load
+        self.set_more(len(page) == self.page_size)
+
+    def make_row(self, assignment):
+        # (iid, values, tags) Treeview row for an (id, tab_name, assignment_title, due_date, ...) row
+        return (assignment[0], (assignment[1], assignment[2], assignment[3]), ())
+
+    def set_more(self, more):
+        self.more = more
+        self.load_more_button.config(state=tk.NORMAL if more else tk.DISABLED)
+
+    def on_database_changes(self, changes):
+        # Patch the list instead of reloading it: drop deleted rows, follow tab
+        # renames and re-check only the new and updated assignments
+        if changes.reloaded:
+            # Some rows changed without ids (e.g. an import), so re-read what is shown
+            self.reload_shown()
+            return
+        self.sync.remove(changes.deleted)
+        for old_name, new_name in changes.renamed_tabs:
+            renamed = [(iid, (new_name,) + values[1:], tags) for iid, (values, tags) in self.sync.items.items() if values[0] == old_name]
+            self.sync.update_rows(renamed, dashboard_sort_key)
+        self.sync.remove(iid for iid, (values, tags) in self.sync.items.items() if values[0] in changes.deleted_tabs)
+        changed = {assignment_id for assignment_id in changes.updated if str(assignment_id) in self.sync.items}
+        changed |= changes.inserted_ids()
+        if changed:
+            generation = self.generation
+            self.async_db.get_assignment_rows(changed, callback=lambda rows: self.show_changed_rows(changed, rows, generation))
+
+    def show_changed_rows(self, ids, rows, generation):
+        # Show the changed assignments that belong in the loaded range and remove the rest
+        if not self.winfo_exists() or generation != self.generation:
+            return
+        today = datetime.date.today().strftime(DATE_FORMAT)
+        shown = [row for row in rows if row[4] == STATUS_PENDING and row[3] >= today and self.in_loaded_range(row)]
+        self.sync.remove(ids - {row[0] for row in shown})
+        self.sync.update_rows([self.make_row(row) for row in shown], dashboard_sort_key)
+
+    def in_loaded_range(self, row):
+        # Rows past the last loaded one are left for "Load More" to fetch
+        if not self.more:
+            return True
+        return self.last_key is not None and (row[3], row[0]) <= self.last_key
+
+    def reload_shown(self):
+        # Re-read every row loaded so far in one query and show only the differences
+        self.generation += 1
+        generation = self.generation
+        limit = max(len(self.sync.order), self.page_size)
+        self.async_db.get_upcoming_page(datetime.date.today(), limit,
+                                        callback=lambda page: self.show_reloaded(page, limit, generation))
+
+    def show_reloaded(self, page, limit, generation):
+        if not self.winfo_exists() or generation != self.generation:
+            return
+        self.sync.sync([self.make_row(assignment) for assignment in page])
+        self.last_key = (page[-1][3], page[-1][0]) if page else None
+        self.set_more(len(page) == limit)
 
-        # Query the database for pending assignments due after today
-        pending_assignments = self.db.get_upcoming_assignments(today)
-
-        # Parse due dates and filter assignments due after today
-        assignments_with_dates = []
-        for assignment in pending_assignments:
-            due_date_str = assignment[3]
-            try:
-                due_date = parse_date(due_date_str)
-                if due_date >= today:
-                    assignments_with_dates.append((assignment[0], assignment[1], assignment[2], due_date))
-            except ValueError:
-                continue  # Skip assignments with invalid date format
-
-        # Sort assignments by due date
-        sorted_assignments = sorted(assignments_with_dates, key=lambda x: x[3])  # x[3] is due_date
-
-        # Take the top 10 assignments
-        top_assignments = sorted_assignments[:10]
-
-        # Insert assignments into the Treeview
-        for assignment in top_assignments:
-            tab_name = assignment[1]          # tab_name
-            assignment_title = assignment[2]  # assignment_title
-            due_date = assignment[3].strftime(DATE_FORMAT)  # Convert date back to string
-            self.tree.insert('', tk.END, values=(tab_name, assignment_title, due_date))
+    def on_destroy(self, event):
+        # <Destroy> also fires for every child widget
+        if event.widget is self:
+            bus.unsubscribe(self.on_database_changes)
 
     def on_item_double_click(self, event):
-        item = self.tree.selection()
-        if item:
+        selected_items = self.tree.selection()
+        if selected_items:
+            item = selected_items[0]  # The iid is the assignment_id
             values = self.tree.item(item, 'values')
             tab_name = values[0]
-            assignment_title = values[1]
-            self.open_assignment_callback(tab_name, assignment_title)
+            self.open_assignment_callback(tab_name, int(item))
             self.focus()
@@ -1,120 +1,748 @@
 # database.py
 
+import re
 import sqlite3
-from constants import DATE_FORMAT
+import datetime
+from itertools import chain
+from constants import DATE_FORMAT, EXPORT_BATCH_SIZE, IMPORT_CHUNK_SIZE, DUE_DATE_COLOR_DAYS, QUERY_CACHE_SIZE, SEARCH_RESULT_LIMIT
+from migrations import migrate
+from query_cache import QueryCache
+from storage import StorageConfig
+from diagnostics import instrumented
+from notes import pack_notes
+from events import bus, RowsInserted, RowsUpdated, RowsDeleted, TabRowsChanged, TabAdded, TabRenamed, TabDeleted
 
+# Colour tag of an assignment, computed in SQL from a single bound "today" and the
+# due_date_colors table: completed rows are 'completed', otherwise the tag with the
+# smallest max_days that the days until due fit under (past due counts as 0 or less),
+# falling back to the open-ended tag. Rows with an unparseable due date get ''.
+COLOR_TAG_SQL = """
+    CASE
+        WHEN status = 'Completed' THEN 'completed'
+        WHEN julianday(due_date) IS NULL THEN ''
+        ELSE COALESCE(
+            (SELECT tag FROM due_date_colors
+             WHERE max_days IS NOT NULL AND julianday(due_date) - julianday(:today) <= max_days
+             ORDER BY max_days LIMIT 1),
+            (SELECT tag FROM due_date_colors WHERE max_days IS NULL),
+            '')
+    END
+"""
+
+# Queries on the hot path, with representative parameters. check_query_plans()
+# verifies that none of them falls back to a full scan of a table, other than the small
+# lookup tables in SCANNABLE_TABLES.
+# Reads go through the assignment_rows view (migration 008), which joins in the tab name.
+# List queries leave notes out: only get_assignment_by_id reads them, decompressed by
+# notes_text() (see notes.py).
+HOT_QUERIES = {
+    'get_assignments': (f"SELECT id, tab_name, assignment_title, due_date, status, {COLOR_TAG_SQL} FROM assignment_rows WHERE tab_name = :tab_name ORDER BY id ASC", {'tab_name': 'Default', 'today': '2000-01-01'}),
+    'get_assignments_by_title': (f"SELECT id, tab_name, assignment_title, due_date, status, {COLOR_TAG_SQL} FROM assignment_rows WHERE tab_name = :tab_name ORDER BY assignment_title COLLATE NOCASE DESC, id DESC", {'tab_name': 'Default', 'today': '2000-01-01'}),
+    'get_assignments_by_due_date': (f"SELECT id, tab_name, assignment_title, due_date, status, {COLOR_TAG_SQL} FROM assignment_rows WHERE tab_name = :tab_name ORDER BY due_date ASC, id ASC", {'tab_name': 'Default', 'today': '2000-01-01'}),
+    'get_assignment_by_id': ("SELECT id, tab_name, assignment_title, due_date, status, notes_text(notes) FROM assignment_rows WHERE id = ?", (1,)),
+    'get_upcoming_assignments': ("SELECT id, tab_name, assignment_title, due_date, status FROM assignment_rows WHERE status = 'Pending' AND due_date >= ?", ('2000-01-01',)),
+    'get_upcoming_page': ("SELECT id, tab_name, assignment_title, due_date, status FROM assignment_rows WHERE status = 'Pending' AND due_date >= ? AND (due_date, id) > (?, ?) ORDER BY due_date, id LIMIT ?", ('2000-01-01', '2000-01-01', 0, 10)),
+    'count_assignments': ("SELECT COUNT(*) FROM assignment_rows WHERE tab_name = ?", ('Default',)),
+    'get_assignments_page_by_title': (f"SELECT id, tab_name, assignment_title, due_date, status, {COLOR_TAG_SQL} FROM assignment_rows WHERE tab_name = :tab_name ORDER BY assignment_title COLLATE NOCASE, id LIMIT :limit OFFSET :offset", {'tab_name': 'Default', 'today': '2000-01-01', 'limit': 50, 'offset': 0}),
+    'get_assignments_page_by_due_date': (f"SELECT id, tab_name, assignment_title, due_date, status, {COLOR_TAG_SQL} FROM assignment_rows WHERE tab_name = :tab_name ORDER BY due_date DESC, id DESC LIMIT :limit OFFSET :offset", {'tab_name': 'Default', 'today': '2000-01-01', 'limit': 50, 'offset': 0}),
+    'get_assignments_page_by_status': (f"SELECT id, tab_name, assignment_title, due_date, status, {COLOR_TAG_SQL} FROM assignment_rows WHERE tab_name = :tab_name ORDER BY status, id LIMIT :limit OFFSET :offset", {'tab_name': 'Default', 'today': '2000-01-01', 'limit': 50, 'offset': 0}),
+    'get_archived_page': ("SELECT a.id, t.name, a.assignment_title, a.due_date, a.archived_at FROM assignments_archive a JOIN tabs t ON t.id = a.tab_id WHERE (a.due_date, a.id) < (?, ?) ORDER BY a.due_date DESC, a.id DESC LIMIT ?", ('9999-12-31', 0, 50)),
+    'rename_tab': ("UPDATE tabs SET name = ? WHERE name = ?", ('New', 'Default')),
+    # The lookup ON DELETE CASCADE runs when a tab is deleted
+    'delete_tab': ("DELETE FROM assignments WHERE tab_id = ?", (1,)),
+}
+
+# Tables small enough that a hot query may scan them: one row per tab and one per colour
+SCANNABLE_TABLES = {'tabs', 'due_date_colors'}
+
+# A full scan in EXPLAIN QUERY PLAN output names the table, or its alias in the query
+SCAN_DETAIL_PATTERN = re.compile(r'^SCAN (\w+)')
+TABLE_ALIAS_PATTERN = re.compile(r'\b(?:FROM|JOIN)\s+(\w+)(?:\s+AS)?\s+(\w+)', re.IGNORECASE)
+
+# Imports upsert on the natural key (tab_id, assignment_title, due_date). A conflicting
+# row is only rewritten when a value differs, so cursor.rowcount counts new plus updated
+# rows. Keys already in the archive are left alone, so re-importing a file does not bring
+# archived assignments back; they count as unchanged. CSV rows carry no status, and an
+# empty notes cell keeps the notes already saved.
+UPSERT_ASSIGNMENT_SQL = """
+    INSERT INTO assignments (tab_id, assignment_title, due_date, status, notes)
+    SELECT ?1, ?2, ?3, 'Pending', ?4
+    WHERE NOT EXISTS (SELECT 1 FROM assignments_archive WHERE tab_id = ?1 AND assignment_title = ?2 AND due_date = ?3)
+    ON CONFLICT (tab_id, assignment_title, due_date) DO UPDATE SET notes = excluded.notes
+    WHERE excluded.notes <> '' AND notes IS NOT excluded.notes
+"""
+
+# NDJSON records are complete copies, so status and notes are taken as they are
+UPSERT_RECORD_SQL = """
+    INSERT INTO assignments (tab_id, assignment_title, due_date, status, notes)
+    SELECT ?1, ?2, ?3, ?4, ?5
+    WHERE NOT EXISTS (SELECT 1 FROM assignments_archive WHERE tab_id = ?1 AND assignment_title = ?2 AND due_date = ?3)
+    ON CONFLICT (tab_id, assignment_title, due_date) DO UPDATE SET status = excluded.status, notes = excluded.notes
+    WHERE status IS NOT excluded.status OR notes IS NOT excluded.notes
+"""
+
+# Older SQLite builds allow at most 999 bound parameters per statement
+MAX_SQL_VARIABLES = 999
+
+# ORDER BY expressions accepted by the tab queries, keyed by column name. Every
+# ordering is made total by id so pages never overlap, and each one is backed by a
+# (tab_id, column) index so no query needs a sort step.
+ORDER_BY_COLUMNS = {
+    'id': 'id',
+    'assignment_title': 'assignment_title COLLATE NOCASE',
+    'due_date': 'due_date',
+    'status': 'status',
+}
+
+SORT_DIRECTIONS = ('ASC', 'DESC')
+
+def order_by_expression(order_by, direction):
+    # ORDER BY clause for a tab query; both parts are checked against fixed lists
+    # because they are interpolated into the SQL
+    if order_by not in ORDER_BY_COLUMNS:
+        raise ValueError(f"Cannot sort by '{order_by}'. Choose one of: {', '.join(ORDER_BY_COLUMNS)}.")
+    if direction not in SORT_DIRECTIONS:
+        raise ValueError(f"Sort direction must be 'ASC' or 'DESC', not '{direction}'.")
+    if order_by == 'id':
+        return f"id {direction}"
+    return f"{ORDER_BY_COLUMNS[order_by]} {direction}, id {direction}"
+
+# Every public method is timed into diagnostics.metrics as 'db.<method>', except the
+# cache plumbing that runs inside the timed methods and generators, whose work
+# happens after the call returns
+@instrumented('db', exclude=('get_data_version', 'cached', 'invalidate', 'invalidate_ids', 'cache_stats', 'sync_due_date_colors', 'close', 'iter_assignments', 'iter_assignment_rows', 'stream', 'upsert', 'restore_archived', 'get_tab_id', 'publish_upsert'))
 class Database:
-    def __init__(self):
-        # Connect to the SQLite database (it will be created if it doesn't exist)
-        self.conn = sqlite3.connect('assignments.db')
+    def __init__(self, storage=None, cache_size=QUERY_CACHE_SIZE):
+        # Connect to the SQLite database (it will be created if it doesn't exist).
+        # `storage` is a StorageConfig giving the path and tuning profile.
+        self.storage = storage or StorageConfig()
+        self.conn = self.storage.connect()
         self.cursor = self.conn.cursor()
-        self.create_tables()
-        self.update_tables()
-
-    def create_tables(self):
-        # Create the assignments table
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS assignments (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                tab_name TEXT,
-                assignment_title TEXT,
-                due_date TEXT,
-                status TEXT,
-                notes TEXT
-            )
-        """)
-
-        # Create the tabs table
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS tabs (
-                name TEXT PRIMARY KEY
-            )
-        """)
-        self.conn.commit()
+        migrate(self.conn)
+        # Deleting a tab cascades to its assignments. Enabled only after migrating,
+        # because migrations rebuild tables that foreign keys point at.
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.sync_due_date_colors()
+        # Reads go through a separate read-only connection so, with WAL, they never
+        # wait behind a write in progress
+        self.read_conn = self.storage.connect_reader() or self.conn
+        self.read_cursor = self.read_conn.cursor()
+        # Optional read cache; pass cache_size=0 to disable it
+        self.cache = QueryCache(cache_size) if cache_size else None
+        self.data_version = self.get_data_version()
+
+    def get_data_version(self):
+        # Changes whenever another connection commits to the database file
+        self.cursor.execute("PRAGMA data_version")
+        return self.cursor.fetchone()[0]
+
+    def cached(self, key, groups, load):
+        # Return the cached result for key, or run load() and cache it under groups
+        # (a list of invalidation groups, or a function of the loaded value returning one)
+        if self.cache is None:
+            return load()
+        # Drop everything if another connection (or process) has written since the last read
+        data_version = self.get_data_version()
+        if data_version != self.data_version:
+            self.cache.clear()
+            self.data_version = data_version
+        found, value = self.cache.get(key)
+        if not found:
+            value = load()
+            self.cache.put(key, value, groups(value) if callable(groups) else groups)
+        return list(value) if isinstance(value, list) else value
+
+    def invalidate(self, *groups):
+        if self.cache is not None:
+            self.cache.invalidate(*groups)
+
+    def invalidate_ids(self, assignment_ids):
+        # Drop cached rows for these assignments, the tabs they belong to and the
+        # upcoming lists. Must run before the write so deleted rows can still be found.
+        if self.cache is None:
+            return
+        ids = list(assignment_ids)
+        groups = [('id', assignment_id) for assignment_id in ids]
+        for start in range(0, len(ids), MAX_SQL_VARIABLES):
+            chunk = ids[start:start + MAX_SQL_VARIABLES]
+            self.cursor.execute(f"SELECT DISTINCT tab_name FROM assignment_rows WHERE id IN ({', '.join('?' * len(chunk))})", chunk)
+            groups.extend(('tab', row[0]) for row in self.cursor.fetchall())
+        self.cache.invalidate('upcoming', *groups)
 
-    def update_tables(self):
-        # Check if 'notes' column exists in assignments table
-        self.cursor.execute("PRAGMA table_info(assignments)")
-        columns = [column[1] for column in self.cursor.fetchall()]
-        if 'notes' not in columns:
-            self.cursor.execute("ALTER TABLE assignments ADD COLUMN notes TEXT")
+    def cache_stats(self):
+        # Hit/miss counters of the read cache, or None when caching is disabled
+        return self.cache.stats() if self.cache is not None else None
+
+    def sync_due_date_colors(self):
+        # Keep the due_date_colors table identical to constants.DUE_DATE_COLOR_DAYS
+        self.cursor.execute("SELECT tag, max_days FROM due_date_colors")
+        if dict(self.cursor.fetchall()) != DUE_DATE_COLOR_DAYS:
+            self.cursor.execute("DELETE FROM due_date_colors")
+            self.cursor.executemany("INSERT INTO due_date_colors (tag, max_days) VALUES (?, ?)", DUE_DATE_COLOR_DAYS.items())
             self.conn.commit()
 
     def get_all_tabs(self):
-        self.cursor.execute("SELECT name FROM tabs")
-        tabs = [row[0] for row in self.cursor.fetchall()]
+        self.read_cursor.execute("SELECT name FROM tabs ORDER BY id")
+        tabs = [row[0] for row in self.read_cursor.fetchall()]
         return tabs
 
+    def get_tab_sort(self, tab_name):
+        # Return the tab's saved (order_by, direction), ('id', 'ASC') if none was chosen
+        self.read_cursor.execute("SELECT sort_column, sort_direction FROM tabs WHERE name = ?", (tab_name,))
+        row = self.read_cursor.fetchone()
+        if not row or row[0] not in ORDER_BY_COLUMNS or row[1] not in SORT_DIRECTIONS:
+            return ('id', 'ASC')
+        return (row[0], row[1])
+
+    def set_tab_sort(self, tab_name, order_by, direction):
+        order_by_expression(order_by, direction)
+        self.cursor.execute("UPDATE tabs SET sort_column = ?, sort_direction = ? WHERE name = ?", (order_by, direction, tab_name))
+        self.conn.commit()
+
     def add_tab(self, tab_name):
         self.cursor.execute("INSERT OR IGNORE INTO tabs (name) VALUES (?)", (tab_name,))
+        added = self.cursor.rowcount
         self.conn.commit()
+        if added:
+            bus.publish(TabAdded(tab_name))
+
+    def get_tab_id(self, tab_name, created=None):
+        # Return the id of a tab, creating the tab if needed, inside the caller's
+        # transaction. A newly created tab's name is appended to the list `created`.
+        self.cursor.execute("INSERT OR IGNORE INTO tabs (name) VALUES (?)", (tab_name,))
+        if self.cursor.rowcount and created is not None:
+            created.append(tab_name)
+        self.cursor.execute("SELECT id FROM tabs WHERE name = ?", (tab_name,))
+        return self.cursor.fetchone()[0]
 
     def rename_tab(self, old_name, new_name):
-        # Update the tab name in the tabs table
+        # Assignments reference the tab by id, so only the tab row changes
         self.cursor.execute("UPDATE tabs SET name = ? WHERE name = ?", (new_name, old_name))
-        # Update the tab_name in the assignments table
-        self.cursor.execute("UPDATE assignments SET tab_name = ? WHERE tab_name = ?", (new_name, old_name))
+        renamed = self.cursor.rowcount
         self.conn.commit()
+        self.invalidate(('tab', old_name), ('tab', new_name), 'upcoming')
+        if renamed:
+            bus.publish(TabRenamed(old_name, new_name))
 
     def delete_tab(self, tab_name):
-        # Delete the tab from the tabs table
+        # The tab's assignments are removed by ON DELETE CASCADE
         self.cursor.execute("DELETE FROM tabs WHERE name = ?", (tab_name,))
-        # Delete all assignments associated with the tab
-        self.cursor.execute("DELETE FROM assignments WHERE tab_name = ?", (tab_name,))
+        deleted = self.cursor.rowcount
         self.conn.commit()
+        self.invalidate(('tab', tab_name), 'upcoming')
+        if deleted:
+            bus.publish(TabDeleted(tab_name))
 
     def add_assignment(self, tab_name, assignment_title, due_date, notes=''):
-        self.cursor.execute("""
-            INSERT INTO assignments (tab_name, assignment_title, due_date, status, notes)
-            VALUES (?, ?, ?, 'Pending', ?)
-        """, (tab_name, assignment_title, due_date, notes))
-        self.conn.commit()
+        # Returns False if the tab already has an assignment with this title and due date,
+        # live or archived (the archive has no unique key of its own, see UPSERT_ASSIGNMENT_SQL)
+        created = []
+        try:
+            self.cursor.execute("""
+                INSERT INTO assignments (tab_id, assignment_title, due_date, status, notes)
+                SELECT ?1, ?2, ?3, 'Pending', ?4
+                WHERE NOT EXISTS (SELECT 1 FROM assignments_archive WHERE tab_id = ?1 AND assignment_title = ?2 AND due_date = ?3)
+            """, (self.get_tab_id(tab_name, created), assignment_title, due_date, pack_notes(notes)))
+            if not self.cursor.rowcount:
+                raise sqlite3.IntegrityError(f"'{assignment_title}' due {due_date} is archived.")
+            assignment_id = self.cursor.lastrowid
+            self.conn.commit()
+        except sqlite3.IntegrityError as e:
+            self.conn.rollback()
+            print(f"Error adding assignment: {e}")
+            return False
+        self.invalidate(('tab', tab_name), 'upcoming')
+        bus.publish(*[TabAdded(name) for name in created], RowsInserted(tab_name, [assignment_id]))
         return True
 
-    def get_assignments(self, tab_name):
-        self.cursor.execute("""
-            SELECT id, tab_name, assignment_title, due_date, status, notes
-            FROM assignments
-            WHERE tab_name = ?
-        """, (tab_name,))
-        return self.cursor.fetchall()
+    def add_assignments_bulk(self, tab_name, rows, chunk_size=IMPORT_CHUNK_SIZE):
+        # Upsert many assignments in a single transaction.
+        # Each row is a mapping with 'assignment_title', 'due_date' and optionally 'notes'
+        # (e.g. a csv.DictReader row). Rows missing a title or due date are skipped,
+        # rows with a malformed due date are counted as invalid; the rest are counted as
+        # new, updated or unchanged. If any insert fails the whole import is rolled back
+        # and the error is re-raised.
+        from importer import iter_chunks
+        counts = {'new': 0, 'updated': 0, 'unchanged': 0, 'skipped': 0, 'invalid': 0}
+        created = []
+        new_rows = []
+        try:
+            tab_id = self.get_tab_id(tab_name, created)
+            for chunk in iter_chunks(rows, counts, chunk_size):
+                chunk_counts, chunk_new_rows = self.upsert(UPSERT_ASSIGNMENT_SQL, [(tab_id,) + row for row in chunk])
+                for key, value in chunk_counts.items():
+                    counts[key] += value
+                new_rows.extend(chunk_new_rows)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            self.invalidate(('tab', tab_name), 'upcoming')
+        self.publish_upsert(counts, new_rows, {tab_id: tab_name}, created)
+        return counts
+
+    def upsert_assignments(self, tab_name, rows):
+        # Upsert already validated (assignment_title, due_date, notes) rows in one
+        # transaction of their own; used by the streaming importer for each chunk.
+        # Returns {'new', 'updated', 'unchanged'} row counts.
+        created = []
+        try:
+            tab_id = self.get_tab_id(tab_name, created)
+            counts, new_rows = self.upsert(UPSERT_ASSIGNMENT_SQL, [(tab_id,) + tuple(row) for row in rows])
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            self.invalidate(('tab', tab_name), 'upcoming')
+        self.publish_upsert(counts, new_rows, {tab_id: tab_name}, created)
+        return counts
+
+    def upsert_assignment_records(self, records):
+        # Upsert already validated (tab_name, assignment_title, due_date, status, notes,
+        # archived_at) records, creating any missing tabs, in one transaction of their own.
+        # Records with an archived_at date are restored to the archive.
+        # Returns {'new', 'updated', 'unchanged'} row counts.
+        records = [tuple(record) for record in records]
+        # Sorted so new tabs are created, and announced, in a stable order
+        tab_names = sorted({record[0] for record in records})
+        created = []
+        try:
+            tab_ids = {name: self.get_tab_id(name, created) for name in tab_names}
+            counts, new_rows = self.upsert(UPSERT_RECORD_SQL, [(tab_ids[record[0]],) + record[1:5] for record in records])
+            archived = self.restore_archived([(tab_ids[record[0]], record[1], record[2], record[5]) for record in records if record[5]])
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            self.invalidate('upcoming', *[('tab', name) for name in tab_names])
+        new_ids = {row[0] for row in new_rows}
+        self.publish_upsert(counts, [row for row in new_rows if row[0] not in archived],
+                            {tab_id: name for name, tab_id in tab_ids.items()}, created)
+        if archived - new_ids:
+            bus.publish(RowsDeleted(archived - new_ids))
+        return counts
+
+    def restore_archived(self, records):
+        # Move the live rows matching (tab_id, assignment_title, due_date, archived_at)
+        # records to the archive inside the caller's transaction and return their ids.
+        # The records were upserted first, so restored rows take their id from the live
+        # table's sequence like archive_completed's do; keys already archived were
+        # skipped by the upsert and match no live row. Records repeating a key (e.g. an
+        # export of an archive that holds the key twice) move its row once.
+        archived_at_by_id = {}
+        for tab_id, assignment_title, due_date, archived_at in records:
+            self.cursor.execute("SELECT id FROM assignments WHERE tab_id = ? AND assignment_title = ? AND due_date = ?",
+                                (tab_id, assignment_title, due_date))
+            row = self.cursor.fetchone()
+            if row:
+                archived_at_by_id[row[0]] = archived_at
+        moved = [(archived_at, assignment_id) for assignment_id, archived_at in archived_at_by_id.items()]
+        self.cursor.executemany("""
+            INSERT INTO assignments_archive (id, tab_id, assignment_title, due_date, status, notes, archived_at)
+            SELECT id, tab_id, assignment_title, due_date, status, notes, ? FROM assignments WHERE id = ?
+        """, moved)
+        self.cursor.executemany("DELETE FROM assignments WHERE id = ?", [(assignment_id,) for archived_at, assignment_id in moved])
+        return {assignment_id for archived_at, assignment_id in moved}
+
+    def upsert(self, sql, params):
+        # Run one of the UPSERT_* statements for every parameter tuple inside the caller's
+        # transaction. Ids only grow (AUTOINCREMENT), so rows above the previous maximum
+        # id are new; the remaining changed rows were updated. Returns the
+        # {'new', 'updated', 'unchanged'} counts and the (id, tab_id) of every new row.
+        # Notes, the last parameter of both statements, are stored packed.
+        params = [tuple(row[:-1]) + (pack_notes(row[-1]),) for row in params]
+        self.cursor.execute("SELECT COALESCE(MAX(id), 0) FROM assignments")
+        last_id = self.cursor.fetchone()[0]
+        self.cursor.executemany(sql, params)
+        changed = self.cursor.rowcount
+        self.cursor.execute("SELECT id, tab_id FROM assignments WHERE id > ?", (last_id,))
+        new_rows = self.cursor.fetchall()
+        new = len(new_rows)
+        return {'new': new, 'updated': changed - new, 'unchanged': len(params) - changed}, new_rows
+
+    def publish_upsert(self, counts, new_rows, tab_names, created):
+        # Announce a committed upsert: created tabs, the new rows of each tab and, as
+        # the updated rows are not known individually, a reload of the tabs written to
+        # when any row was updated. tab_names maps the tab ids written to to names.
+        events = [TabAdded(name) for name in created]
+        new_ids = {}
+        for assignment_id, tab_id in new_rows:
+            new_ids.setdefault(tab_id, []).append(assignment_id)
+        events.extend(RowsInserted(tab_names[tab_id], ids) for tab_id, ids in new_ids.items())
+        if counts['updated']:
+            events.extend(TabRowsChanged(name) for name in tab_names.values())
+        bus.publish(*events)
+
+    def iter_assignments(self, tab_name=None, batch_size=EXPORT_BATCH_SIZE):
+        # Yield (tab_name, assignment_title, due_date, status, notes, archived_at) for one
+        # tab, or every tab when tab_name is None: the live assignments in id order, with
+        # archived_at None, then the archived ones in id order
+        live_sql = "SELECT tab_name, assignment_title, due_date, status, notes_text(notes), NULL FROM assignment_rows"
+        archive_sql = """
+            SELECT t.name, a.assignment_title, a.due_date, a.status, notes_text(a.notes), a.archived_at
+            FROM assignments_archive a
+            JOIN tabs t ON t.id = a.tab_id
+        """
+        if tab_name is None:
+            return chain(self.stream(live_sql + " ORDER BY id", (), batch_size),
+                         self.stream(archive_sql + " ORDER BY a.id", (), batch_size))
+        return chain(self.stream(live_sql + " WHERE tab_name = ? ORDER BY id", (tab_name,), batch_size),
+                     self.stream(archive_sql + " WHERE t.name = ? ORDER BY a.id", (tab_name,), batch_size))
+
+    def iter_assignment_rows(self, tab_name=None, status=None, batch_size=EXPORT_BATCH_SIZE):
+        # Yield (id, tab_name, assignment_title, due_date, status) for one tab (or every
+        # tab), optionally only those with the given status, in id order
+        conditions = []
+        params = []
+        if tab_name is not None:
+            conditions.append("tab_name = ?")
+            params.append(tab_name)
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = f"SELECT id, tab_name, assignment_title, due_date, status FROM assignment_rows{where} ORDER BY id"
+        return self.stream(sql, params, batch_size)
+
+    def stream(self, sql, params, batch_size=EXPORT_BATCH_SIZE):
+        # Yield the rows of a read query, pulled from a cursor of their own with
+        # fetchmany, so memory use does not grow with the table
+        cursor = self.read_conn.cursor()
+        try:
+            cursor.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+
+    def get_assignments(self, tab_name, order_by='id', direction='ASC', today=None):
+        # Return a tab's (id, tab_name, assignment_title, due_date, status, colour tag)
+        # rows sorted by one of ORDER_BY_COLUMNS (then id) in the given direction
+        # ('ASC' or 'DESC'). The colour tag is for `today` (default: the current date).
+        # Notes are left out; get_assignment_by_id returns them.
+        expression = order_by_expression(order_by, direction)
+        today = (today or datetime.date.today()).strftime(DATE_FORMAT)
+
+        def load():
+            self.read_cursor.execute(f"""
+                SELECT id, tab_name, assignment_title, due_date, status, {COLOR_TAG_SQL}
+                FROM assignment_rows
+                WHERE tab_name = :tab_name
+                ORDER BY {expression}
+            """, {'tab_name': tab_name, 'today': today})
+            return self.read_cursor.fetchall()
+
+        return self.cached(('assignments', tab_name, order_by, direction, today), [('tab', tab_name)], load)
+
+    def count_assignments(self, tab_name):
+        self.read_cursor.execute("SELECT COUNT(*) FROM assignment_rows WHERE tab_name = ?", (tab_name,))
+        return self.read_cursor.fetchone()[0]
+
+    def get_assignments_page(self, tab_name, offset, limit, order_by='id', descending=False, today=None):
+        # Return one page of a tab, ordered by one of ORDER_BY_COLUMNS (then id).
+        # Rows end with the colour tag, as in get_assignments.
+        expression = order_by_expression(order_by, 'DESC' if descending else 'ASC')
+        today = today or datetime.date.today()
+        self.read_cursor.execute(f"""
+            SELECT id, tab_name, assignment_title, due_date, status, {COLOR_TAG_SQL}
+            FROM assignment_rows
+            WHERE tab_name = :tab_name
+            ORDER BY {expression}
+            LIMIT :limit OFFSET :offset
+        """, {'tab_name': tab_name, 'today': today.strftime(DATE_FORMAT), 'limit': limit, 'offset': offset})
+        return self.read_cursor.fetchall()
+
+    def get_assignment_position(self, tab_name, assignment_id, order_by='id', descending=False):
+        # Return the zero-based index of an assignment within its tab for the given
+        # ordering, or None if it does not belong to the tab
+        row = self.get_assignment_by_id(assignment_id)
+        if not row or row[1] != tab_name:
+            return None
+        column = ORDER_BY_COLUMNS[order_by]
+        value = row[{'id': 0, 'assignment_title': 2, 'due_date': 3, 'status': 4}[order_by]]
+        comparison = '>' if descending else '<'
+        self.read_cursor.execute(f"""
+            SELECT COUNT(*)
+            FROM assignment_rows
+            WHERE tab_name = ? AND ({column} {comparison} ? OR ({column} = ? AND id {comparison} ?))
+        """, (tab_name, value, value, assignment_id))
+        return self.read_cursor.fetchone()[0]
+
+    def get_assignment_rows(self, assignment_ids, today=None):
+        # Return the rows of the given assignments in the get_assignments shape, in no
+        # particular order; ids that no longer exist are left out
+        ids = list(assignment_ids)
+        today = (today or datetime.date.today()).strftime(DATE_FORMAT)
+        rows = []
+        for start in range(0, len(ids), MAX_SQL_VARIABLES - 1):
+            chunk = ids[start:start + MAX_SQL_VARIABLES - 1]
+            params = {'today': today}
+            params.update((f"id{index}", assignment_id) for index, assignment_id in enumerate(chunk))
+            self.read_cursor.execute(f"""
+                SELECT id, tab_name, assignment_title, due_date, status, {COLOR_TAG_SQL}
+                FROM assignment_rows
+                WHERE id IN ({', '.join(f':id{index}' for index in range(len(chunk)))})
+            """, params)
+            rows.extend(self.read_cursor.fetchall())
+        return rows
 
     def get_assignment_by_id(self, assignment_id):
-        self.cursor.execute("""
-            SELECT id, tab_name, assignment_title, due_date, status, notes
-            FROM assignments
-            WHERE id = ?
-        """, (assignment_id,))
-        return self.cursor.fetchone()
+        def load():
+            self.read_cursor.execute("""
+                SELECT id, tab_name, assignment_title, due_date, status, notes_text(notes)
+                FROM assignment_rows
+                WHERE id = ?
+            """, (assignment_id,))
+            return self.read_cursor.fetchone()
+
+        # The row is registered under its tab as well, so renaming or deleting the tab drops it
+        groups = lambda row: [('id', assignment_id)] + ([('tab', row[1])] if row else [])
+        return self.cached(('assignment', assignment_id), groups, load)
 
     def update_notes(self, assignment_id, notes):
         try:
-            self.cursor.execute("UPDATE assignments SET notes = ? WHERE id = ?", (notes, assignment_id))
+            self.invalidate_ids([assignment_id])
+            self.cursor.execute("UPDATE assignments SET notes = ? WHERE id = ?", (pack_notes(notes), assignment_id))
             self.conn.commit()
+            bus.publish(RowsUpdated([assignment_id]))
             return True
         except sqlite3.Error as e:
             print(f"Database error during update_notes: {e}")
             return False
 
     def mark_completed(self, assignment_id):
+        self.invalidate_ids([assignment_id])
         self.cursor.execute("UPDATE assignments SET status = 'Completed' WHERE id = ?", (assignment_id,))
         self.conn.commit()
+        bus.publish(RowsUpdated([assignment_id]))
 
     def delete_assignment(self, assignment_id):
+        self.invalidate_ids([assignment_id])
         self.cursor.execute("DELETE FROM assignments WHERE id = ?", (assignment_id,))
         self.conn.commit()
+        bus.publish(RowsDeleted([assignment_id]))
 
-    def get_upcoming_assignments(self, today):
+    def mark_completed_many(self, assignment_ids):
+        # Mark many assignments completed in one transaction; returns the number of rows changed
+        assignment_ids = list(assignment_ids)
+        changed = self.execute_for_ids("UPDATE assignments SET status = 'Completed' WHERE id IN ({})", assignment_ids)
+        bus.publish(RowsUpdated(assignment_ids))
+        return changed
+
+    def delete_many(self, assignment_ids):
+        # Delete many assignments in one transaction; returns the number of rows deleted
+        assignment_ids = list(assignment_ids)
+        deleted = self.execute_for_ids("DELETE FROM assignments WHERE id IN ({})", assignment_ids)
+        bus.publish(RowsDeleted(assignment_ids))
+        return deleted
+
+    def execute_for_ids(self, sql, ids):
+        # Run `sql` with its IN (...) list filled from ids, in chunks that stay under
+        # SQLite's bound-parameter limit, committing once at the end
+        ids = list(ids)
+        changed = 0
+        self.invalidate_ids(ids)
         try:
-            self.cursor.execute("""
-                SELECT id, tab_name, assignment_title, due_date, status, notes
+            for start in range(0, len(ids), MAX_SQL_VARIABLES):
+                chunk = ids[start:start + MAX_SQL_VARIABLES]
+                self.cursor.execute(sql.format(', '.join('?' * len(chunk))), chunk)
+                changed += self.cursor.rowcount
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return changed
+
+    def purge_completed(self, due_before, tab_name=None):
+        # Delete completed assignments due before the date `due_before` from one tab, or
+        # every tab when tab_name is None, in one transaction; returns the number deleted
+        conditions = "status = 'Completed' AND due_date < ?"
+        params = [due_before.strftime(DATE_FORMAT)]
+        if tab_name is not None:
+            conditions += " AND tab_name = ?"
+            params.append(tab_name)
+        rows = []
+        try:
+            # Find the affected rows first so their tabs' cached rows can be dropped
+            self.cursor.execute(f"SELECT id, tab_name FROM assignment_rows WHERE {conditions}", params)
+            rows = self.cursor.fetchall()
+            self.cursor.execute(f"DELETE FROM assignments WHERE id IN (SELECT id FROM assignment_rows WHERE {conditions})", params)
+            deleted = self.cursor.rowcount
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            self.invalidate('upcoming', *[('tab', name) for name in {row[1] for row in rows}])
+        if rows:
+            bus.publish(RowsDeleted(row[0] for row in rows))
+        return deleted
+
+    def archive_completed(self, older_than):
+        # Move completed assignments due before the date `older_than` to the archive in
+        # one transaction, so tab loads stop reading them; returns the number moved.
+        # Archived rows leave the full-text index with the live table's delete trigger.
+        conditions = "status = 'Completed' AND due_date < ?"
+        params = (older_than.strftime(DATE_FORMAT),)
+        rows = []
+        try:
+            # The INSERT takes the write lock, so the rows selected and deleted after
+            # it are exactly the rows copied
+            self.cursor.execute(f"""
+                INSERT INTO assignments_archive (id, tab_id, assignment_title, due_date, status, notes, archived_at)
+                SELECT id, tab_id, assignment_title, due_date, status, notes, date('now', 'localtime')
                 FROM assignments
+                WHERE {conditions}
+            """, params)
+            self.cursor.execute(f"SELECT id, tab_name FROM assignment_rows WHERE {conditions}", params)
+            rows = self.cursor.fetchall()
+            self.cursor.execute(f"DELETE FROM assignments WHERE {conditions}", params)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            self.invalidate(*[('tab', name) for name in {row[1] for row in rows}])
+        if rows:
+            bus.publish(RowsDeleted(row[0] for row in rows))
+        return len(rows)
+
+    def get_archived_page(self, limit, after=None):
+        # Return the next `limit` archived (id, tab_name, assignment_title, due_date,
+        # archived_at) rows, latest due date first. `after` is the (due_date, id) of the
+        # last row of the previous page; the (due_date) index makes each page O(limit).
+        after_due, after_id = after if after else ('9999-12-31', 0)
+        self.read_cursor.execute("""
+            SELECT a.id, t.name, a.assignment_title, a.due_date, a.archived_at
+            FROM assignments_archive a
+            JOIN tabs t ON t.id = a.tab_id
+            WHERE (a.due_date, a.id) < (?, ?)
+            ORDER BY a.due_date DESC, a.id DESC
+            LIMIT ?
+        """, (after_due, after_id, limit))
+        return self.read_cursor.fetchall()
+
+    def count_archived(self):
+        self.read_cursor.execute("SELECT COUNT(*) FROM assignments_archive")
+        return self.read_cursor.fetchone()[0]
+
+    def get_stats(self, today):
+        # Return (tab_name, total, pending, completed, overdue) for every tab, in tab order.
+        # Overdue counts pending assignments due before today.
+        self.read_cursor.execute("""
+            SELECT t.name,
+                   COUNT(a.id),
+                   COALESCE(SUM(a.status = 'Pending'), 0),
+                   COALESCE(SUM(a.status = 'Completed'), 0),
+                   COALESCE(SUM(a.status = 'Pending' AND a.due_date < ?), 0)
+            FROM tabs t
+            LEFT JOIN assignments a ON a.tab_id = t.id
+            GROUP BY t.id
+            ORDER BY t.id
+        """, (today.strftime(DATE_FORMAT),))
+        return self.read_cursor.fetchall()
+
+    def get_upcoming_assignments(self, today):
+        def load():
+            self.read_cursor.execute("""
+                SELECT id, tab_name, assignment_title, due_date, status
+                FROM assignment_rows
                 WHERE status = 'Pending' AND due_date >= ?
             """, (today.strftime(DATE_FORMAT),))
-            return self.cursor.fetchall()
+            return self.read_cursor.fetchall()
+
+        try:
+            return self.cached(('upcoming', today), ['upcoming'], load)
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return []
+
+    def has_full_text_search(self):
+        self.read_cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'assignments_fts'")
+        return self.read_cursor.fetchone() is not None
+
+    def search(self, query, limit=SEARCH_RESULT_LIMIT):
+        # Search titles and notes across all tabs. Every word in `query` must match
+        # (as a prefix). Returns (id, tab_name, assignment_title, due_date, status, snippet)
+        # rows, best matches first; matched words in the snippet are wrapped in [ ].
+        words = query.split()
+        if not words:
+            return []
+        if not self.has_full_text_search():
+            # SQLite without FTS5: unranked substring match
+            conditions = ' AND '.join(["(assignment_title LIKE ? OR notes_text(notes) LIKE ?)"] * len(words))
+            params = [f"%{word}%" for word in words for _ in range(2)]
+            self.read_cursor.execute(f"""
+                SELECT id, tab_name, assignment_title, due_date, status, substr(notes_text(notes), 1, 80)
+                FROM assignment_rows
+                WHERE {conditions}
+                LIMIT ?
+            """, params + [limit])
+            return self.read_cursor.fetchall()
+        # Quote each word so FTS5 syntax characters in user input are taken literally
+        match = ' '.join('"' + word.replace('"', '""') + '"*' for word in words)
+        self.read_cursor.execute("""
+            SELECT a.id, a.tab_name, a.assignment_title, a.due_date, a.status,
+                   snippet(assignments_fts, -1, '[', ']', '...', 10)
+            FROM assignments_fts
+            JOIN assignment_rows a ON a.id = assignments_fts.rowid
+            WHERE assignments_fts MATCH ?
+            ORDER BY bm25(assignments_fts, 10.0, 1.0)
+            LIMIT ?
+        """, (match, limit))
+        return self.read_cursor.fetchall()
+
+    def check_query_plans(self):
+        # Return {query_name: plan} for every hot query that scans a table without an
+        # index (unless it is in SCANNABLE_TABLES) or sorts its result in a temporary
+        # b-tree. An empty dict means every hot query is index-backed.
+        unindexed = {}
+        for name, (sql, params) in HOT_QUERIES.items():
+            # The plan names aliased tables by their alias
+            aliases = {alias: table for table, alias in TABLE_ALIAS_PATTERN.findall(sql)}
+            self.cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = self.cursor.fetchall()
+            for node_id, parent, _, detail in plan:
+                scan = SCAN_DETAIL_PATTERN.match(detail)
+                full_scan = (scan is not None and 'INDEX' not in detail
+                             and aliases.get(scan.group(1), scan.group(1)) not in SCANNABLE_TABLES)
+                # Only a sort of the outer query matters; subqueries over small tables may sort
+                outer_sort = parent == 0 and 'TEMP B-TREE' in detail
+                if full_scan or outer_sort:
+                    unindexed[name] = [row[3] for row in plan]
+                    break
+        return unindexed
+
+    def get_upcoming_page(self, today, limit, after=None):
+        # Return the next `limit` pending assignments due on or after today, ordered by
+        # (due_date, id). `after` is the (due_date, id) of the last row of the previous
+        # page; the index on (status, due_date) makes each page cost O(limit).
+        start = today.strftime(DATE_FORMAT)
+        after_due, after_id = after if after else (start, 0)
+
+        def load():
+            self.read_cursor.execute("""
+                SELECT id, tab_name, assignment_title, due_date, status
+                FROM assignment_rows
+                WHERE status = 'Pending' AND due_date >= ? AND (due_date, id) > (?, ?)
+                ORDER BY due_date, id
+                LIMIT ?
+            """, (max(start, after_due), after_due, after_id, limit))
+            return self.read_cursor.fetchall()
+
+        try:
+            return self.cached(('upcoming_page', start, limit, after_due, after_id), ['upcoming'], load)
         except sqlite3.Error as e:
             print(f"Database error: {e}")
             return []
 
     def close(self):
+        if self.read_conn is not self.conn:
+            self.read_conn.close()
         self.conn.close()
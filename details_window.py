@@ -42,19 +42,26 @@ class DetailsWindow(tk.Toplevel):
         self.notes_text.insert('1.0', notes)
 
         # Save Button
-        save_button = tk.Button(self, text="Save", command=self.on_save)
-        save_button.pack(pady=10)
+        self.save_button = tk.Button(self, text="Save", command=self.on_save)
+        self.save_button.pack(pady=10)
 
     def on_save(self):
         # Handle the save action. Retrieve notes from the text box and invoke the save callback.
         notes = self.notes_text.get('1.0', 'end-1c').strip()
+        # The callback saves in the background and calls on_saved with the outcome
         if self.save_callback:
-            success = self.save_callback(self.assignment[0], notes)
-            if success:
-                messagebox.showinfo("Success", "Notes saved successfully.")
-                self.destroy()
-            else:
-                messagebox.showerror("Error", "Failed to save notes.")
+            self.save_button.config(state=tk.DISABLED)
+            self.save_callback(self.assignment[0], notes, self.on_saved)
+
+    def on_saved(self, success):
+        if not self.winfo_exists():
+            return
+        if success:
+            messagebox.showinfo("Success", "Notes saved successfully.")
+            self.destroy()
+        else:
+            self.save_button.config(state=tk.NORMAL)
+            messagebox.showerror("Error", "Failed to save notes.")
 
     def on_close(self):
         if messagebox.askokcancel("Quit", "Do you want to close the details window?"):
@@ -0,0 +1,176 @@
+# diagnostics.py
+
+import functools
+import threading
+import time
+from bisect import bisect_left
+
+from constants import LATENCY_BUCKETS_S, SLOW_QUERY_LOG_PATH, SLOW_QUERY_THRESHOLD_MS
+
+
+class OperationStats:
+    # Running totals for one instrumented operation (e.g. 'db.get_assignments')
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        # bucket_counts[i] counts calls that took at most LATENCY_BUCKETS_S[i];
+        # the extra last entry counts the slower ones
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS_S) + 1)
+
+    def quantile(self, q):
+        # Upper bound of the bucket holding the q-th quantile (None for the open-ended one)
+        if not self.calls:
+            return 0.0
+        target = q * self.calls
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_S, self.bucket_counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return None
+
+
+class Metrics:
+    # Call counts, latency histograms and rows returned per operation. Shared by the
+    # Tk thread and the database worker, so every update holds a lock.
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.operations = {}  # name -> OperationStats
+        self.slow_threshold_s = SLOW_QUERY_THRESHOLD_MS / 1000
+        self.slow_log_path = None
+        self.slow_log_handler = None
+        self.slow_log = None
+
+    def record(self, name, seconds, rows=0, error=False, detail=''):
+        with self.lock:
+            stats = self.operations.get(name)
+            if stats is None:
+                stats = self.operations[name] = OperationStats()
+            stats.calls += 1
+            stats.errors += error
+            stats.rows += rows
+            stats.total_s += seconds
+            stats.max_s = max(stats.max_s, seconds)
+            stats.bucket_counts[bisect_left(LATENCY_BUCKETS_S, seconds)] += 1
+        if self.slow_log_handler is not None and seconds >= self.slow_threshold_s:
+            self.slow_log.warning("%s took %.1f ms, %d rows%s%s", name, seconds * 1000, rows,
+                                  " (failed)" if error else "", f" {detail}" if detail else "")
+
+    def snapshot(self):
+        # Copy of the per-operation stats, sorted by name, safe to read on any thread
+        with self.lock:
+            snapshot = []
+            for name in sorted(self.operations):
+                stats = self.operations[name]
+                copy = OperationStats()
+                copy.__dict__.update(stats.__dict__, bucket_counts=list(stats.bucket_counts))
+                snapshot.append((name, copy))
+            return snapshot
+
+    def reset(self):
+        with self.lock:
+            self.operations.clear()
+
+    def enable_slow_log(self, path, threshold_ms=SLOW_QUERY_THRESHOLD_MS):
+        # Append every call slower than threshold_ms to the file at path
+        # (logging is imported here because it is slow to import and rarely needed)
+        import logging
+        self.disable_slow_log()
+        handler = logging.FileHandler(path, encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(asctime)s %(threadName)s %(message)s'))
+        self.slow_log = logging.getLogger('assignment_tracker.slow_queries')
+        self.slow_log.propagate = False
+        self.slow_log.addHandler(handler)
+        self.slow_log.setLevel(logging.WARNING)
+        self.slow_threshold_s = threshold_ms / 1000
+        self.slow_log_path = path
+        self.slow_log_handler = handler
+
+    def disable_slow_log(self):
+        if self.slow_log_handler is not None:
+            self.slow_log.removeHandler(self.slow_log_handler)
+            self.slow_log_handler.close()
+        self.slow_log_path = None
+        self.slow_log_handler = None
+
+    def to_prometheus(self):
+        # Render the stats in the Prometheus text exposition format
+        lines = [
+            "# HELP assignment_tracker_operation_duration_seconds Time spent in each operation.",
+            "# TYPE assignment_tracker_operation_duration_seconds histogram",
+        ]
+        snapshot = self.snapshot()
+        for name, stats in snapshot:
+            label = escape_label(name)
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS_S, stats.bucket_counts):
+                cumulative += count
+                lines.append(f'assignment_tracker_operation_duration_seconds_bucket{{operation="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'assignment_tracker_operation_duration_seconds_bucket{{operation="{label}",le="+Inf"}} {stats.calls}')
+            lines.append(f'assignment_tracker_operation_duration_seconds_sum{{operation="{label}"}} {stats.total_s:.6f}')
+            lines.append(f'assignment_tracker_operation_duration_seconds_count{{operation="{label}"}} {stats.calls}')
+        lines.append("# HELP assignment_tracker_operation_errors_total Operations that raised an exception.")
+        lines.append("# TYPE assignment_tracker_operation_errors_total counter")
+        for name, stats in snapshot:
+            lines.append(f'assignment_tracker_operation_errors_total{{operation="{escape_label(name)}"}} {stats.errors}')
+        lines.append("# HELP assignment_tracker_operation_rows_total Rows returned by each operation.")
+        lines.append("# TYPE assignment_tracker_operation_rows_total counter")
+        for name, stats in snapshot:
+            lines.append(f'assignment_tracker_operation_rows_total{{operation="{escape_label(name)}"}} {stats.rows}')
+        return "\n".join(lines) + "\n"
+
+
+def escape_label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def count_rows(result):
+    # Rows returned by a call: the length of a list of rows, 1 for a single row
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, tuple):
+        return 1
+    return 0
+
+
+def describe_args(args, kwargs, limit=200):
+    # Short rendering of a call's arguments for the slow-query log
+    parts = [repr(arg) for arg in args] + [f"{key}={value!r}" for key, value in kwargs.items()]
+    text = f"({', '.join(parts)})"
+    return text if len(text) <= limit else text[:limit - 3] + '...'
+
+
+# Shared by every Database and UI refresh path in the process
+metrics = Metrics()
+if SLOW_QUERY_LOG_PATH:
+    metrics.enable_slow_log(SLOW_QUERY_LOG_PATH)
+
+
+def timed(name, function):
+    # Wrap function so every call is recorded in metrics under name
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = function(*args, **kwargs)
+        except Exception:
+            metrics.record(name, time.perf_counter() - start, error=True, detail=describe_args(args[1:], kwargs))
+            raise
+        elapsed = time.perf_counter() - start
+        metrics.record(name, elapsed, count_rows(result),
+                       detail=describe_args(args[1:], kwargs) if elapsed >= metrics.slow_threshold_s else '')
+        return result
+    return wrapper
+
+
+def instrumented(prefix, exclude=()):
+    # Class decorator recording every public method as '<prefix>.<method name>'
+    def decorate(cls):
+        for attribute, value in list(vars(cls).items()):
+            if callable(value) and not attribute.startswith('_') and attribute not in exclude:
+                setattr(cls, attribute, timed(f"{prefix}.{attribute}", value))
+        return cls
+    return decorate
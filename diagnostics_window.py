@@ -0,0 +1,119 @@
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+from constants import SLOW_QUERY_THRESHOLD_MS
+from diagnostics import metrics
+
+# How often (in milliseconds) the window re-reads the live stats
+REFRESH_INTERVAL_MS = 1000
+
+
+class DiagnosticsWindow(tk.Toplevel):
+    # Live view of the timings collected in diagnostics.metrics
+    def __init__(self, master):
+        super().__init__(master)
+        self.title("Diagnostics")
+        self.refresh_job = None
+        self.create_widgets()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.refresh()
+
+    def create_widgets(self):
+        # One row per instrumented operation
+        columns = ('Operation', 'Calls', 'Errors', 'Mean ms', 'p50 ms', 'p95 ms', 'Max ms', 'Rows')
+        self.tree = ttk.Treeview(self, columns=columns, show='headings')
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, minwidth=50, width=260 if col == 'Operation' else 80,
+                             anchor='w' if col == 'Operation' else 'e')
+        self.tree.pack(expand=True, fill='both')
+
+        # Slow-query log toggle and actions
+        button_frame = tk.Frame(self)
+        button_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=5, pady=5)
+        self.slow_log_var = tk.BooleanVar(value=metrics.slow_log_path is not None)
+        self.slow_log_check = tk.Checkbutton(button_frame, variable=self.slow_log_var, command=self.toggle_slow_log)
+        self.slow_log_check.pack(side=tk.LEFT)
+        self.update_slow_log_label()
+        tk.Button(button_frame, text="Save Prometheus Dump", command=self.save_prometheus).pack(side=tk.RIGHT, padx=5)
+        tk.Button(button_frame, text="Reset", command=self.reset).pack(side=tk.RIGHT, padx=5)
+
+    def refresh(self):
+        # Rebuild the rows from a snapshot, then schedule the next refresh
+        for item in self.tree.get_children():
+            self.tree.delete(item)
+        for name, stats in metrics.snapshot():
+            self.tree.insert('', tk.END, values=(
+                name,
+                stats.calls,
+                stats.errors,
+                format_ms(stats.total_s / stats.calls if stats.calls else 0.0),
+                format_bound(stats.quantile(0.5)),
+                format_bound(stats.quantile(0.95)),
+                format_ms(stats.max_s),
+                stats.rows,
+            ))
+        self.refresh_job = self.after(REFRESH_INTERVAL_MS, self.refresh)
+
+    def toggle_slow_log(self):
+        if not self.slow_log_var.get():
+            metrics.disable_slow_log()
+        else:
+            path = filedialog.asksaveasfilename(
+                parent=self,
+                title="Slow-Query Log File",
+                defaultextension=".log",
+                initialfile="slow_queries.log",
+                filetypes=(("Log Files", "*.log"), ("All Files", "*.*"))
+            )
+            if not path:
+                self.slow_log_var.set(False)
+                return
+            try:
+                metrics.enable_slow_log(path)
+            except OSError as e:
+                self.slow_log_var.set(False)
+                messagebox.showerror("Diagnostics", f"Could not open the log file: {e}", parent=self)
+        self.update_slow_log_label()
+
+    def update_slow_log_label(self):
+        if metrics.slow_log_path:
+            text = f"Log calls slower than {SLOW_QUERY_THRESHOLD_MS} ms to {metrics.slow_log_path}"
+        else:
+            text = f"Log calls slower than {SLOW_QUERY_THRESHOLD_MS} ms"
+        self.slow_log_check.config(text=text)
+
+    def save_prometheus(self):
+        path = filedialog.asksaveasfilename(
+            parent=self,
+            title="Save Prometheus Dump",
+            defaultextension=".prom",
+            initialfile="assignment_tracker.prom",
+            filetypes=(("Prometheus Text", "*.prom"), ("All Files", "*.*"))
+        )
+        if not path:
+            return
+        try:
+            with open(path, 'w', encoding='utf-8') as dump:
+                dump.write(metrics.to_prometheus())
+        except OSError as e:
+            messagebox.showerror("Diagnostics", f"Could not save the dump: {e}", parent=self)
+
+    def reset(self):
+        metrics.reset()
+        self.after_cancel(self.refresh_job)
+        self.refresh()
+
+    def on_close(self):
+        if self.refresh_job is not None:
+            self.after_cancel(self.refresh_job)
+        self.destroy()
+
+
+def format_ms(seconds):
+    return f"{seconds * 1000:.2f}"
+
+
+def format_bound(seconds):
+    # Histogram quantiles are bucket upper bounds; None means above the largest bucket
+    return f"<= {format_ms(seconds)}" if seconds is not None else "> max bucket"
@@ -22,64 +22,44 @@ class EventHandlers:
         tree = event.widget
         selected_items = tree.selection()
         if selected_items:
-            item = selected_items[0]
+            item = selected_items[0]  # The iid is the assignment_id
             values = tree.item(item, 'values')
             if len(values) >= 2:
                 tab_name = values[0]
-                assignment_title = values[1]
-                self.app.open_assignment_from_dashboard(tab_name, assignment_title)
+                self.app.open_assignment_from_dashboard(tab_name, int(item))
             else:
                 messagebox.showerror("Error", "Invalid assignment data.")
 
     
     def on_mark_completed(self):
-        selected_items = self.app.selected_tree.selection()
-        if not selected_items:
+        selected_ids = self.app.get_selected_ids(self.app.selected_tree)
+        if not selected_ids:
             messagebox.showwarning("No Selection", "Please select one or more assignments to mark as completed.")
             return
-        for item in selected_items:
-            try:
-                assignment_id = int(item)  # The iid is the assignment_id
-                self.app.db.mark_completed(assignment_id)
-            except ValueError:
-                messagebox.showerror("Error", f"Invalid assignment ID: {item}")
-        # Reload assignments in the current tab
-        current_tab = self.app.notebook.select()
-        tab_name = self.app.notebook.tab(current_tab, "text")
-        self.app.load_assignments(tab_name)
+        # The tab updates itself from the change event
+        self.app.async_db.mark_completed_many(selected_ids, errback=self.app.report_error("marking assignments as completed"))
 
    
     def on_delete_assignment(self):
-        selected_items = self.app.selected_tree.selection()
-        if not selected_items:
+        selected_ids = self.app.get_selected_ids(self.app.selected_tree)
+        if not selected_ids:
             messagebox.showwarning("No Selection", "Please select one or more assignments to delete.")
             return
         confirm = messagebox.askyesno("Confirm Delete", "Are you sure you want to delete the selected assignments?")
         if not confirm:
             return
-        for item in selected_items:
-            try:
-                assignment_id = int(item)  # The iid is the assignment_id
-                self.app.db.delete_assignment(assignment_id)
-            except ValueError:
-                messagebox.showerror("Error", f"Invalid assignment ID: {item}")
-        # Reload assignments in the current tab
-        current_tab = self.app.notebook.select()
-        tab_name = self.app.notebook.tab(current_tab, "text")
-        self.app.load_assignments(tab_name)
+        self.app.async_db.delete_many(selected_ids, errback=self.app.report_error("deleting assignments"))
 
    
     def on_save_notes(self, assignment_id, notes, window):
-        try:
-            self.app.db.update_notes(assignment_id, notes)
-            messagebox.showinfo("Success", "Notes saved successfully.")
-            window.destroy()
-            # Reload assignments in the current tab to reflect any changes
-            current_tab = self.app.notebook.select()
-            tab_name = self.app.notebook.tab(current_tab, "text")
-            self.app.load_assignments(tab_name)
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred while saving notes: {e}")
+        def on_saved(success):
+            if success:
+                messagebox.showinfo("Success", "Notes saved successfully.")
+                window.destroy()
+            else:
+                messagebox.showerror("Error", "An error occurred while saving notes.")
+
+        self.app.save_notes(assignment_id, notes, on_saved)
 
 
     def on_tab_changed(self, event):
@@ -88,21 +68,6 @@ class EventHandlers:
         self.current_tab = tab_name
 
 
-    def on_open_assignment_from_dashboard(self, tab_name, assignment_title):
-        # Switch to the corresponding tab
-        for idx in range(len(self.app.notebook.tabs())):
-            tab = self.app.notebook.tabs()[idx]
-            if self.app.notebook.tab(tab, "text") == tab_name:
-                self.app.notebook.select(idx)
-                break
-
-        # Highlight the assignment in the Treeview
-        tree = self.app.tab_trees.get(tab_name)
-        if tree:
-            # Find the item with the matching assignment title
-            for child in tree.get_children():
-                if tree.item(child)['values'][0] == assignment_title:
-                    tree.selection_set(child)
-                    tree.focus(child)
-                    tree.see(child)
-                    break
+    def on_open_assignment_from_dashboard(self, tab_name, assignment_id):
+        # Switch to the tab and select the assignment, paging to it if necessary
+        self.app.open_assignment_from_dashboard(tab_name, assignment_id)
@@ -0,0 +1,155 @@
+# events.py
+
+import threading
+
+
+# Events published by Database after a write commits. Ids are assignment ids.
+class RowsInserted:
+    def __init__(self, tab_name, ids):
+        self.tab_name = tab_name
+        self.ids = list(ids)
+
+
+class RowsUpdated:
+    # The tab is not included; views check the ids against the rows they show
+    def __init__(self, ids):
+        self.ids = list(ids)
+
+
+class RowsDeleted:
+    def __init__(self, ids):
+        self.ids = list(ids)
+
+
+class TabRowsChanged:
+    # Rows of the tab changed in ways that were not itemized (e.g. an import that
+    # updated existing rows), so views showing the tab should reload it
+    def __init__(self, tab_name):
+        self.tab_name = tab_name
+
+
+class TabAdded:
+    def __init__(self, tab_name):
+        self.tab_name = tab_name
+
+
+class TabRenamed:
+    def __init__(self, old_name, new_name):
+        self.old_name = old_name
+        self.new_name = new_name
+
+
+class TabDeleted:
+    def __init__(self, tab_name):
+        self.tab_name = tab_name
+
+
+class ChangeSet:
+    # The events of one delivery merged into per-kind sets, applied in publish order
+    # so e.g. a row inserted and then deleted only shows up as deleted
+    def __init__(self, events):
+        self.events = events
+        self.inserted = {}         # tab name -> set of ids
+        self.updated = set()
+        self.deleted = set()
+        self.reloaded = set()      # tab names whose rows changed without ids
+        self.added_tabs = []
+        self.renamed_tabs = []     # (old name, new name) in order
+        self.deleted_tabs = set()
+        for event in events:
+            if isinstance(event, RowsInserted):
+                self.inserted.setdefault(event.tab_name, set()).update(event.ids)
+            elif isinstance(event, RowsUpdated):
+                self.updated.update(event.ids)
+            elif isinstance(event, RowsDeleted):
+                ids = set(event.ids)
+                self.deleted |= ids
+                self.updated -= ids
+                for tab_ids in self.inserted.values():
+                    tab_ids -= ids
+            elif isinstance(event, TabRowsChanged):
+                self.reloaded.add(event.tab_name)
+            elif isinstance(event, TabAdded):
+                self.added_tabs.append(event.tab_name)
+            elif isinstance(event, TabRenamed):
+                self.renamed_tabs.append((event.old_name, event.new_name))
+                if event.old_name in self.inserted:
+                    self.inserted[event.new_name] = self.inserted.pop(event.old_name)
+                if event.old_name in self.reloaded:
+                    self.reloaded.discard(event.old_name)
+                    self.reloaded.add(event.new_name)
+            elif isinstance(event, TabDeleted):
+                self.deleted_tabs.add(event.tab_name)
+                self.inserted.pop(event.tab_name, None)
+                self.reloaded.discard(event.tab_name)
+
+    def inserted_ids(self):
+        return set().union(*self.inserted.values())
+
+
+class EventBus:
+    # Delivers database change events to the views on the Tk thread. Events may be
+    # published from any thread (the UI's Database and the background worker's);
+    # they are queued and handed to every subscriber as one ChangeSet once the Tk
+    # event loop is idle, so a burst of writes causes a single update. Events from
+    # other threads are picked up by AsyncDatabase's poll, which calls schedule().
+    # Until attach() is called (e.g. in cli.py) publishing does nothing.
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = []
+        self.subscribers = []
+        self.root = None
+        self.thread = None
+        self.flush_id = None
+
+    def attach(self, root):
+        # Called on the Tk thread
+        self.root = root
+        self.thread = threading.current_thread()
+
+    def detach(self):
+        if self.flush_id is not None:
+            self.root.after_cancel(self.flush_id)
+        self.root = None
+        self.thread = None
+        self.flush_id = None
+        with self.lock:
+            self.pending = []
+
+    def subscribe(self, callback):
+        # callback(changes) is called on the Tk thread with a ChangeSet
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    def publish(self, *events):
+        if self.root is None:
+            return
+        with self.lock:
+            self.pending.extend(events)
+        if threading.current_thread() is self.thread:
+            self.schedule()
+
+    def schedule(self):
+        # Tk thread only: deliver the queued events when the event loop is next idle
+        if self.flush_id is None and self.pending and self.root is not None:
+            self.flush_id = self.root.after_idle(self.flush)
+
+    def flush(self):
+        self.flush_id = None
+        with self.lock:
+            events, self.pending = self.pending, []
+        if not events:
+            return
+        changes = ChangeSet(events)
+        for callback in list(self.subscribers):
+            try:
+                callback(changes)
+            except Exception as e:
+                print(f"Error delivering database changes: {e}")
+
+
+# Shared by every Database in the process and the views that show its data
+bus = EventBus()
@@ -0,0 +1,56 @@
+# exporter.py
+
+import csv
+import json
+import os
+
+# Columns written by every export, in order. Archived assignments are exported after
+# the live ones with the date they were archived; archived_at is empty for live rows.
+# NDJSON exports can be read back with importer.NdjsonImportJob, which restores the
+# archive; CSV exports of a single tab with importer.CsvImportJob, which skips archived rows.
+EXPORT_FIELDS = ('tab_name', 'assignment_title', 'due_date', 'status', 'notes', 'archived_at')
+
+
+def write_csv(rows, file):
+    # Write rows as CSV with a header line and return the number of rows written
+    writer = csv.writer(file)
+    writer.writerow(EXPORT_FIELDS)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_ndjson(rows, file):
+    # Write one JSON object per line and return the number of rows written
+    count = 0
+    for row in rows:
+        file.write(json.dumps(dict(zip(EXPORT_FIELDS, row)), ensure_ascii=False))
+        file.write('\n')
+        count += 1
+    return count
+
+
+EXPORT_FORMATS = {
+    'csv': write_csv,
+    'ndjson': write_ndjson,
+}
+
+
+def export_assignments(db, path, export_format, tab_name=None):
+    # Stream one tab (or every tab when tab_name is None) to path and return the row
+    # count. The file is written under a temporary name and renamed when complete, so
+    # a failed export never leaves a truncated file at path.
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{export_format}'. Choose one of: {', '.join(EXPORT_FORMATS)}.")
+    partial_path = path + '.part'
+    try:
+        with open(partial_path, 'w', newline='', encoding='utf-8') as file:
+            count = EXPORT_FORMATS[export_format](db.iter_assignments(tab_name), file)
+        os.replace(partial_path, path)
+    except Exception:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+    return count
@@ -0,0 +1,56 @@
+import tkinter as tk
+from tkinter import ttk
+
+# How often (in milliseconds) the dialog re-reads the import's progress
+PROGRESS_INTERVAL_MS = 200
+
+
+class ImportProgressWindow(tk.Toplevel):
+    def __init__(self, master, job, file_name):
+        # Shows the progress of a running ImportJob and lets the user cancel it.
+
+        # Args:
+        #     master (tk.Widget): The parent window.
+        #     job (ImportJob): The import running on the database worker.
+        #     file_name (str): Name of the file shown in the title line.
+        super().__init__(master)
+        self.title("Importing")
+        self.job = job
+        self.update_job = None
+        self.create_widgets(file_name)
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+        self.transient(master)
+        self.update_progress()
+
+    def create_widgets(self, file_name):
+        frame = tk.Frame(self)
+        frame.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
+
+        tk.Label(frame, text=f"Importing {file_name} into {self.job.destination}", font=("Helvetica", 10)).pack(anchor='w')
+        self.progressbar = ttk.Progressbar(frame, orient=tk.HORIZONTAL, length=360, mode='determinate', maximum=1.0)
+        self.progressbar.pack(fill=tk.X, pady=5)
+        self.rows_label = tk.Label(frame, text="", anchor='w')
+        self.rows_label.pack(fill=tk.X)
+        self.skipped_label = tk.Label(frame, text="", anchor='w')
+        self.skipped_label.pack(fill=tk.X)
+
+        self.cancel_button = tk.Button(frame, text="Cancel", command=self.cancel)
+        self.cancel_button.pack(side=tk.RIGHT, pady=(5, 0))
+
+    def update_progress(self):
+        counts = self.job.counts
+        self.progressbar['value'] = self.job.fraction_done()
+        self.rows_label.config(text=f"{self.job.imported():,} rows imported ({self.job.rows_per_second():,.0f} rows/s): "
+                                    f"{counts['new']:,} new, {counts['updated']:,} updated, {counts['unchanged']:,} unchanged")
+        self.skipped_label.config(text=f"{counts['skipped']:,} incomplete and {counts['invalid']:,} invalid rows skipped")
+        self.update_job = self.after(PROGRESS_INTERVAL_MS, self.update_progress)
+
+    def cancel(self):
+        # The job stops before its next chunk; the dialog closes once it has
+        self.job.cancel()
+        self.cancel_button.config(state=tk.DISABLED, text="Cancelling...")
+
+    def close(self):
+        if self.update_job is not None:
+            self.after_cancel(self.update_job)
+        self.destroy()
@@ -0,0 +1,206 @@
+# importer.py
+
+import csv
+import json
+import os
+import threading
+import time
+from itertools import islice
+
+from constants import IMPORT_CHUNK_SIZE, REQUIRED_CSV_FIELDS, STATUS_COMPLETED, STATUS_PENDING
+from utils import format_date, parse_date, validate_date
+
+
+def clean_row(row, counts):
+    # Return (assignment_title, due_date, notes) for a usable mapping row, or None, with
+    # the due date rewritten in DATE_FORMAT (e.g. 2024-1-5 becomes 2024-01-05). Notes
+    # are kept exactly as given (indentation, trailing newlines, None), so re-importing
+    # an export leaves them unchanged.
+    # Rows missing a title or due date are counted in counts['skipped'], rows with a
+    # malformed due date in counts['invalid'].
+    assignment_title = (row.get('assignment_title') or '').strip()
+    due_date = (row.get('due_date') or '').strip()
+    notes = row.get('notes')
+    if not assignment_title or not due_date:
+        counts['skipped'] += 1
+        return None
+    try:
+        due_date = format_date(parse_date(due_date))
+    except ValueError:
+        counts['invalid'] += 1
+        return None
+    return (assignment_title, due_date, notes)
+
+
+def clean_rows(rows, counts):
+    # Yield the cleaned form of every usable row of a mapping iterable (e.g. a csv.DictReader).
+    # Rows of an export marked as archived are counted as skipped: a CSV import makes
+    # every row a pending assignment, which would bring them back.
+    for row in rows:
+        if row.get('archived_at'):
+            counts['skipped'] += 1
+            continue
+        cleaned = clean_row(row, counts)
+        if cleaned is not None:
+            assignment_title, due_date, notes = cleaned
+            # A CSV file without a notes column adds empty notes
+            yield (assignment_title, due_date, notes if notes is not None else '')
+
+
+# Fields of an NDJSON record read by clean_records, all text
+RECORD_FIELDS = ('tab_name', 'assignment_title', 'due_date', 'status', 'notes', 'archived_at')
+
+
+def clean_records(lines, counts):
+    # Yield (tab_name, assignment_title, due_date, status, notes, archived_at) for every
+    # usable line of an NDJSON export; archived_at is '' for live assignments. Blank lines
+    # are ignored; lines that are not JSON objects, have a field that is not a string
+    # (or null), an unknown status or a malformed archived_at date count as invalid,
+    # lines without a tab name as skipped.
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            counts['invalid'] += 1
+            continue
+        if not isinstance(record, dict):
+            counts['invalid'] += 1
+            continue
+        if not all(isinstance(record.get(field), (str, type(None))) for field in RECORD_FIELDS):
+            counts['invalid'] += 1
+            continue
+        tab_name = (record.get('tab_name') or '').strip()
+        if not tab_name:
+            counts['skipped'] += 1
+            continue
+        status = record.get('status') or STATUS_PENDING
+        if status not in (STATUS_PENDING, STATUS_COMPLETED):
+            counts['invalid'] += 1
+            continue
+        archived_at = record.get('archived_at') or ''
+        if archived_at and not validate_date(archived_at):
+            counts['invalid'] += 1
+            continue
+        cleaned = clean_row(record, counts)
+        if cleaned is not None:
+            assignment_title, due_date, notes = cleaned
+            yield (tab_name, assignment_title, due_date, status, notes, archived_at)
+
+
+def chunked(rows, chunk_size):
+    # Group rows into lists of at most chunk_size, reading lazily so memory stays
+    # bounded however large the input is
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_chunks(rows, counts, chunk_size=IMPORT_CHUNK_SIZE):
+    return chunked(clean_rows(rows, counts), chunk_size)
+
+
+class ImportJob:
+    # Streams a file into the database on the database worker. Every chunk is written in
+    # its own transaction, so the rows committed so far stay in the database when the
+    # job is cancelled or fails, and a chunk is never half-written. The Tk thread reads
+    # progress from counts, fraction_done() and rows_per_second() while the job runs.
+    # Subclasses provide chunks(lines) and write(db, chunk), which returns the chunk's
+    # new/updated/unchanged counts.
+    def __init__(self, file_path, chunk_size=IMPORT_CHUNK_SIZE):
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        self.counts = {'new': 0, 'updated': 0, 'unchanged': 0, 'skipped': 0, 'invalid': 0}
+        self.cancel_event = threading.Event()
+        self.size = 0
+        self.position = 0
+        self.started = None
+        self.finished = None
+
+    def cancel(self):
+        # Stop before the next chunk is written; safe to call from any thread
+        self.cancel_event.set()
+
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def run(self, db):
+        # Runs on the database worker: async_db.submit(job.run, callback=...)
+        self.size = os.path.getsize(self.file_path)
+        with open(self.file_path, newline='', encoding='utf-8') as file:
+            return self.run_lines(db, file)
+
+    def run_lines(self, db, lines):
+        # Import from an already open iterable of lines, e.g. sys.stdin. Without a
+        # known size, fraction_done() stays at 0.
+        self.started = time.perf_counter()
+        try:
+            for chunk in self.chunks(self.track_position(lines)):
+                if self.cancelled():
+                    break
+                for key, value in self.write(db, chunk).items():
+                    self.counts[key] += value
+        finally:
+            self.finished = time.perf_counter()
+        return dict(self.counts, cancelled=self.cancelled())
+
+    def track_position(self, lines):
+        # Count the characters read so far, for an approximate fraction done
+        for line in lines:
+            self.position += len(line)
+            yield line
+
+    def imported(self):
+        # Rows written so far, whether new, updated or already up to date
+        return self.counts['new'] + self.counts['updated'] + self.counts['unchanged']
+
+    def fraction_done(self):
+        return min(1.0, self.position / self.size) if self.size else 0.0
+
+    def rows_per_second(self):
+        # Rows imported per second since the job started
+        if self.started is None:
+            return 0.0
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        return self.imported() / elapsed if elapsed > 0 else 0.0
+
+
+class CsvImportJob(ImportJob):
+    # Imports a CSV file with assignment_title, due_date and optional notes columns
+    # into one tab, as pending assignments
+    file_format = 'csv'
+
+    def __init__(self, file_path, tab_name, chunk_size=IMPORT_CHUNK_SIZE):
+        super().__init__(file_path, chunk_size)
+        self.tab_name = tab_name
+        self.destination = f"'{tab_name}'"
+
+    def chunks(self, lines):
+        reader = csv.DictReader(lines)
+        missing = REQUIRED_CSV_FIELDS - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"CSV file must contain headers: {', '.join(sorted(REQUIRED_CSV_FIELDS))}")
+        return iter_chunks(reader, self.counts, self.chunk_size)
+
+    def write(self, db, chunk):
+        return db.upsert_assignments(self.tab_name, chunk)
+
+
+class NdjsonImportJob(ImportJob):
+    # Imports an NDJSON export (see exporter.py), keeping every record's tab, status
+    # and notes. Tabs that do not exist yet are created.
+    file_format = 'ndjson'
+
+    def __init__(self, file_path, chunk_size=IMPORT_CHUNK_SIZE):
+        super().__init__(file_path, chunk_size)
+        self.destination = "their original tabs"
+
+    def chunks(self, lines):
+        return chunked(clean_records(lines, self.counts), self.chunk_size)
+
+    def write(self, db, chunk):
+        return db.upsert_assignment_records(chunk)
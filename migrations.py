@@ -0,0 +1,413 @@
+# migrations.py
+
+import sqlite3
+
+from constants import NOTES_COMPRESSION_THRESHOLD
+from notes import notes_text, pack_notes
+from utils import format_date, parse_date
+
+# Numbered schema migrations. MIGRATIONS[n] upgrades the database from
+# schema version n to n + 1; the current version is stored in PRAGMA user_version.
+
+# Put between the notes of duplicate assignments merged into one row
+MERGED_NOTES_SEPARATOR = "\n\n---\n\n"
+
+
+def merge_notes(notes):
+    # The distinct non-empty notes of merged duplicates, in the order given, as one
+    # text, so a merge never drops what was written on any of them
+    merged = []
+    for text in notes:
+        if text and text.strip() and text not in merged:
+            merged.append(text)
+    return MERGED_NOTES_SEPARATOR.join(merged)
+
+
+def migration_001_base_schema(cursor):
+    # Create the original tables. Databases created before migrations were
+    # introduced already have them, so everything here must be idempotent.
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS assignments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            tab_name TEXT,
+            assignment_title TEXT,
+            due_date TEXT,
+            status TEXT,
+            notes TEXT
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS tabs (
+            name TEXT PRIMARY KEY
+        )
+    """)
+    # Very old databases were created without the notes column
+    cursor.execute("PRAGMA table_info(assignments)")
+    columns = [column[1] for column in cursor.fetchall()]
+    if 'notes' not in columns:
+        cursor.execute("ALTER TABLE assignments ADD COLUMN notes TEXT")
+
+
+def migration_002_assignment_indexes(cursor):
+    # Tab loads, rename_tab and delete_tab filter on tab_name (ordered by due date);
+    # the dashboard filters on status and ranges over due_date.
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_assignments_tab_due ON assignments (tab_name, due_date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_assignments_status_due ON assignments (status, due_date)")
+
+
+def migration_003_tab_sort_indexes(cursor):
+    # Paged tab views order by title or status within a tab; with these indexes
+    # (plus the existing (tab_name, due_date) one) no page needs a sort step.
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_assignments_tab_title ON assignments (tab_name, assignment_title COLLATE NOCASE)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_assignments_tab_status ON assignments (tab_name, status)")
+
+
+def migration_004_due_date_colors(cursor):
+    # Due-date colour buckets used by the colour tag query. Database keeps the rows
+    # in step with constants.DUE_DATE_COLOR_DAYS; a NULL max_days is the open-ended bucket.
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS due_date_colors (
+            tag TEXT PRIMARY KEY,
+            max_days INTEGER
+        )
+    """)
+
+
+def migration_005_full_text_search(cursor):
+    # Full-text index over titles and notes, keyed by assignment id and kept in sync
+    # by triggers. SQLite builds without FTS5 skip it and Database.search falls back to LIKE.
+    try:
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS assignments_fts USING fts5 (
+                assignment_title,
+                notes
+            )
+        """)
+    except sqlite3.OperationalError:
+        return
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS assignments_fts_insert AFTER INSERT ON assignments BEGIN
+            INSERT INTO assignments_fts (rowid, assignment_title, notes)
+            VALUES (new.id, new.assignment_title, new.notes);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS assignments_fts_delete AFTER DELETE ON assignments BEGIN
+            DELETE FROM assignments_fts WHERE rowid = old.id;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS assignments_fts_update AFTER UPDATE OF assignment_title, notes ON assignments BEGIN
+            UPDATE assignments_fts SET assignment_title = new.assignment_title, notes = new.notes
+            WHERE rowid = new.id;
+        END
+    """)
+    cursor.execute("""
+        INSERT INTO assignments_fts (rowid, assignment_title, notes)
+        SELECT id, assignment_title, notes FROM assignments
+    """)
+
+
+def migration_006_tab_sort_state(cursor):
+    # Remember each tab's sort order so every reload comes back sorted the same way.
+    # The (tab_name) index returns a tab in id order, the default, without a sort step.
+    cursor.execute("PRAGMA table_info(tabs)")
+    columns = [column[1] for column in cursor.fetchall()]
+    if 'sort_column' not in columns:
+        cursor.execute("ALTER TABLE tabs ADD COLUMN sort_column TEXT NOT NULL DEFAULT 'id'")
+    if 'sort_direction' not in columns:
+        cursor.execute("ALTER TABLE tabs ADD COLUMN sort_direction TEXT NOT NULL DEFAULT 'ASC'")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_assignments_tab ON assignments (tab_name)")
+
+
+def migration_007_natural_key(cursor):
+    # An assignment is identified by its tab, title and due date, so re-importing a file
+    # updates rows instead of duplicating them. Existing duplicates are merged into the
+    # earliest row first: it becomes completed if any copy was, and keeps the distinct
+    # notes of every copy (see merge_notes).
+    duplicate_of_kept = """
+        FROM assignments AS duplicate
+        WHERE duplicate.tab_name = assignments.tab_name
+          AND duplicate.assignment_title = assignments.assignment_title
+          AND duplicate.due_date = assignments.due_date
+          AND duplicate.id > assignments.id
+    """
+    is_kept = """
+        NOT EXISTS (
+            SELECT 1 FROM assignments AS earlier
+            WHERE earlier.tab_name = assignments.tab_name
+              AND earlier.assignment_title = assignments.assignment_title
+              AND earlier.due_date = assignments.due_date
+              AND earlier.id < assignments.id
+        )
+    """
+    cursor.execute(f"""
+        UPDATE assignments
+        SET status = 'Completed'
+        WHERE status <> 'Completed' AND {is_kept}
+          AND EXISTS (SELECT 1 {duplicate_of_kept} AND duplicate.status = 'Completed')
+    """)
+    cursor.execute("""
+        SELECT assignments.id, assignments.tab_name, assignments.assignment_title, assignments.due_date, assignments.notes
+        FROM assignments
+        JOIN (
+            SELECT tab_name, assignment_title, due_date FROM assignments
+            GROUP BY tab_name, assignment_title, due_date HAVING COUNT(*) > 1
+        ) AS duplicated
+          ON duplicated.tab_name = assignments.tab_name
+         AND duplicated.assignment_title = assignments.assignment_title
+         AND duplicated.due_date = assignments.due_date
+        ORDER BY assignments.id
+    """)
+    groups = {}
+    for assignment_id, tab_name, assignment_title, due_date, notes in cursor.fetchall():
+        groups.setdefault((tab_name, assignment_title, due_date), []).append((assignment_id, notes))
+    for rows in groups.values():
+        kept_id, kept_notes = rows[0]
+        notes = merge_notes(row_notes for assignment_id, row_notes in rows)
+        if notes and notes != kept_notes:
+            cursor.execute("UPDATE assignments SET notes = ? WHERE id = ?", (notes, kept_id))
+    cursor.execute("""
+        DELETE FROM assignments
+        WHERE EXISTS (
+            SELECT 1 FROM assignments AS earlier
+            WHERE earlier.tab_name = assignments.tab_name
+              AND earlier.assignment_title = assignments.assignment_title
+              AND earlier.due_date = assignments.due_date
+              AND earlier.id < assignments.id
+        )
+    """)
+    cursor.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_assignments_natural_key
+        ON assignments (tab_name, assignment_title, due_date)
+    """)
+
+
+def migration_008_tab_ids(cursor):
+    # Give tabs an integer id and make assignments reference it, so renaming a tab
+    # updates one row, deleting it cascades, and rows no longer repeat the tab name.
+    # Both tables are rebuilt (SQLite cannot add a foreign key to an existing table);
+    # assignment ids are kept, so the full-text index stays valid. Foreign keys are
+    # only switched on after migrating, which is what allows dropping the old tables.
+    cursor.execute("""
+        CREATE TABLE tabs_new (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE,
+            sort_column TEXT NOT NULL DEFAULT 'id',
+            sort_direction TEXT NOT NULL DEFAULT 'ASC'
+        )
+    """)
+    cursor.execute("""
+        INSERT INTO tabs_new (name, sort_column, sort_direction)
+        SELECT name, sort_column, sort_direction FROM tabs WHERE name IS NOT NULL ORDER BY rowid
+    """)
+    # Assignments whose tab was never recorded in the tabs table get one, so no row is lost
+    cursor.execute("""
+        INSERT OR IGNORE INTO tabs_new (name)
+        SELECT tab_name FROM assignments WHERE tab_name IS NOT NULL GROUP BY tab_name ORDER BY MIN(id)
+    """)
+    cursor.execute("""
+        CREATE TABLE assignments_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            tab_id INTEGER REFERENCES tabs (id) ON DELETE CASCADE,
+            assignment_title TEXT,
+            due_date TEXT,
+            status TEXT,
+            notes TEXT
+        )
+    """)
+    cursor.execute("""
+        INSERT INTO assignments_new (id, tab_id, assignment_title, due_date, status, notes)
+        SELECT assignments.id, tabs_new.id, assignment_title, due_date, status, notes
+        FROM assignments LEFT JOIN tabs_new ON tabs_new.name = assignments.tab_name
+        ORDER BY assignments.id
+    """)
+    # Keep the AUTOINCREMENT high-water mark so ids of deleted rows are never reused
+    cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'assignments'")
+    row = cursor.fetchone()
+    sequence = row[0] if row else 0
+
+    cursor.execute("DROP TABLE assignments")
+    cursor.execute("DROP TABLE tabs")
+    cursor.execute("ALTER TABLE tabs_new RENAME TO tabs")
+    cursor.execute("ALTER TABLE assignments_new RENAME TO assignments")
+    cursor.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'assignments'", (sequence,))
+
+    # Indexes of migrations 002, 003, 006 and 007, now keyed on tab_id; the (tab_id)
+    # index also serves the ON DELETE CASCADE lookup
+    cursor.execute("CREATE INDEX idx_assignments_tab ON assignments (tab_id)")
+    cursor.execute("CREATE INDEX idx_assignments_tab_due ON assignments (tab_id, due_date)")
+    cursor.execute("CREATE INDEX idx_assignments_status_due ON assignments (status, due_date)")
+    cursor.execute("CREATE INDEX idx_assignments_tab_title ON assignments (tab_id, assignment_title COLLATE NOCASE)")
+    cursor.execute("CREATE INDEX idx_assignments_tab_status ON assignments (tab_id, status)")
+    cursor.execute("CREATE UNIQUE INDEX idx_assignments_natural_key ON assignments (tab_id, assignment_title, due_date)")
+
+    # Full-text triggers of migration 005 were dropped with the old table
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'assignments_fts'")
+    if cursor.fetchone():
+        cursor.execute("""
+            CREATE TRIGGER assignments_fts_insert AFTER INSERT ON assignments BEGIN
+                INSERT INTO assignments_fts (rowid, assignment_title, notes)
+                VALUES (new.id, new.assignment_title, new.notes);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER assignments_fts_delete AFTER DELETE ON assignments BEGIN
+                DELETE FROM assignments_fts WHERE rowid = old.id;
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER assignments_fts_update AFTER UPDATE OF assignment_title, notes ON assignments BEGIN
+                UPDATE assignments_fts SET assignment_title = new.assignment_title, notes = new.notes
+                WHERE rowid = new.id;
+            END
+        """)
+
+    # Reads select from this view, which keeps the (id, tab_name, assignment_title,
+    # due_date, status, notes) row shape the rest of the application expects
+    cursor.execute("""
+        CREATE VIEW assignment_rows AS
+        SELECT assignments.id AS id, tabs.name AS tab_name, assignments.tab_id AS tab_id,
+               assignments.assignment_title AS assignment_title, assignments.due_date AS due_date,
+               assignments.status AS status, assignments.notes AS notes
+        FROM assignments
+        JOIN tabs ON tabs.id = assignments.tab_id
+    """)
+
+    cursor.execute("PRAGMA foreign_key_check")
+    if cursor.fetchone():
+        raise sqlite3.IntegrityError("Foreign key check failed after moving assignments to tab ids.")
+
+
+def migration_009_compressed_notes(cursor):
+    # Long notes are stored zlib-compressed (see notes.py). The full-text triggers index
+    # notes_text(notes) so the index keeps holding plain text; they are dropped while
+    # existing notes are compressed so the index is not rewritten with the same text.
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'assignments_fts'")
+    full_text_search = cursor.fetchone() is not None
+    cursor.execute("DROP TRIGGER IF EXISTS assignments_fts_insert")
+    cursor.execute("DROP TRIGGER IF EXISTS assignments_fts_update")
+
+    cursor.execute("""
+        SELECT id, notes FROM assignments
+        WHERE typeof(notes) = 'text' AND length(CAST(notes AS BLOB)) >= ?
+    """, (NOTES_COMPRESSION_THRESHOLD,))
+    packed = [(pack_notes(notes), assignment_id) for assignment_id, notes in cursor.fetchall()]
+    cursor.executemany("UPDATE assignments SET notes = ? WHERE id = ?", [row for row in packed if isinstance(row[0], bytes)])
+
+    if full_text_search:
+        cursor.execute("""
+            CREATE TRIGGER assignments_fts_insert AFTER INSERT ON assignments BEGIN
+                INSERT INTO assignments_fts (rowid, assignment_title, notes)
+                VALUES (new.id, new.assignment_title, notes_text(new.notes));
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER assignments_fts_update AFTER UPDATE OF assignment_title, notes ON assignments BEGIN
+                UPDATE assignments_fts SET assignment_title = new.assignment_title, notes = notes_text(new.notes)
+                WHERE rowid = new.id;
+            END
+        """)
+
+
+def migration_010_archive(cursor):
+    # Completed assignments can be moved out of the live table so tab loads only read
+    # live rows. Archived rows keep their id and reference their tab, so deleting the
+    # tab deletes them too; they are paged newest due date first.
+    cursor.execute("""
+        CREATE TABLE assignments_archive (
+            id INTEGER PRIMARY KEY,
+            tab_id INTEGER REFERENCES tabs (id) ON DELETE CASCADE,
+            assignment_title TEXT,
+            due_date TEXT,
+            status TEXT,
+            notes,
+            archived_at TEXT
+        )
+    """)
+    cursor.execute("CREATE INDEX idx_archive_due ON assignments_archive (due_date)")
+    cursor.execute("CREATE INDEX idx_archive_tab ON assignments_archive (tab_id)")
+
+
+def migration_011_archive_natural_key(cursor):
+    # Imports check every key against the archive before inserting it. The index
+    # replaces the (tab_id) one, whose lookups it also serves.
+    cursor.execute("CREATE INDEX idx_archive_natural_key ON assignments_archive (tab_id, assignment_title, due_date)")
+    cursor.execute("DROP INDEX idx_archive_tab")
+
+
+def migration_012_iso_due_dates(cursor):
+    # Due dates typed or imported without leading zeros (2024-1-5) were stored as given.
+    # SQLite's date functions reject them and they sort out of order, so they are
+    # rewritten in DATE_FORMAT; dates that do not parse at all are left alone. A row
+    # whose rewritten key is already taken is merged into the row holding it, as in
+    # migration 007. Archived rows have no natural key index and are rewritten as they are.
+    iso_date = "'[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'"
+    cursor.execute(f"SELECT id, due_date FROM assignments_archive WHERE due_date NOT GLOB {iso_date}")
+    for assignment_id, due_date in cursor.fetchall():
+        try:
+            cursor.execute("UPDATE assignments_archive SET due_date = ? WHERE id = ?", (format_date(parse_date(due_date)), assignment_id))
+        except (TypeError, ValueError):
+            continue
+
+    cursor.execute(f"SELECT id, tab_id, assignment_title, due_date, status, notes FROM assignments WHERE due_date NOT GLOB {iso_date} ORDER BY id")
+    for assignment_id, tab_id, assignment_title, due_date, status, notes in cursor.fetchall():
+        try:
+            due_date = format_date(parse_date(due_date))
+        except (TypeError, ValueError):
+            continue
+        cursor.execute("SELECT id, status, notes FROM assignments WHERE tab_id = ? AND assignment_title = ? AND due_date = ?",
+                       (tab_id, assignment_title, due_date))
+        existing = cursor.fetchone()
+        if existing is None:
+            cursor.execute("UPDATE assignments SET due_date = ? WHERE id = ?", (due_date, assignment_id))
+            continue
+        existing_id, existing_status, existing_notes = existing
+        copies = sorted([(existing_id, existing_notes), (assignment_id, notes)])
+        merged_notes = merge_notes(notes_text(row_notes) for row_id, row_notes in copies)
+        merged_status = 'Completed' if 'Completed' in (status, existing_status) else existing_status
+        cursor.execute("DELETE FROM assignments WHERE id = ?", (assignment_id,))
+        cursor.execute("UPDATE assignments SET status = ?, notes = ? WHERE id = ?",
+                       (merged_status, pack_notes(merged_notes) if merged_notes else existing_notes, existing_id))
+
+
+MIGRATIONS = [
+    migration_001_base_schema,
+    migration_002_assignment_indexes,
+    migration_003_tab_sort_indexes,
+    migration_004_due_date_colors,
+    migration_005_full_text_search,
+    migration_006_tab_sort_state,
+    migration_007_natural_key,
+    migration_008_tab_ids,
+    migration_009_compressed_notes,
+    migration_010_archive,
+    migration_011_archive_natural_key,
+    migration_012_iso_due_dates,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_schema_version(cursor):
+    cursor.execute("PRAGMA user_version")
+    return cursor.fetchone()[0]
+
+
+def migrate(conn):
+    # Apply every pending migration, each in its own transaction together with
+    # the user_version bump, so a failed migration leaves the previous version intact.
+    cursor = conn.cursor()
+    version = get_schema_version(cursor)
+    if version > SCHEMA_VERSION:
+        raise RuntimeError(f"Database schema version {version} is newer than this application supports ({SCHEMA_VERSION}).")
+    for number in range(version, SCHEMA_VERSION):
+        try:
+            cursor.execute("BEGIN")
+            MIGRATIONS[number](cursor)
+            cursor.execute(f"PRAGMA user_version = {number + 1}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return SCHEMA_VERSION
@@ -0,0 +1,35 @@
+# notes.py
+
+import zlib
+
+from constants import NOTES_COMPRESSION_THRESHOLD
+
+# Long notes (pasted links, file listings) are stored zlib-compressed in the notes
+# column as a BLOB; shorter ones stay TEXT. The SQL type tells the two apart, so rows
+# written before compression existed need no marker. Every connection opened through
+# StorageConfig registers notes_text(), which SQL uses wherever the text is needed:
+# reads, the LIKE search fallback and the full-text index triggers.
+
+
+def pack_notes(notes, threshold=NOTES_COMPRESSION_THRESHOLD):
+    # Value to store for notes: compressed bytes if that is worth it, else the text.
+    # Compression is deterministic, so equal notes are stored as equal values and
+    # the upserts' "notes IS NOT excluded.notes" check still works.
+    if notes is None:
+        return None
+    data = notes.encode('utf-8')
+    if len(data) < threshold:
+        return notes
+    packed = zlib.compress(data)
+    return packed if len(packed) < len(data) else notes
+
+
+def notes_text(value):
+    # Inverse of pack_notes
+    if isinstance(value, bytes):
+        return zlib.decompress(value).decode('utf-8')
+    return value
+
+
+def register_functions(conn):
+    conn.create_function('notes_text', 1, notes_text, deterministic=True)
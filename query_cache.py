@@ -0,0 +1,55 @@
+# query_cache.py
+
+from collections import OrderedDict
+
+
+class QueryCache:
+    # Bounded LRU cache of query results. Every entry is registered under one or more
+    # invalidation groups (e.g. ('tab', name) or ('id', 42)) so a write can drop
+    # exactly the entries it affects.
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.entries = OrderedDict()  # key -> (value, groups)
+        self.groups = {}              # group -> set of keys
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        # Return (found, value)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[0]
+
+    def put(self, key, value, groups):
+        if key in self.entries:
+            self.discard(key)
+        self.entries[key] = (value, groups)
+        for group in groups:
+            self.groups.setdefault(group, set()).add(key)
+        while len(self.entries) > self.capacity:
+            self.discard(next(iter(self.entries)))
+
+    def discard(self, key):
+        value, groups = self.entries.pop(key)
+        for group in groups:
+            keys = self.groups.get(group)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.groups[group]
+
+    def invalidate(self, *groups):
+        for group in groups:
+            for key in list(self.groups.get(group, ())):
+                self.discard(key)
+
+    def clear(self):
+        self.entries.clear()
+        self.groups.clear()
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.entries), 'capacity': self.capacity}
@@ -0,0 +1,165 @@
+# recolor.py
+
+import datetime
+
+from constants import DUE_DATE_COLOR_DAYS, RECOLOR_MAX_WAIT_MS
+
+# The due-date buckets of DUE_DATE_COLOR_DAYS as (max_days, tag), tightest first,
+# and the open-ended bucket's tag
+COLOR_THRESHOLDS = sorted((max_days, tag) for tag, max_days in DUE_DATE_COLOR_DAYS.items() if max_days is not None)
+OPEN_COLOR_TAG = next((tag for tag, max_days in DUE_DATE_COLOR_DAYS.items() if max_days is None), '')
+
+
+def parse_due_date(due_date):
+    # Same dates SQLite's julianday() accepts in COLOR_TAG_SQL: ISO YYYY-MM-DD
+    try:
+        return datetime.date.fromisoformat(due_date)
+    except (TypeError, ValueError):
+        return None
+
+
+def color_tag_on(due, day):
+    # Colour tag of a pending assignment due on `due` as seen on `day`, matching
+    # database.COLOR_TAG_SQL (overdue assignments fall in the tightest bucket)
+    days = (due - day).days
+    for max_days, tag in COLOR_THRESHOLDS:
+        if days <= max_days:
+            return tag
+    return OPEN_COLOR_TAG
+
+
+def next_color_change(due, day):
+    # First date after `day` on which the colour tag changes, or None once the
+    # assignment is in the tightest bucket
+    days = (due - day).days
+    crossed = [max_days for max_days, tag in COLOR_THRESHOLDS if max_days < days]
+    if not crossed:
+        return None
+    return due - datetime.timedelta(days=max(crossed))
+
+
+class RecolorScheduler:
+    # Keeps the due-date colours of displayed rows current while the window stays
+    # open across midnight. Every watched TreeviewSync reports the rows it shows; the
+    # scheduler files each pending row under the date its colour next changes, and a
+    # single root.after timer, set for the next midnight, retags only the rows filed
+    # under the new day. Nothing is re-queried and no Treeview is rebuilt.
+    # Rows whose tag is already out of date when shown (e.g. from a query that ran
+    # before midnight) are filed under today and fixed on the next tick.
+    def __init__(self, root, due_column=1, today=None):
+        # Args:
+        #     root (tk.Tk): The window whose event loop runs the timer.
+        #     due_column (int): Index of the due date in a row's Treeview values.
+        self.root = root
+        self.due_column = due_column
+        self.today = today or datetime.date.today()
+        self.changes = {}     # sync -> {date: set of iids whose colour changes that day}
+        self.next_dates = {}  # sync -> {iid: date it is filed under}
+        self.on_new_day = {}  # sync -> function called when the date changes
+        self.timer_id = None
+        self.tick_soon = False  # True while the timer is set to fire immediately
+        self.arm()
+
+    def watch(self, sync, on_new_day=None):
+        # Track the rows of a TreeviewSync from now on. on_new_day() is called after
+        # a tick that changed the date, e.g. to drop rows cached before midnight.
+        self.changes[sync] = {}
+        self.next_dates[sync] = {}
+        if on_new_day is not None:
+            self.on_new_day[sync] = on_new_day
+        sync.on_row_changed = lambda iid, values, tags: self.track(sync, iid, values, tags)
+        sync.on_rows_removed = lambda iids: self.untrack(sync, iids)
+        for iid, (values, tags) in sync.items.items():
+            self.track(sync, iid, values, tags)
+
+    def unwatch(self, sync):
+        sync.on_row_changed = None
+        sync.on_rows_removed = None
+        self.changes.pop(sync, None)
+        self.next_dates.pop(sync, None)
+        self.on_new_day.pop(sync, None)
+
+    def track(self, sync, iid, values, tags):
+        # File a row shown or changed by sync under the date its colour next changes.
+        # Rows without a due-date colour (completed, unparseable) are not filed.
+        if sync not in self.changes:
+            return
+        self.unfile(sync, iid)
+        tag = tags[0] if tags else ''
+        if tag not in DUE_DATE_COLOR_DAYS:
+            return
+        due = parse_due_date(values[self.due_column])
+        if due is None:
+            return
+        if color_tag_on(due, self.today) != tag:
+            # Out of date already: fix it on the next tick, which is made immediate
+            when = self.today
+            if not self.tick_soon:
+                self.tick_soon = True
+                self.arm(0)
+        else:
+            when = next_color_change(due, self.today)
+            if when is None:
+                return
+        self.changes[sync].setdefault(when, set()).add(iid)
+        self.next_dates[sync][iid] = when
+
+    def untrack(self, sync, iids):
+        # Forget rows sync no longer shows, so scrolling a paged view does not keep
+        # every row it has passed filed
+        if sync not in self.changes:
+            return
+        for iid in iids:
+            self.unfile(sync, iid)
+
+    def unfile(self, sync, iid):
+        previous = self.next_dates[sync].pop(iid, None)
+        filed = self.changes[sync].get(previous)
+        if filed is not None:
+            filed.discard(iid)
+            if not filed:
+                del self.changes[sync][previous]
+
+    def tick(self):
+        self.timer_id = None
+        self.tick_soon = False
+        today = datetime.date.today()
+        new_day = today != self.today
+        self.today = today
+        for sync in list(self.changes):
+            changes = self.changes[sync]
+            for when in [when for when in changes if when <= today]:
+                for iid in changes.pop(when):
+                    self.next_dates[sync].pop(iid, None)
+                    item = sync.items.get(iid)
+                    if item is None:
+                        continue
+                    values, tags = item
+                    due = parse_due_date(values[self.due_column])
+                    new_tags = (color_tag_on(due, today),)
+                    if new_tags != tags:
+                        # sync reports the change back to track(), which files the row again
+                        sync.retag(iid, new_tags)
+                    else:
+                        self.track(sync, iid, values, tags)
+        if new_day:
+            for on_new_day in list(self.on_new_day.values()):
+                on_new_day()
+        self.arm()
+
+    def arm(self, delay_ms=None):
+        # (Re)start the single timer: by default shortly after the next midnight, but
+        # at most RECOLOR_MAX_WAIT_MS away so a suspended machine catches up soon after
+        # it wakes
+        if delay_ms is None:
+            now = datetime.datetime.now()
+            midnight = datetime.datetime.combine(now.date() + datetime.timedelta(days=1), datetime.time())
+            delay_ms = min(int((midnight - now).total_seconds() * 1000) + 1000, RECOLOR_MAX_WAIT_MS)
+        if self.timer_id is not None:
+            self.root.after_cancel(self.timer_id)
+        self.timer_id = self.root.after(delay_ms, self.tick)
+
+    def stop(self):
+        if self.timer_id is not None:
+            self.root.after_cancel(self.timer_id)
+            self.timer_id = None
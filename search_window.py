@@ -0,0 +1,67 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+class SearchWindow(tk.Toplevel):
+    def __init__(self, master, async_db, open_assignment_callback, query=''):
+        super().__init__(master)
+        self.title("Search Assignments")
+        self.async_db = async_db
+        self.open_assignment_callback = open_assignment_callback
+        # Bumped on every search so results of an older query are discarded
+        self.generation = 0
+        self.create_widgets()
+        self.search(query)
+
+    def create_widgets(self):
+        # Search box
+        search_frame = tk.Frame(self)
+        search_frame.pack(side=tk.TOP, fill=tk.X, padx=5, pady=5)
+        self.query_var = tk.StringVar()
+        query_entry = tk.Entry(search_frame, textvariable=self.query_var, width=50)
+        query_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        query_entry.bind('<Return>', lambda event: self.search(self.query_var.get()))
+        search_button = tk.Button(search_frame, text="Search", command=lambda: self.search(self.query_var.get()))
+        search_button.pack(side=tk.LEFT, padx=5)
+
+        # Create a Treeview to display hits from every tab
+        columns = ('Course Name', 'Assignment Title', 'Due Date', 'Match')
+        self.tree = ttk.Treeview(self, columns=columns, show='headings')
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, minwidth=50, width=200)
+        self.tree.pack(expand=True, fill='both')
+
+        self.status_label = tk.Label(self, text="", anchor='w')
+        self.status_label.pack(side=tk.BOTTOM, fill=tk.X, padx=5)
+
+        # Bind double-click event
+        self.tree.bind('<Double-1>', self.on_item_double_click)
+
+    def search(self, query):
+        self.query_var.set(query)
+        self.generation += 1
+        generation = self.generation
+        if not query.strip():
+            self.show_results([], generation)
+            return
+        self.status_label.config(text="Searching...")
+        self.async_db.search(query, callback=lambda results: self.show_results(results, generation))
+
+    def show_results(self, results, generation):
+        # The window may have been closed or a newer search started meanwhile
+        if not self.winfo_exists() or generation != self.generation:
+            return
+        for item in self.tree.get_children():
+            self.tree.delete(item)
+        for assignment_id, tab_name, assignment_title, due_date, status, snippet in results:
+            self.tree.insert('', tk.END, iid=assignment_id, values=(tab_name, assignment_title, due_date, snippet or ''))
+        self.status_label.config(text=f"{len(results)} matching assignments")
+
+    def on_item_double_click(self, event):
+        selected_items = self.tree.selection()
+        if selected_items:
+            item = selected_items[0]  # The iid is the assignment_id
+            tab_name = self.tree.item(item, 'values')[0]
+            self.open_assignment_callback(tab_name, int(item))
+            self.focus()
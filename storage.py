@@ -0,0 +1,84 @@
+# storage.py
+
+import sqlite3
+
+from constants import DATABASE_PATH, STORAGE_PROFILE
+from notes import register_functions
+
+# Named SQLite tuning profiles.
+#   journal_mode: WAL lets readers run while a write is in progress.
+#   synchronous:  FULL syncs every commit; NORMAL (safe with WAL) only syncs at checkpoints,
+#                 so a power cut may lose the last commits but never corrupts the file.
+#   mmap_size:    bytes of the file read through memory mapping (0 disables it).
+#   cache_size:   page cache per connection; negative values are KiB.
+#   busy_timeout: milliseconds to wait for a lock before failing with "database is locked".
+STORAGE_PROFILES = {
+    # SQLite's own defaults, as used before storage profiles existed
+    'legacy': {
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+        'mmap_size': 0,
+        'cache_size': -2000,
+        'busy_timeout': 5000,
+    },
+    'durable': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'mmap_size': 0,
+        'cache_size': -8000,
+        'busy_timeout': 5000,
+    },
+    'fast': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64000,
+        'busy_timeout': 5000,
+    },
+}
+
+
+class StorageConfig:
+    # Where the database lives and how its connections are tuned
+    def __init__(self, path=DATABASE_PATH, profile=STORAGE_PROFILE, **overrides):
+        # Args:
+        #     path (str): Database file, or ':memory:'.
+        #     profile (str): Name of an entry in STORAGE_PROFILES.
+        #     overrides: Individual settings that replace the profile's values.
+        if profile not in STORAGE_PROFILES:
+            raise ValueError(f"Unknown storage profile '{profile}'. Choose one of: {', '.join(STORAGE_PROFILES)}.")
+        self.path = str(path)
+        self.profile = profile
+        self.settings = dict(STORAGE_PROFILES[profile])
+        self.settings.update(overrides)
+
+    def is_memory(self):
+        return self.path == ':memory:'
+
+    def connect(self):
+        # Open the read-write connection (creating the file if needed) and apply the profile
+        conn = sqlite3.connect(self.path, timeout=self.settings['busy_timeout'] / 1000)
+        if not self.is_memory():
+            conn.execute(f"PRAGMA journal_mode = {self.settings['journal_mode']}")
+        conn.execute(f"PRAGMA synchronous = {self.settings['synchronous']}")
+        self.apply_read_settings(conn)
+        register_functions(conn)
+        return conn
+
+    def connect_reader(self):
+        # Open a read-only connection to the same file, or None for in-memory databases,
+        # which cannot be shared between connections
+        if self.is_memory():
+            return None
+        # pathlib is slow to import and only needed here, off the startup path
+        from pathlib import Path
+        uri = Path(self.path).resolve().as_uri() + '?mode=ro'
+        conn = sqlite3.connect(uri, uri=True, timeout=self.settings['busy_timeout'] / 1000)
+        self.apply_read_settings(conn)
+        register_functions(conn)
+        return conn
+
+    def apply_read_settings(self, conn):
+        conn.execute(f"PRAGMA mmap_size = {int(self.settings['mmap_size'])}")
+        conn.execute(f"PRAGMA cache_size = {int(self.settings['cache_size'])}")
+        conn.execute(f"PRAGMA busy_timeout = {int(self.settings['busy_timeout'])}")
@@ -0,0 +1,5 @@
+# tests
+#
+# Regression tests, written with unittest so they need nothing beyond the standard
+# library. Run them from the repository root:
+#     python -m unittest discover tests
@@ -0,0 +1,83 @@
+# tests/test_archive.py
+
+import datetime
+import os
+import tempfile
+import unittest
+
+from database import Database
+from exporter import export_assignments
+from importer import NdjsonImportJob
+from storage import StorageConfig
+
+
+class ArchiveRoundTripTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db = self.open_database('tracker.db')
+
+    def tearDown(self):
+        self.db.close()
+        self.directory.cleanup()
+
+    def open_database(self, name):
+        return Database(StorageConfig(self.path(name)), cache_size=0)
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def archive(self):
+        self.db.archive_completed(datetime.date(2030, 1, 1))
+
+    def test_archived_key_cannot_be_added_again(self):
+        self.db.add_assignment('Math', 'Essay', '2024-01-05')
+        self.db.mark_completed_many([1])
+        self.archive()
+        self.assertFalse(self.db.add_assignment('Math', 'Essay', '2024-01-05'))
+        self.assertEqual(list(self.db.iter_assignment_rows()), [])
+
+    def test_export_round_trip_with_repeated_archived_key(self):
+        # Archives written before add_assignment checked the archive can hold a key twice
+        self.db.add_assignment('Math', 'Essay', '2024-01-05', 'first')
+        self.db.add_assignment('Math', 'Quiz', '2024-01-06')
+        self.db.mark_completed_many([1])
+        self.archive()
+        self.db.conn.execute("""
+            INSERT INTO assignments_archive (id, tab_id, assignment_title, due_date, status, notes, archived_at)
+            SELECT 10, tab_id, assignment_title, due_date, status, 'second', '2024-02-01' FROM assignments_archive WHERE id = 1
+        """)
+        self.db.conn.commit()
+        export_path = self.path('export.ndjson')
+        self.assertEqual(export_assignments(self.db, export_path, 'ndjson'), 3)
+
+        restored = self.open_database('restored.db')
+        try:
+            counts = NdjsonImportJob(export_path).run(restored)
+            self.assertEqual((counts['new'], counts['invalid']), (2, 0))
+            self.assertEqual([row[1:] for row in restored.iter_assignment_rows()], [('Math', 'Quiz', '2024-01-06', 'Pending')])
+            self.assertEqual(restored.count_archived(), 1)
+            # Importing the same file again changes nothing
+            counts = NdjsonImportJob(export_path).run(restored)
+            self.assertEqual((counts['new'], counts['updated'], counts['unchanged']), (0, 0, 3))
+        finally:
+            restored.close()
+
+    def test_export_round_trip(self):
+        self.db.add_assignment('Math', 'Essay', '2024-01-05', 'notes')
+        self.db.add_assignment('Math', 'Quiz', '2024-01-06')
+        self.db.add_assignment('History', 'Reading', '2024-01-07')
+        self.db.mark_completed_many([1, 3])
+        self.archive()
+        export_path = self.path('export.ndjson')
+        export_assignments(self.db, export_path, 'ndjson')
+
+        restored = self.open_database('restored.db')
+        try:
+            NdjsonImportJob(export_path).run(restored)
+            self.assertEqual(list(restored.iter_assignments()), list(self.db.iter_assignments()))
+        finally:
+            restored.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
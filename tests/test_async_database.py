@@ -0,0 +1,41 @@
+# tests/test_async_database.py
+
+import threading
+import time
+import unittest
+
+from async_database import AsyncDatabase
+
+
+class FakeRoot:
+    # Just enough of tk.Tk for AsyncDatabase: polling is never run
+    def after(self, delay, callback):
+        return 'poll'
+
+    def after_cancel(self, after_id):
+        pass
+
+
+class FakeDatabase:
+    def close(self):
+        pass
+
+
+class CloseTest(unittest.TestCase):
+    def test_close_waits_for_queued_requests(self):
+        async_db = AsyncDatabase(FakeRoot(), database_factory=FakeDatabase)
+        future = async_db.submit(lambda db: time.sleep(0.05) or 'done')
+        self.assertTrue(async_db.close(timeout=5))
+        self.assertEqual(future.result(), 'done')
+
+    def test_close_gives_up_on_a_request_that_does_not_finish(self):
+        release = threading.Event()
+        async_db = AsyncDatabase(FakeRoot(), database_factory=FakeDatabase)
+        async_db.submit(lambda db: release.wait())
+        self.assertFalse(async_db.close(timeout=0.05))
+        release.set()
+        async_db.thread.join()
+
+
+if __name__ == '__main__':
+    unittest.main()
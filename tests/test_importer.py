@@ -0,0 +1,62 @@
+# tests/test_importer.py
+
+import json
+import os
+import tempfile
+import unittest
+
+from database import Database
+from exporter import export_assignments
+from importer import NdjsonImportJob, clean_records
+from storage import StorageConfig
+
+NOTES = '    indented code\n  - item\n'
+
+
+def new_counts():
+    return {'new': 0, 'updated': 0, 'unchanged': 0, 'skipped': 0, 'invalid': 0}
+
+
+class CleanRecordsTest(unittest.TestCase):
+    def clean(self, *records):
+        counts = new_counts()
+        rows = list(clean_records([json.dumps(record) for record in records], counts))
+        return rows, counts
+
+    def test_notes_are_kept_exactly(self):
+        rows, counts = self.clean(
+            {'tab_name': 'Math', 'assignment_title': 'Essay', 'due_date': '2024-01-05', 'notes': NOTES},
+            {'tab_name': 'Math', 'assignment_title': 'Quiz', 'due_date': '2024-01-06', 'notes': None},
+        )
+        self.assertEqual([row[4] for row in rows], [NOTES, None])
+
+    def test_names_and_dates_are_trimmed(self):
+        rows, counts = self.clean({'tab_name': ' Math ', 'assignment_title': ' Essay ', 'due_date': ' 2024-1-5 '})
+        self.assertEqual(rows, [('Math', 'Essay', '2024-01-05', 'Pending', None, '')])
+
+    def test_non_string_field_is_invalid(self):
+        rows, counts = self.clean(
+            {'tab_name': 'Math', 'assignment_title': 101, 'due_date': '2024-01-05'},
+            {'tab_name': 'Math', 'assignment_title': 'Essay', 'due_date': '2024-01-05', 'notes': ['a']},
+        )
+        self.assertEqual((rows, counts['invalid']), ([], 2))
+
+
+class ReimportTest(unittest.TestCase):
+    def test_reimporting_an_export_changes_nothing(self):
+        with tempfile.TemporaryDirectory() as directory:
+            db = Database(StorageConfig(os.path.join(directory, 'tracker.db')), cache_size=0)
+            try:
+                db.add_assignment('Math', 'Essay', '2024-01-05', NOTES)
+                db.add_assignment('Math', 'Quiz', '2024-01-06', None)
+                export_path = os.path.join(directory, 'export.ndjson')
+                export_assignments(db, export_path, 'ndjson')
+                counts = NdjsonImportJob(export_path).run(db)
+                self.assertEqual((counts['new'], counts['updated'], counts['unchanged']), (0, 0, 2))
+                self.assertEqual(db.get_assignment_by_id(1)[5], NOTES)
+            finally:
+                db.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
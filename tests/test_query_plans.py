@@ -0,0 +1,33 @@
+# tests/test_query_plans.py
+
+import unittest
+
+import database
+from database import Database
+from storage import StorageConfig
+
+
+class QueryPlanTest(unittest.TestCase):
+    def setUp(self):
+        self.db = Database(StorageConfig(':memory:'), cache_size=0)
+        self.hot_queries = dict(database.HOT_QUERIES)
+
+    def tearDown(self):
+        database.HOT_QUERIES.clear()
+        database.HOT_QUERIES.update(self.hot_queries)
+        self.db.close()
+
+    def test_hot_queries_are_index_backed(self):
+        self.assertEqual(self.db.check_query_plans(), {})
+
+    def test_aliased_scan_is_flagged(self):
+        database.HOT_QUERIES['archive_by_status'] = ("SELECT a.id FROM assignments_archive a WHERE a.status = ?", ('Completed',))
+        self.assertEqual(list(self.db.check_query_plans()), ['archive_by_status'])
+
+    def test_scan_of_lookup_table_is_allowed(self):
+        database.HOT_QUERIES['all_tabs'] = ("SELECT t.name FROM tabs AS t", ())
+        self.assertEqual(self.db.check_query_plans(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
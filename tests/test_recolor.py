@@ -0,0 +1,55 @@
+# tests/test_recolor.py
+
+import datetime
+import unittest
+
+from benchmarks.headless import FakeTreeview
+from recolor import RecolorScheduler, color_tag_on
+from tree_sync import TreeviewSync
+
+TODAY = datetime.date(2030, 1, 1)
+
+
+class FakeRoot:
+    def after(self, delay, callback):
+        return 'tick'
+
+    def after_cancel(self, after_id):
+        pass
+
+
+def make_rows(ids):
+    # Pending rows due far enough ahead that each is filed for a later colour change
+    rows = []
+    for assignment_id in ids:
+        due = TODAY + datetime.timedelta(days=30 + assignment_id % 20)
+        rows.append((assignment_id, ('Title', due.isoformat(), 'Pending'), (color_tag_on(due, TODAY),)))
+    return rows
+
+
+class RemovedRowsTest(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = RecolorScheduler(FakeRoot(), today=TODAY)
+        self.sync = TreeviewSync(FakeTreeview())
+        self.scheduler.watch(self.sync)
+
+    def filed(self):
+        return {iid for iids in self.scheduler.changes[self.sync].values() for iid in iids}
+
+    def test_scrolling_keeps_only_shown_rows_filed(self):
+        for start in range(0, 1000, 50):
+            self.sync.sync(make_rows(range(start, start + 50)))
+        self.assertEqual(set(self.scheduler.next_dates[self.sync]), set(self.sync.items))
+        self.assertEqual(self.filed(), set(self.sync.items))
+
+    def test_remove_and_clear_unfile_rows(self):
+        self.sync.sync(make_rows(range(10)))
+        self.sync.remove([0, 1])
+        self.assertEqual(self.filed(), {str(i) for i in range(2, 10)})
+        self.sync.clear()
+        self.assertEqual(self.scheduler.changes[self.sync], {})
+        self.assertEqual(self.scheduler.next_dates[self.sync], {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+# tests/test_virtual_tree.py
+#
+# VirtualTreeview's selection handlers, driven without a display: the view is built
+# without Tk and its tree is a stand-in that records the selection.
+
+import unittest
+
+from benchmarks.headless import FakeTreeview
+from tree_sync import TreeviewSync
+from virtual_tree import VirtualTreeview
+
+
+class SelectableTreeview(FakeTreeview):
+    def __init__(self, row_height=20):
+        super().__init__()
+        self.row_height = row_height
+        self.selected = ()
+
+    def identify_row(self, y):
+        index = y // self.row_height
+        return self.children[index] if index < len(self.children) else ''
+
+    def selection(self):
+        return self.selected
+
+    def selection_set(self, *items):
+        self.selected = tuple(items)
+
+
+class Event:
+    def __init__(self, y, state=0):
+        self.y = y
+        self.state = state
+
+
+class SelectionTest(unittest.TestCase):
+    def setUp(self):
+        # Rows 1-3 are visible; 50 and 60 were selected before scrolling them out of view
+        self.view = VirtualTreeview.__new__(VirtualTreeview)
+        self.view.tree = SelectableTreeview()
+        self.view.sync = TreeviewSync(self.view.tree)
+        self.view.sync.sync([(str(i), ('Title', '2024-01-01', 'Pending'), ()) for i in (1, 2, 3)])
+        self.view.selected_ids = {2, 50, 60}
+        self.view.tree.selection_set('2')
+
+    def click(self, handler, row, state=0):
+        # The handler bound to the button, then Tk's selection change, then <<TreeviewSelect>>
+        handler(Event(row * self.view.tree.row_height, state))
+        return str(self.view.sync.order[row])
+
+    def test_right_click_outside_selection_drops_hidden_rows(self):
+        iid = self.click(self.view.on_context_click, 2)
+        # AssignmentTracker.show_context_menu
+        self.view.tree.selection_set(iid)
+        self.view.on_select(None)
+        self.assertEqual(self.view.get_selected_ids(), [3])
+
+    def test_right_click_on_selection_keeps_hidden_rows(self):
+        self.click(self.view.on_context_click, 1)
+        self.view.on_select(None)
+        self.assertEqual(self.view.get_selected_ids(), [2, 50, 60])
+
+    def test_plain_click_drops_hidden_rows(self):
+        iid = self.click(self.view.on_click, 0)
+        self.view.tree.selection_set(iid)
+        self.view.on_select(None)
+        self.assertEqual(self.view.get_selected_ids(), [1])
+
+    def test_control_click_keeps_hidden_rows(self):
+        iid = self.click(self.view.on_click, 0, state=0x0004)
+        self.view.tree.selection_set('2', iid)
+        self.view.on_select(None)
+        self.assertEqual(self.view.get_selected_ids(), [1, 2, 50, 60])
+
+
+if __name__ == '__main__':
+    unittest.main()
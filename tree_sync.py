@@ -0,0 +1,177 @@
+# tree_sync.py
+
+from bisect import bisect_left
+
+# Above this many out-of-place rows, TreeviewSync.place switches to a linear pass
+BULK_MOVE_THRESHOLD = 64
+
+
+class TreeviewSync:
+    # Keeps a flat ttk.Treeview in step with a list of rows while issuing as few Tk
+    # calls as possible. Rows are (iid, values, tags) tuples. A Python-side mirror of
+    # what the widget currently shows is diffed against the new rows, so unchanged
+    # rows cost nothing and a single-row edit costs a constant number of Tk calls.
+    def __init__(self, tree):
+        self.tree = tree
+        self.order = []  # iids in display order
+        self.items = {}  # iid -> (values, tags)
+        # Optional on_row_changed(iid, values, tags), called for every row inserted or
+        # changed (see recolor.RecolorScheduler)
+        self.on_row_changed = None
+        # Optional on_rows_removed(iids), called with the rows deleted from the widget
+        self.on_rows_removed = None
+
+    def sync(self, rows):
+        new_items = {}
+        new_order = []
+        for iid, values, tags in rows:
+            iid = str(iid)
+            new_items[iid] = (tuple(values), tuple(tags))
+            new_order.append(iid)
+
+        # Delete rows that are gone
+        removed = [iid for iid in self.order if iid not in new_items]
+        if removed:
+            self.tree.delete(*removed)
+            removed_set = set(removed)
+            self.order = [iid for iid in self.order if iid not in removed_set]
+            for iid in removed:
+                del self.items[iid]
+            if self.on_rows_removed is not None:
+                self.on_rows_removed(removed)
+
+        # Update rows whose values or tags changed
+        for iid in self.order:
+            if self.items[iid] != new_items[iid]:
+                values, tags = new_items[iid]
+                self.tree.item(iid, values=values, tags=tags)
+                self.items[iid] = new_items[iid]
+                if self.on_row_changed is not None:
+                    self.on_row_changed(iid, values, tags)
+
+        # Insert new rows and move existing ones into place
+        self.place(new_order, new_items)
+
+    def update_rows(self, rows, key, reverse=False):
+        # Insert or update only the given rows, leaving the others alone, and move
+        # them to where they belong in the display order. key(iid, values) gives
+        # a row's sort key; the rows shown must already be in that order.
+        new_items = dict(self.items)
+        for iid, values, tags in rows:
+            iid = str(iid)
+            item = (tuple(values), tuple(tags))
+            if iid in self.items and self.items[iid] != item:
+                self.tree.item(iid, values=item[0], tags=item[1])
+                self.items[iid] = item
+                if self.on_row_changed is not None:
+                    self.on_row_changed(iid, item[0], item[1])
+            new_items[iid] = item
+        new_order = sorted(new_items, key=lambda iid: key(iid, new_items[iid][0]), reverse=reverse)
+        self.place(new_order, new_items)
+
+    def retag(self, iid, tags):
+        # Change only the tags of a shown row
+        values = self.items[iid][0]
+        self.tree.item(iid, tags=tags)
+        self.items[iid] = (values, tuple(tags))
+        if self.on_row_changed is not None:
+            self.on_row_changed(iid, values, tuple(tags))
+
+    def remove(self, iids):
+        # Delete the given rows; iids that are not shown are ignored
+        removed = {str(iid) for iid in iids} & self.items.keys()
+        if not removed:
+            return
+        self.tree.delete(*removed)
+        self.order = [iid for iid in self.order if iid not in removed]
+        for iid in removed:
+            del self.items[iid]
+        if self.on_rows_removed is not None:
+            self.on_rows_removed(removed)
+
+    def place(self, new_order, new_items):
+        # Rows that keep their relative order (the longest increasing run of current
+        # positions) stay put; every other row is inserted or moved directly after
+        # its predecessor in the new order. When many rows move (e.g. a re-sort) the
+        # rows are instead placed front to back, which costs linear Python time.
+        stable = self.stable_iids(new_order)
+        if len(new_order) - len(stable) > BULK_MOVE_THRESHOLD:
+            self.place_in_sequence(new_order, new_items)
+            return
+        previous = None
+        for iid in new_order:
+            if iid not in stable:
+                index = self.order.index(previous) + 1 if previous is not None else 0
+                if iid in self.items:
+                    current = self.order.index(iid)
+                    # Tk detaches the item before counting siblings
+                    if current < index:
+                        index -= 1
+                    if current != index:
+                        self.tree.move(iid, '', index)
+                        self.order.pop(current)
+                        self.order.insert(index, iid)
+                else:
+                    values, tags = new_items[iid]
+                    self.tree.insert('', index, iid=iid, values=values, tags=tags)
+                    self.order.insert(index, iid)
+                    self.items[iid] = new_items[iid]
+                    if self.on_row_changed is not None:
+                        self.on_row_changed(iid, values, tags)
+            previous = iid
+
+    def place_in_sequence(self, new_order, new_items):
+        # After placing the first i rows, the widget holds new_order[:i] followed by
+        # the untouched rows in their old order, so a row needs no Tk call when it is
+        # already the first untouched row.
+        placed = set()
+        untouched = iter(self.order)
+        head = next(untouched, None)
+        for index, iid in enumerate(new_order):
+            while head is not None and head in placed:
+                head = next(untouched, None)
+            if iid == head:
+                head = next(untouched, None)
+            elif iid in self.items:
+                self.tree.move(iid, '', index)
+            else:
+                values, tags = new_items[iid]
+                self.tree.insert('', index, iid=iid, values=values, tags=tags)
+                self.items[iid] = new_items[iid]
+                if self.on_row_changed is not None:
+                    self.on_row_changed(iid, values, tags)
+            placed.add(iid)
+        self.order = list(new_order)
+
+    def stable_iids(self, new_order):
+        # Longest increasing subsequence of the current positions of rows that already exist
+        position = {iid: index for index, iid in enumerate(self.order)}
+        existing = [iid for iid in new_order if iid in position]
+        tails = []
+        tail_iids = []
+        parents = {}
+        for iid in existing:
+            pos = position[iid]
+            k = bisect_left(tails, pos)
+            parents[iid] = tail_iids[k - 1] if k > 0 else None
+            if k == len(tails):
+                tails.append(pos)
+                tail_iids.append(iid)
+            else:
+                tails[k] = pos
+                tail_iids[k] = iid
+        stable = set()
+        iid = tail_iids[-1] if tail_iids else None
+        while iid is not None:
+            stable.add(iid)
+            iid = parents[iid]
+        return stable
+
+    def clear(self):
+        removed = self.order
+        if removed:
+            self.tree.delete(*removed)
+        self.order = []
+        self.items = {}
+        if removed and self.on_rows_removed is not None:
+            self.on_rows_removed(removed)
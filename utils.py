@@ -1,6 +1,5 @@
 import datetime
 from constants import DATE_FORMAT
-from tkinter import messagebox
 
 def parse_date(date_str):
     try:
@@ -15,10 +14,14 @@ def validate_date(date_str):
     except ValueError:
         return False
 
+# tkinter is imported only when a message box is shown, so the date helpers can be
+# used without a display (e.g. by cli.py)
 def show_error(message):
+    from tkinter import messagebox
     messagebox.showerror("Error", message)
 
 def show_info(message):
+    from tkinter import messagebox
     messagebox.showinfo("Information", message)
 
 def format_date(date_obj):
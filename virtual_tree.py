@@ -0,0 +1,229 @@
+# virtual_tree.py
+
+import tkinter as tk
+from tkinter import ttk
+
+from constants import VIRTUAL_TREE_OVERSCAN
+from tree_sync import TreeviewSync
+
+# Modifier bits of a Tk event's state field
+SHIFT_MASK = 0x0001
+CONTROL_MASK = 0x0004
+
+
+class VirtualTreeview(tk.Frame):
+    # A Treeview for very large result sets. Only the rows in the visible window are
+    # inserted into the widget; a page of overscan rows above and below it is kept in
+    # memory so short scrolls do not hit the database. Selection is tracked by id so
+    # it survives scrolling, and sorting is delegated to the query.
+    # The count and the pages are requested asynchronously (e.g. through AsyncDatabase)
+    # so scrolling never blocks on SQLite: the widget keeps showing the previous rows
+    # until the page arrives, and only one page request is in flight at a time.
+    def __init__(self, master, columns, count_rows, fetch_rows, make_row, sort_keys, overscan=VIRTUAL_TREE_OVERSCAN,
+                 order_by='id', descending=False, on_sort=None):
+        # Args:
+        #     count_rows (function): count_rows(callback) calls callback(total) with the number of rows.
+        #     fetch_rows (function): fetch_rows(offset, limit, order_by, descending, callback, errback)
+        #         calls callback(rows) with database rows, or errback(error).
+        #     make_row (function): converts a database row to an (iid, values, tags) tuple.
+        #     sort_keys (dict): maps column names to the order_by key passed to fetch_rows.
+        #     order_by, descending: the initial sort order.
+        #     on_sort (function): called with (order_by, descending) when a heading is clicked.
+        super().__init__(master)
+        self.count_rows = count_rows
+        self.fetch_rows = fetch_rows
+        self.make_row = make_row
+        self.sort_keys = sort_keys
+        self.overscan = overscan
+
+        self.total = 0             # Number of rows in the result set
+        self.first = 0             # Index of the first visible row
+        self.visible_rows = 20     # Rows that fit in the widget, updated on resize
+        self.cache_start = 0       # Index of the first cached row
+        self.cache = []            # Cached database rows (visible window plus overscan)
+        self.selected_ids = set()  # Selected assignment ids, visible or not
+        self.focus_id = None       # Assignment to focus once its page has arrived (see select)
+        self.fetching = False      # True while a page request is in flight
+        self.generation = 0        # Bumped when the data or order changes; older replies are dropped
+        self.order_by = order_by
+        self.descending = descending
+        self.on_sort = on_sort
+
+        self.tree = ttk.Treeview(self, columns=columns, show='headings', selectmode='extended')
+        for col in columns:
+            self.tree.heading(col, text=col, command=lambda _col=col: self.sort(_col))
+            self.tree.column(col, minwidth=50, width=200)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, expand=True, fill='both')
+        self.sync = TreeviewSync(self.tree)
+
+        self.tree.bind('<Configure>', self.on_resize)
+        self.tree.bind('<MouseWheel>', self.on_mouse_wheel)
+        self.tree.bind('<Button-4>', lambda event: self.scroll_by(-3))
+        self.tree.bind('<Button-5>', lambda event: self.scroll_by(3))
+        self.tree.bind('<Prior>', lambda event: self.scroll_by(-self.visible_rows))
+        self.tree.bind('<Next>', lambda event: self.scroll_by(self.visible_rows))
+        self.tree.bind('<Up>', self.on_key_up, add='+')
+        self.tree.bind('<Down>', self.on_key_down, add='+')
+        self.tree.bind('<ButtonPress-1>', self.on_click, add='+')
+        self.tree.bind('<ButtonPress-3>', self.on_context_click, add='+')
+        self.tree.bind('<<TreeviewSelect>>', self.on_select, add='+')
+
+    def refresh(self):
+        # Re-count and re-fetch the current window, e.g. after the data changed
+        self.generation += 1
+        generation = self.generation
+        self.count_rows(lambda total: self.show_count(total, generation))
+
+    def show_count(self, total, generation):
+        if generation != self.generation or not self.winfo_exists():
+            return
+        self.total = total
+        self.cache = []
+        self.render()
+
+    def drop_cache(self):
+        # Forget the cached rows without querying now; the next render fetches them again
+        self.generation += 1
+        self.cache = []
+
+    def sort(self, col):
+        # Clicking the same heading again reverses the order
+        order_by = self.sort_keys[col]
+        self.descending = not self.descending if order_by == self.order_by else False
+        self.order_by = order_by
+        self.first = 0
+        if self.on_sort is not None:
+            self.on_sort(self.order_by, self.descending)
+        self.refresh()
+
+    def render(self):
+        self.first = max(0, min(self.first, self.total - self.visible_rows))
+        last = min(self.first + self.visible_rows, self.total)
+        if self.first < self.cache_start or last > self.cache_start + len(self.cache):
+            # Shown once the page arrives
+            self.fetch_window()
+            return
+        window = self.cache[self.first - self.cache_start:last - self.cache_start]
+        self.sync.sync([self.make_row(row) for row in window])
+        if self.focus_id is not None and self.tree.exists(str(self.focus_id)):
+            self.tree.focus(str(self.focus_id))
+            self.tree.see(str(self.focus_id))
+            self.focus_id = None
+
+        # Restore the selection for rows that scrolled into view
+        visible_selected = [iid for iid in self.sync.order if int(iid) in self.selected_ids]
+        if tuple(visible_selected) != self.tree.selection():
+            self.tree.selection_set(visible_selected)
+
+        if self.total:
+            self.scrollbar.set(self.first / self.total, last / self.total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def fetch_window(self):
+        # Request the visible window plus overscan on both sides. While a request is in
+        # flight no other is made; render() asks again when it arrives if the view has
+        # moved on in the meantime.
+        if self.fetching:
+            return
+        self.fetching = True
+        start = max(0, self.first - self.overscan)
+        limit = self.visible_rows + 2 * self.overscan
+        generation = self.generation
+        self.fetch_rows(start, limit, self.order_by, self.descending,
+                        lambda rows: self.show_page(start, limit, rows, generation), self.on_fetch_error)
+
+    def show_page(self, start, limit, rows, generation):
+        self.fetching = False
+        if not self.winfo_exists():
+            return
+        if generation == self.generation:
+            self.cache_start = start
+            self.cache = rows
+            # Rows deleted since the count: shrink the total so render() does not ask again
+            if len(rows) < limit and start + len(rows) < self.total:
+                self.total = start + len(rows)
+        self.render()
+
+    def on_fetch_error(self, error):
+        self.fetching = False
+        print(f"Error fetching rows: {error}")
+
+    def scroll_by(self, rows):
+        self.first += rows
+        self.render()
+        return 'break'
+
+    def scroll_to(self, index):
+        self.first = index
+        self.render()
+
+    def on_scroll(self, *args):
+        # Scrollbar callback: ('moveto', fraction) or ('scroll', n, 'units'|'pages')
+        if args[0] == 'moveto':
+            self.scroll_to(int(float(args[1]) * self.total))
+        elif args[0] == 'scroll':
+            step = int(args[1])
+            self.scroll_by(step * self.visible_rows if args[2] == 'pages' else step)
+
+    def on_mouse_wheel(self, event):
+        return self.scroll_by(-3 if event.delta > 0 else 3)
+
+    def on_resize(self, event):
+        # Approximate the number of rows that fit below the heading
+        row_height = int(ttk.Style().lookup('Treeview', 'rowheight') or 20)
+        visible_rows = max(1, (event.height - row_height) // row_height)
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.render()
+
+    def on_key_up(self, event):
+        # Scroll when the focus moves above the first visible row
+        if self.sync.order and self.tree.focus() == self.sync.order[0] and self.first > 0:
+            self.scroll_by(-1)
+            self.move_focus(self.sync.order[0])
+            return 'break'
+
+    def on_key_down(self, event):
+        # Scroll when the focus moves below the last visible row
+        if self.sync.order and self.tree.focus() == self.sync.order[-1] and self.first + self.visible_rows < self.total:
+            self.scroll_by(1)
+            self.move_focus(self.sync.order[-1])
+            return 'break'
+
+    def move_focus(self, iid):
+        # Keyboard navigation selects the focused row only
+        self.selected_ids = {int(iid)}
+        self.tree.focus(iid)
+        self.tree.selection_set(iid)
+
+    def on_click(self, event):
+        # A plain click replaces the selection, including rows that are scrolled out of view
+        if not event.state & (SHIFT_MASK | CONTROL_MASK) and self.tree.identify_row(event.y):
+            self.selected_ids.clear()
+
+    def on_context_click(self, event):
+        # A right click on a row outside the selection makes that row the selection
+        # (see AssignmentTracker.show_context_menu), so rows selected out of view are
+        # dropped as by a plain click; on a selected row the whole selection is kept
+        iid = self.tree.identify_row(event.y)
+        if iid and iid not in self.tree.selection():
+            self.selected_ids.clear()
+
+    def on_select(self, event):
+        visible = {int(iid) for iid in self.sync.order}
+        selected = {int(iid) for iid in self.tree.selection()}
+        self.selected_ids = (self.selected_ids - visible) | selected
+
+    def get_selected_ids(self):
+        return sorted(self.selected_ids)
+
+    def select(self, assignment_id, index):
+        # Scroll so the row at `index` is visible and make it the only selection
+        self.selected_ids = {assignment_id}
+        self.focus_id = assignment_id
+        if not self.first <= index < self.first + self.visible_rows:
+            self.first = index - self.visible_rows // 2
+        self.render()